@@ -1,7 +1,7 @@
 """Configuration management for the automated reporter."""
 
 import os
-from typing import List
+from typing import List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -47,9 +47,48 @@ class Config:
     VIDEO_FPS: int = int(os.getenv("VIDEO_FPS", "30"))
     AUTO_UPLOAD: bool = os.getenv("AUTO_UPLOAD", "false").lower() == "true"
     
+    # Upload queue (leased jobs in upload_queue, drained by worker processes)
+    UPLOAD_WORKERS: int = int(os.getenv("UPLOAD_WORKERS", "2"))
+    UPLOAD_LEASE_SECONDS: int = int(os.getenv("UPLOAD_LEASE_SECONDS", "900"))
+    UPLOAD_MAX_RETRIES: int = int(os.getenv("UPLOAD_MAX_RETRIES", "5"))
+    UPLOAD_RETRY_BASE_SECONDS: int = int(os.getenv("UPLOAD_RETRY_BASE_SECONDS", "60"))  # Doubles per retry
+    UPLOAD_MAX_ATTEMPTS: int = int(os.getenv("UPLOAD_MAX_ATTEMPTS", "10"))  # Claims before a job whose lease keeps expiring is dead-lettered
+    
     # LLM Configuration
     LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "openai")
     MODEL_NAME: str = os.getenv("MODEL_NAME", "gpt-4-turbo-preview")
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "900"))  # Article context per script (0 = first 500 chars each)
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # Categories generated at once
+    OPENAI_REQUESTS_PER_MINUTE: int = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "60"))  # 0 = unlimited
+    ANTHROPIC_REQUESTS_PER_MINUTE: int = int(os.getenv("ANTHROPIC_REQUESTS_PER_MINUTE", "50"))
+    OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL") or None  # e.g. a proxy or local stand-in server
+    ANTHROPIC_BASE_URL: Optional[str] = os.getenv("ANTHROPIC_BASE_URL") or None
+    
+    # Script generation routes: fallback provider:model pairs tried after the primary,
+    # and sent duplicates of calls slower than the primary's LLM_HEDGE_PERCENTILE latency
+    LLM_FALLBACK_ROUTES: List[str] = [r for r in os.getenv("LLM_FALLBACK_ROUTES", "").split(",") if r]
+    LLM_CALL_DEADLINE_SECONDS: float = float(os.getenv("LLM_CALL_DEADLINE_SECONDS", "180"))
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))  # 0 = no hedged requests
+    LLM_ROUTE_COOLDOWN_SECONDS: int = int(os.getenv("LLM_ROUTE_COOLDOWN_SECONDS", "300"))  # Skip a failing route this long
+    
+    # Split mode: the script body and the metadata (title, tags, thumbnail text,
+    # description) are requested as concurrent smaller calls; the metadata calls
+    # may go to a cheaper model (provider:model or a model of LLM_PROVIDER)
+    LLM_SPLIT_MODE: bool = os.getenv("LLM_SPLIT_MODE", "false").lower() == "true"
+    LLM_METADATA_MODEL: str = os.getenv("LLM_METADATA_MODEL", "")  # Empty = MODEL_NAME
+    
+    # Provider batch API: these categories are submitted as one batch job per cycle
+    # (cheaper, finishes within 24h) and collected on a later cycle
+    BATCH_CATEGORIES: List[str] = [c for c in os.getenv("BATCH_CATEGORIES", "").split(",") if c]
+    BATCH_POLL_INITIAL_SECONDS: int = int(os.getenv("BATCH_POLL_INITIAL_SECONDS", "300"))  # Doubles per check
+    BATCH_POLL_MAX_SECONDS: int = int(os.getenv("BATCH_POLL_MAX_SECONDS", "3600"))
+    
+    # LLM response cache: identical requests reuse the stored completion
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_BYPASS: bool = os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true"  # Force fresh generations
+    LLM_CACHE_FILE: str = os.getenv("LLM_CACHE_FILE", "")  # Default: llm_cache.db next to reporter.db
+    LLM_CACHE_TTL_HOURS: float = float(os.getenv("LLM_CACHE_TTL_HOURS", "72"))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
     
     # Content Configuration
     CATEGORIES: List[str] = os.getenv("CATEGORIES", "sports,politics,finance").split(",")
@@ -66,6 +105,27 @@ class Config:
     USE_REDDIT: bool = os.getenv("USE_REDDIT", "false").lower() == "true"
     USE_GOOGLE_SEARCH: bool = os.getenv("USE_GOOGLE_SEARCH", "true").lower() == "true"
     
+    # Lightweight page variants (AMP / print pages, discovered per domain)
+    USE_LIGHTWEIGHT_VARIANTS: bool = os.getenv("USE_LIGHTWEIGHT_VARIANTS", "true").lower() == "true"
+    LIGHTWEIGHT_MIN_CONTENT_CHARS: int = int(os.getenv("LIGHTWEIGHT_MIN_CONTENT_CHARS", "1500"))
+    LIGHTWEIGHT_VARIANTS_FILE: str = os.getenv("LIGHTWEIGHT_VARIANTS_FILE", "lightweight_variants.json")
+    
+    # Two-stage extraction: fetch threads feed a process pool of HTML parsers
+    PARALLEL_EXTRACTION: bool = os.getenv("PARALLEL_EXTRACTION", "true").lower() == "true"
+    COLLECTOR_IO_WORKERS: int = int(os.getenv("COLLECTOR_IO_WORKERS", "8"))
+    COLLECTOR_PARSE_WORKERS: int = int(os.getenv("COLLECTOR_PARSE_WORKERS", "0"))  # 0 = one per CPU core
+    COLLECTOR_QUEUE_SIZE: int = int(os.getenv("COLLECTOR_QUEUE_SIZE", "16"))
+    
+    # Skip article URLs already in the database (used ones are never re-fetched)
+    SKIP_SEEN_URLS: bool = os.getenv("SKIP_SEEN_URLS", "true").lower() == "true"
+    REFETCH_SEEN_AFTER_HOURS: int = int(os.getenv("REFETCH_SEEN_AFTER_HOURS", "0"))  # 0 = never
+    
+    # Full-text enrichment for NewsAPI/RSS articles with thin content
+    ENRICH_FULL_TEXT: bool = os.getenv("ENRICH_FULL_TEXT", "false").lower() == "true"
+    ENRICH_MIN_CONTENT_CHARS: int = int(os.getenv("ENRICH_MIN_CONTENT_CHARS", "800"))
+    ENRICH_MAX_WORKERS: int = int(os.getenv("ENRICH_MAX_WORKERS", "8"))
+    ENRICH_CACHE_SIZE: int = int(os.getenv("ENRICH_CACHE_SIZE", "2000"))
+    
     # Voice Personalization
     AUTO_SELECT_VOICE: bool = os.getenv("AUTO_SELECT_VOICE", "true").lower() == "true"
     VOICE_OVERRIDE: str = os.getenv("VOICE_OVERRIDE", "")  # Override auto-selection
@@ -84,6 +144,36 @@ class Config:
     TIMEZONE_OFFSET: int = int(os.getenv("TIMEZONE_OFFSET", "0"))  # Hours from UTC
     MIN_HOURS_BETWEEN_POSTS: int = int(os.getenv("MIN_HOURS_BETWEEN_POSTS", "4"))
     
+    # Skip stories we already covered recently (full-text match before LLM generation)
+    SKIP_COVERED_STORIES: bool = os.getenv("SKIP_COVERED_STORIES", "true").lower() == "true"
+    COVERAGE_LOOKBACK_DAYS: int = int(os.getenv("COVERAGE_LOOKBACK_DAYS", "7"))
+    COVERAGE_MIN_SCORE: float = float(os.getenv("COVERAGE_MIN_SCORE", "20"))  # BM25, higher = stricter
+    
+    # Semantic repeat check (local hashed TF-IDF vectors, catches rephrased stories)
+    SEMANTIC_COVERAGE_CHECK: bool = os.getenv("SEMANTIC_COVERAGE_CHECK", "true").lower() == "true"
+    SEMANTIC_COVERAGE_MIN_SCORE: float = float(os.getenv("SEMANTIC_COVERAGE_MIN_SCORE", "0.35"))  # Cosine, 0-1
+    VECTOR_INDEX_DIM: int = int(os.getenv("VECTOR_INDEX_DIM", "256"))
+    VECTOR_INDEX_RETENTION_DAYS: int = int(os.getenv("VECTOR_INDEX_RETENTION_DAYS", "365"))
+    
+    # Database (SQLite, WAL mode with one connection per thread)
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # NORMAL is durable enough under WAL
+    SQLITE_CACHE_SIZE_MB: int = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+    SQLITE_MMAP_SIZE_MB: int = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000"))
+    
+    # Retention: rows older than this move to monthly archive databases (0 = keep everything, the default)
+    RETENTION_DAYS: int = int(os.getenv("RETENTION_DAYS", "0"))
+    ARCHIVE_DIR: str = os.getenv("ARCHIVE_DIR", "archive")
+    
+    # History export (python history_export.py)
+    EXPORT_DIR: str = os.getenv("EXPORT_DIR", "exports")
+    EXPORT_CHUNK_ROWS: int = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+    
+    # Write-behind: pipeline stages queue writes, one thread commits them in groups
+    DB_WRITE_BEHIND: bool = os.getenv("DB_WRITE_BEHIND", "true").lower() == "true"
+    DB_WRITER_BATCH_SIZE: int = int(os.getenv("DB_WRITER_BATCH_SIZE", "200"))
+    DB_WRITER_MAX_DELAY_MS: int = int(os.getenv("DB_WRITER_MAX_DELAY_MS", "200"))
+    
     # Video Script Configuration
     MIN_SCRIPT_LENGTH: int = 500  # words for ~3-5 min video
     MAX_SCRIPT_LENGTH: int = 1500  # words for ~10-12 min video
@@ -0,0 +1,38 @@
+"""Shared pytest fixtures: a throwaway database and fresh process-wide singletons."""
+
+import pytest
+
+import database
+import llm_cache
+import llm_router
+import rate_limiter
+from config import Config
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """
+    A new Database in a temporary directory, installed as the shared instance.
+    
+    Writes run inline and the vector index is off unless a test turns it on;
+    Config and the singleton are restored afterwards.
+    """
+    monkeypatch.setattr(Config, 'DB_WRITE_BEHIND', False)
+    monkeypatch.setattr(Config, 'SEMANTIC_COVERAGE_CHECK', False)
+    
+    instance = Database(str(tmp_path / "reporter.db"))
+    monkeypatch.setattr(database, '_db_instance', instance)
+    
+    yield instance
+    instance.close()
+
+
+@pytest.fixture
+def llm_singletons(monkeypatch):
+    """Empty router, rate limiter and LLM cache registries, restored afterwards."""
+    monkeypatch.setattr(llm_router, '_routers', {})
+    monkeypatch.setattr(rate_limiter, '_limiters', {})
+    monkeypatch.setattr(llm_cache, '_cache_instance', None)
+    monkeypatch.setattr(Config, 'OPENAI_API_KEY', "test-key")
+    monkeypatch.setattr(Config, 'ANTHROPIC_API_KEY', "test-key")
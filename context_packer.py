@@ -0,0 +1,202 @@
+"""Token-budgeted packing of news articles into LLM prompt context."""
+
+import re
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+from database import STOPWORDS
+
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])["\')\]]?\s+(?=["\'(\[]?[A-Z0-9])')
+WORD = re.compile(r"[A-Za-z0-9][A-Za-z0-9'\-]*")
+
+# Characters per token when tiktoken can't count for the model
+CHARS_PER_TOKEN = {'claude': 3.5, 'gpt': 4.0}
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """tiktoken encoding for an OpenAI model, or None."""
+    if not TIKTOKEN_AVAILABLE or 'claude' in model.lower():
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """
+    Count tokens locally for the configured model family.
+    
+    Uses tiktoken for OpenAI models when installed, otherwise a
+    characters-per-token estimate for the family.
+    """
+    if not text:
+        return 0
+    
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    
+    family = 'claude' if 'claude' in model.lower() else 'gpt'
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN[family]))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split article text into sentences."""
+    text = re.sub(r'\s+', ' ', text or '').strip()
+    return [sentence.strip() for sentence in SENTENCE_SPLIT.split(text) if sentence.strip()]
+
+
+class ContextPacker:
+    """
+    Fill a token budget with the most informative sentences of a set of articles.
+    
+    Each article's header (title, source, date, description, URL) is always
+    kept. Body sentences are deduplicated across articles, scored by
+    information density (weight of content words shared across the story,
+    numbers and names per token, with a bonus for leading sentences) and
+    packed best-first: every article's best sentence goes in before any
+    article gets a second one. Selected sentences keep their original order.
+    """
+    
+    # Sentences whose content words were mostly seen already count as repeats
+    DUPLICATE_OVERLAP = 0.8
+    
+    def __init__(self, token_budget: int = 900, model: str = ""):
+        """
+        Initialize the packer.
+        
+        Args:
+            token_budget: Tokens the packed context may use
+            model: Model name, used to pick the token counter
+        """
+        self.token_budget = token_budget
+        self.model = model
+    
+    def pack(self, news_items: List[Dict]) -> str:
+        """
+        Build the context string for a set of articles.
+        
+        Args:
+            news_items: Articles with title, source, published_at, description, content, url
+        
+        Returns:
+            Context string in the _create_context article format
+        """
+        headers = [self._header(i, item) for i, item in enumerate(news_items, 1)]
+        remaining = self.token_budget - sum(
+            count_tokens(f"{header}Content: \nURL: {item.get('url', 'N/A')}\n", self.model)
+            for header, item in zip(headers, news_items)
+        )
+        
+        candidates = self._candidates(news_items)
+        article_words = {}
+        for candidate in candidates:
+            article_words.setdefault(candidate['article'], set()).update(candidate['words'])
+        document_frequency = Counter(word for words in article_words.values() for word in words)
+        
+        for candidate in candidates:
+            candidate['score'] = self._density(candidate, document_frequency)
+        
+        selected = self._select(candidates, remaining)
+        
+        context_parts = []
+        for i, (item, header) in enumerate(zip(news_items, headers)):
+            sentences = [candidate['text'] for candidate in selected if candidate['article'] == i]
+            content = " ".join(sentences) if sentences else 'N/A'
+            context_parts.append(f"{header}Content: {content}\nURL: {item.get('url', 'N/A')}\n")
+        
+        return "\n".join(context_parts)
+    
+    def _header(self, number: int, item: Dict) -> str:
+        """Article header lines (everything but content and URL)."""
+        return f"""
+Article {number}:
+Title: {item.get('title', 'N/A')}
+Source: {item.get('source', 'N/A')}
+Published: {item.get('published_at', 'N/A')}
+Description: {item.get('description', 'N/A')}
+"""
+    
+    def _candidates(self, news_items: List[Dict]) -> List[Dict]:
+        """Unique body sentences of every article, with their content words."""
+        candidates = []
+        seen = []
+        
+        # The title and description are already in the header
+        for item in news_items:
+            for text in (item.get('title'), item.get('description')):
+                words = self._content_words(text or '')
+                if words:
+                    seen.append(set(words))
+        
+        for i, item in enumerate(news_items):
+            for position, sentence in enumerate(split_sentences(item.get('content') or '')):
+                words = self._content_words(sentence)
+                if not words:
+                    continue
+                
+                word_set = set(words)
+                if any(len(word_set & other) / len(word_set) >= self.DUPLICATE_OVERLAP for other in seen):
+                    continue
+                seen.append(word_set)
+                
+                candidates.append({
+                    'article': i,
+                    'position': position,
+                    'text': sentence,
+                    'words': words,
+                    'tokens': count_tokens(sentence, self.model) + 1
+                })
+        
+        return candidates
+    
+    def _density(self, candidate: Dict, document_frequency: Counter) -> float:
+        """Information per token of a sentence."""
+        words = candidate['words']
+        text = candidate['text']
+        
+        # Words several articles mention are the story; log-scaled so one word can't dominate
+        weight = sum(1.0 + math.log(document_frequency[word]) for word in set(words))
+        weight += 0.5 * len(re.findall(r'\d+(?:[.,]\d+)?%?', text))
+        weight += 0.5 * len(re.findall(r'(?<=\s)[A-Z][a-z]+', text))
+        
+        lead_bonus = 1.0 + 0.5 / (1 + candidate['position'])
+        return weight * lead_bonus / candidate['tokens']
+    
+    def _select(self, candidates: List[Dict], budget: int) -> List[Dict]:
+        """Greedy best-first selection; each article's best sentence comes first."""
+        ranked = sorted(candidates, key=lambda candidate: candidate['score'], reverse=True)
+        
+        best_per_article = {}
+        for candidate in ranked:
+            best_per_article.setdefault(candidate['article'], candidate)
+        
+        selected = []
+        chosen = set()
+        for candidate in list(best_per_article.values()) + ranked:
+            if id(candidate) in chosen or candidate['tokens'] > budget:
+                continue
+            selected.append(candidate)
+            chosen.add(id(candidate))
+            budget -= candidate['tokens']
+        
+        return sorted(selected, key=lambda candidate: (candidate['article'], candidate['position']))
+    
+    @staticmethod
+    def _content_words(text: str) -> List[str]:
+        """Lowercased words minus stopwords."""
+        return [
+            word for word in (match.lower() for match in WORD.findall(text))
+            if word not in STOPWORDS and (len(word) > 2 or word.isdigit())
+        ]
@@ -1,112 +1,1014 @@
 """Database module for storing history and tracking content."""
 
+import os
+import atexit
+import re
 import sqlite3
 import json
-from datetime import datetime
-from typing import Dict, List, Optional
+import random
+import zlib
+import hashlib
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
+from config import Config
+
+
+class SeenURLFilter:
+    """
+    In-memory membership filter over article URLs already in the database.
+    
+    Stores an 8-byte hash of each URL with its collection time and used
+    flag, so collectors can skip known pages before fetching them.
+    """
+    
+    def __init__(self):
+        """Initialize an empty filter."""
+        self._entries: Dict[int, Tuple[float, bool]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(url: str) -> int:
+        """Hash a URL to a compact integer key."""
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+    
+    @staticmethod
+    def _timestamp(value) -> float:
+        """Convert a stored collected_at value to epoch seconds (0 if unknown)."""
+        if not value:
+            return 0.0
+        try:
+            return datetime.fromisoformat(str(value)).timestamp()
+        except ValueError:
+            return 0.0
+    
+    def add(self, url: str, collected_at=None, used: bool = False):
+        """Record a URL as seen."""
+        key = self._key(url)
+        timestamp = self._timestamp(collected_at) or datetime.now().timestamp()
+        
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = (timestamp, used or (previous is not None and previous[1]))
+    
+    def mark_used(self, url: str):
+        """Record that a URL was turned into a video."""
+        key = self._key(url)
+        
+        with self._lock:
+            timestamp = self._entries.get(key, (datetime.now().timestamp(), True))[0]
+            self._entries[key] = (timestamp, True)
+    
+    def mark_unused(self, url: str):
+        """Undo mark_used for a URL whose video was never made."""
+        key = self._key(url)
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = (self._entries[key][0], False)
+    
+    def should_fetch(self, url: str, refetch_after_hours: int = 0) -> bool:
+        """
+        Decide whether a URL is worth fetching.
+        
+        Args:
+            url: Article URL
+            refetch_after_hours: Re-fetch seen (but unused) articles collected
+                more than this many hours ago; 0 never re-fetches
+        """
+        with self._lock:
+            entry = self._entries.get(self._key(url))
+        
+        if entry is None:
+            return True
+        
+        collected_at, used = entry
+        if used:
+            return False
+        
+        if refetch_after_hours > 0:
+            age_hours = (datetime.now().timestamp() - collected_at) / 3600
+            return age_hours >= refetch_after_hours
+        
+        return False
+    
+    def __contains__(self, url: str) -> bool:
+        """Check whether a URL has been seen."""
+        with self._lock:
+            return self._key(url) in self._entries
+    
+    def __len__(self) -> int:
+        """Number of distinct URLs tracked."""
+        return len(self._entries)
+
+
+class ConnectionPool:
+    """
+    Per-thread SQLite connections configured for concurrent access.
+    
+    Every thread (and every process after a fork) gets its own connection,
+    opened in WAL mode so readers never block on the single writer.
+    """
+    
+    def __init__(self, db_path: str):
+        """Initialize the pool (connections are opened lazily)."""
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._pid = os.getpid()
+    
+    def get(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        if os.getpid() != self._pid:
+            # Connections must never cross a fork
+            self._local = threading.local()
+            self._connections = []
+            self._pid = os.getpid()
+        
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection and apply the tuned pragmas."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,  # transactions are managed explicitly
+            check_same_thread=False  # only so close_all() can run from any thread
+        )
+        conn.row_factory = sqlite3.Row
+        
+        # Only takes effect on new databases; RetentionManager converts old ones
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA synchronous = {Config.SQLITE_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size = -{Config.SQLITE_CACHE_SIZE_MB * 1024}")
+        conn.execute(f"PRAGMA mmap_size = {Config.SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+        conn.execute(f"PRAGMA busy_timeout = {Config.SQLITE_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        
+        return conn
+    
+    def close_all(self):
+        """Close every connection opened by this process."""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+
+def hash_body(body: str) -> str:
+    """Content address of an article body."""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def compress_body(body: str) -> bytes:
+    """Compress an article body for storage."""
+    return zlib.compress(body.encode('utf-8'), 6)
+
+
+def decompress_body(blob: bytes) -> str:
+    """Inverse of compress_body."""
+    return zlib.decompress(blob).decode('utf-8')
+
+
+# Words too common to say anything about a story
+STOPWORDS = {
+    'the', 'and', 'for', 'with', 'that', 'this', 'from', 'are', 'was', 'were', 'has',
+    'have', 'had', 'will', 'its', 'his', 'her', 'their', 'they', 'after', 'over', 'into',
+    'about', 'more', 'than', 'new', 'not', 'but', 'you', 'your', 'what', 'who', 'how',
+    'why', 'when', 'says', 'said', 'just', 'now', 'out', 'all', 'can', 'been', 'amid'
+}
+
+
+def fts_query(text: str, max_terms: int = 16) -> str:
+    """Turn free text into an FTS5 OR-query of its distinctive words."""
+    terms = []
+    for word in re.findall(r'\w+', text.lower()):
+        if len(word) > 2 and word not in STOPWORDS and not word.isdigit() and word not in terms:
+            terms.append(word)
+        if len(terms) >= max_terms:
+            break
+    
+    return ' OR '.join(f'"{term}"' for term in terms)
+
+
+# ---------------------------------------------------------------------------
+# Schema migrations
+#
+# Applied in order at startup; each runs in its own transaction and is
+# recorded in schema_version. Never edit a released migration - append a
+# new one instead.
+# ---------------------------------------------------------------------------
+
+def _add_column(cursor: sqlite3.Cursor, table: str, column: str, declaration: str):
+    """Add a column unless it already exists."""
+    columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+def _migration_base_schema(cursor: sqlite3.Cursor):
+    """Create the base tables (no-op on databases created before migrations)."""
+    # Articles table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            title TEXT,
+            content TEXT,
+            category TEXT,
+            collected_at TIMESTAMP,
+            used_in_video BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # Scripts table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scripts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            category TEXT,
+            script_text TEXT,
+            description TEXT,
+            tags TEXT,
+            word_count INTEGER,
+            estimated_duration INTEGER,
+            language TEXT DEFAULT 'en',
+            video_generated BOOLEAN DEFAULT 0,
+            uploaded BOOLEAN DEFAULT 0,
+            youtube_url TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # Videos table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS videos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            script_id INTEGER,
+            file_path TEXT,
+            thumbnail_path TEXT,
+            video_mode TEXT,
+            duration REAL,
+            uploaded BOOLEAN DEFAULT 0,
+            youtube_id TEXT,
+            youtube_url TEXT,
+            views INTEGER DEFAULT 0,
+            likes INTEGER DEFAULT 0,
+            comments INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            uploaded_at TIMESTAMP,
+            FOREIGN KEY (script_id) REFERENCES scripts(id)
+        )
+    """)
+    
+    # Analytics table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analytics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id INTEGER,
+            views INTEGER,
+            likes INTEGER,
+            comments INTEGER,
+            watch_time REAL,
+            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (video_id) REFERENCES videos(id)
+        )
+    """)
+    
+    # Script sources (which articles fed which script)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS script_sources (
+            script_id INTEGER NOT NULL,
+            article_id INTEGER NOT NULL,
+            position INTEGER,
+            PRIMARY KEY (script_id, article_id),
+            FOREIGN KEY (script_id) REFERENCES scripts(id),
+            FOREIGN KEY (article_id) REFERENCES articles(id)
+        ) WITHOUT ROWID
+    """)
+    
+    # Upload queue table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS upload_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id INTEGER,
+            scheduled_time TIMESTAMP,
+            status TEXT DEFAULT 'pending',
+            retry_count INTEGER DEFAULT 0,
+            error_message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (video_id) REFERENCES videos(id)
+        )
+    """)
+
+
+def _migration_query_indexes(cursor: sqlite3.Cursor):
+    """Add covering indexes for the hot query paths."""
+    # get_unused_articles: category + used flag, newest first
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_articles_unused
+        ON articles (category, used_in_video, collected_at DESC)
+    """)
+    
+    # get_recent_topics: category + date range, returns title
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_scripts_category_created
+        ON scripts (category, created_at, title)
+    """)
+    
+    # get_statistics: date range, counts by flag and category
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_scripts_created
+        ON scripts (created_at, category, video_generated, uploaded)
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_script_sources_article
+        ON script_sources (article_id, script_id)
+    """)
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_script ON videos (script_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_analytics_video ON analytics (video_id, recorded_at)")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_upload_queue_status
+        ON upload_queue (status, scheduled_time)
+    """)
+    
+    # Give the planner statistics for the new indexes
+    cursor.execute("ANALYZE")
+
+
+def _migration_article_bodies(cursor: sqlite3.Cursor):
+    """Move article bodies into a compressed, content-addressed blob table."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_bodies (
+            hash TEXT PRIMARY KEY,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    _add_column(cursor, "articles", "content_hash", "TEXT")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_content_hash ON articles (content_hash)")
+    
+    # Backfill in id order, a batch at a time, so memory stays flat on large databases
+    last_id = 0
+    while True:
+        rows = cursor.execute("""
+            SELECT id, content FROM articles
+            WHERE id > ? AND content IS NOT NULL AND content != ''
+            ORDER BY id LIMIT 1000
+        """, (last_id,)).fetchall()
+        
+        if not rows:
+            break
+        
+        bodies = {}
+        updates = []
+        for article_id, content in rows:
+            body_hash = hash_body(content)
+            bodies.setdefault(body_hash, content)
+            updates.append((body_hash, article_id))
+        
+        cursor.executemany(
+            "INSERT OR IGNORE INTO article_bodies (hash, body, size) VALUES (?, ?, ?)",
+            [(body_hash, compress_body(body), len(body)) for body_hash, body in bodies.items()]
+        )
+        cursor.executemany("UPDATE articles SET content_hash = ?, content = NULL WHERE id = ?", updates)
+        last_id = rows[-1][0]
+
+
+def _migration_full_text_search(cursor: sqlite3.Cursor):
+    """Add FTS5 indexes over scripts (kept in sync by triggers) and articles."""
+    # Scripts: external-content index over the scripts table
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS scripts_fts USING fts5(
+            title, script_text,
+            content='scripts', content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    """)
+    for statement in [
+        """
+        CREATE TRIGGER IF NOT EXISTS scripts_fts_insert AFTER INSERT ON scripts BEGIN
+            INSERT INTO scripts_fts (rowid, title, script_text)
+            VALUES (new.id, new.title, new.script_text);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS scripts_fts_delete AFTER DELETE ON scripts BEGIN
+            INSERT INTO scripts_fts (scripts_fts, rowid, title, script_text)
+            VALUES ('delete', old.id, old.title, old.script_text);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS scripts_fts_update AFTER UPDATE OF title, script_text ON scripts
+        WHEN old.title IS NOT new.title OR old.script_text IS NOT new.script_text BEGIN
+            INSERT INTO scripts_fts (scripts_fts, rowid, title, script_text)
+            VALUES ('delete', old.id, old.title, old.script_text);
+            INSERT INTO scripts_fts (rowid, title, script_text)
+            VALUES (new.id, new.title, new.script_text);
+        END
+        """
+    ]:
+        cursor.execute(statement)
+    
+    cursor.execute("INSERT INTO scripts_fts (scripts_fts) VALUES ('rebuild')")
+    
+    # Articles: contentless index (bodies live compressed in article_bodies).
+    # There are no triggers: Database.index_articles() maintains it from Python,
+    # so writes from connections without Python helpers (sqlite3 CLI) still work.
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, body,
+            content='',
+            tokenize='porter unicode61'
+        )
+    """)
+    
+    # Backfill exactly the rows index_articles() would have added
+    rows = cursor.execute("""
+        SELECT articles.id, articles.title, article_bodies.body
+        FROM articles
+        LEFT JOIN article_bodies ON article_bodies.hash = articles.content_hash
+        WHERE COALESCE(articles.title, '') != '' OR articles.content_hash IS NOT NULL
+    """).fetchall()
+    cursor.executemany(
+        "INSERT INTO articles_fts (rowid, title, body) VALUES (?, ?, ?)",
+        [(row[0], row[1] or '', decompress_body(row[2]) if row[2] else '') for row in rows]
+    )
+
+
+def _migration_daily_stats(cursor: sqlite3.Cursor):
+    """Add daily statistics rollups maintained by triggers, backfilled from history."""
+    # One row per day and dimension combination. Script counts carry an empty
+    # video_mode; video, upload and analytics counts carry their video's mode.
+    # There are no delete triggers, so totals survive archiving old rows.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_stats (
+            day TEXT NOT NULL,
+            category TEXT NOT NULL DEFAULT '',
+            language TEXT NOT NULL DEFAULT '',
+            video_mode TEXT NOT NULL DEFAULT '',
+            scripts INTEGER NOT NULL DEFAULT 0,
+            videos_generated INTEGER NOT NULL DEFAULT 0,
+            videos_uploaded INTEGER NOT NULL DEFAULT 0,
+            views INTEGER NOT NULL DEFAULT 0,
+            likes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, category, language, video_mode)
+        ) WITHOUT ROWID
+    """)
+    
+    upsert = """
+        ON CONFLICT (day, category, language, video_mode) DO UPDATE SET
+            scripts = scripts + excluded.scripts,
+            videos_generated = videos_generated + excluded.videos_generated,
+            videos_uploaded = videos_uploaded + excluded.videos_uploaded,
+            views = views + excluded.views,
+            likes = likes + excluded.likes
+    """
+    script_dims = """
+        COALESCE((SELECT category FROM scripts WHERE id = {video}.script_id), ''),
+        COALESCE((SELECT language FROM scripts WHERE id = {video}.script_id), '')
+    """
+    
+    for statement in [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS daily_stats_script_insert AFTER INSERT ON scripts BEGIN
+            INSERT INTO daily_stats (day, category, language, video_mode, scripts)
+            VALUES (date(new.created_at), COALESCE(new.category, ''), COALESCE(new.language, ''), '', 1)
+            {upsert};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS daily_stats_video_insert AFTER INSERT ON videos BEGIN
+            INSERT INTO daily_stats (day, category, language, video_mode, videos_generated)
+            VALUES (date(new.created_at), {script_dims.format(video='new')}, COALESCE(new.video_mode, ''), 1)
+            {upsert};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS daily_stats_video_uploaded AFTER UPDATE OF uploaded ON videos
+        WHEN new.uploaded = 1 AND COALESCE(old.uploaded, 0) = 0 BEGIN
+            INSERT INTO daily_stats (day, category, language, video_mode, videos_uploaded)
+            VALUES (date(COALESCE(new.uploaded_at, 'now')), {script_dims.format(video='new')},
+                    COALESCE(new.video_mode, ''), 1)
+            {upsert};
+        END
+        """,
+        # Analytics rows are cumulative snapshots: count the growth since the previous one
+        f"""
+        CREATE TRIGGER IF NOT EXISTS daily_stats_analytics_insert AFTER INSERT ON analytics BEGIN
+            INSERT INTO daily_stats (day, category, language, video_mode, views, likes)
+            SELECT date(new.recorded_at), {script_dims.format(video='videos')}, COALESCE(videos.video_mode, ''),
+                   COALESCE(new.views, 0) - COALESCE(previous.views, 0),
+                   COALESCE(new.likes, 0) - COALESCE(previous.likes, 0)
+            FROM (SELECT new.video_id AS id) AS target
+            LEFT JOIN videos ON videos.id = target.id
+            LEFT JOIN (
+                SELECT views, likes FROM analytics
+                WHERE video_id = new.video_id AND id <> new.id AND recorded_at <= new.recorded_at
+                ORDER BY recorded_at DESC, id DESC LIMIT 1
+            ) AS previous
+            WHERE true
+            {upsert};
+        END
+        """
+    ]:
+        cursor.execute(statement)
+    
+    # Backfill from existing rows
+    cursor.execute(f"""
+        INSERT INTO daily_stats (day, category, language, video_mode, scripts)
+        SELECT date(created_at), COALESCE(category, ''), COALESCE(language, ''), '', COUNT(*)
+        FROM scripts
+        GROUP BY 1, 2, 3
+        {upsert}
+    """)
+    cursor.execute(f"""
+        INSERT INTO daily_stats (day, category, language, video_mode, videos_generated, videos_uploaded)
+        SELECT day, category, language, video_mode, SUM(generated), SUM(uploaded)
+        FROM (
+            SELECT date(videos.created_at) AS day, COALESCE(scripts.category, '') AS category,
+                   COALESCE(scripts.language, '') AS language, COALESCE(videos.video_mode, '') AS video_mode,
+                   1 AS generated, 0 AS uploaded
+            FROM videos LEFT JOIN scripts ON scripts.id = videos.script_id
+            UNION ALL
+            SELECT date(COALESCE(videos.uploaded_at, videos.created_at)), COALESCE(scripts.category, ''),
+                   COALESCE(scripts.language, ''), COALESCE(videos.video_mode, ''), 0, 1
+            FROM videos LEFT JOIN scripts ON scripts.id = videos.script_id
+            WHERE videos.uploaded = 1
+        )
+        GROUP BY 1, 2, 3, 4
+        {upsert}
+    """)
+    cursor.execute(f"""
+        INSERT INTO daily_stats (day, category, language, video_mode, views, likes)
+        SELECT date(snapshots.recorded_at), COALESCE(scripts.category, ''), COALESCE(scripts.language, ''),
+               COALESCE(videos.video_mode, ''), SUM(snapshots.views_delta), SUM(snapshots.likes_delta)
+        FROM (
+            SELECT video_id, recorded_at,
+                   COALESCE(views, 0) - COALESCE(LAG(views) OVER by_video, 0) AS views_delta,
+                   COALESCE(likes, 0) - COALESCE(LAG(likes) OVER by_video, 0) AS likes_delta
+            FROM analytics
+            WINDOW by_video AS (PARTITION BY video_id ORDER BY recorded_at, id)
+        ) AS snapshots
+        LEFT JOIN videos ON videos.id = snapshots.video_id
+        LEFT JOIN scripts ON scripts.id = videos.script_id
+        GROUP BY 1, 2, 3, 4
+        {upsert}
+    """)
+
+
+def _migration_upload_leases(cursor: sqlite3.Cursor):
+    """Turn upload_queue into a leased work queue (claims, retries, dead letters)."""
+    _add_column(cursor, "upload_queue", "payload", "TEXT")
+    _add_column(cursor, "upload_queue", "attempts", "INTEGER DEFAULT 0")
+    _add_column(cursor, "upload_queue", "lease_owner", "TEXT")
+    _add_column(cursor, "upload_queue", "lease_expires_at", "TIMESTAMP")
+    _add_column(cursor, "upload_queue", "updated_at", "TIMESTAMP")
+    _add_column(cursor, "upload_queue", "completed_at", "TIMESTAMP")
+    
+    # claim_upload: expired leases of in-flight jobs
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_upload_queue_lease
+        ON upload_queue (status, lease_expires_at)
+    """)
+
+
+def _migration_llm_batches(cursor: sqlite3.Cursor):
+    """Provider batch jobs of script prompts, collected on a later cycle."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS llm_batches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            provider TEXT NOT NULL,
+            model TEXT,
+            batch_id TEXT NOT NULL UNIQUE,
+            status TEXT NOT NULL DEFAULT 'submitted',
+            provider_status TEXT,
+            requests TEXT NOT NULL,
+            poll_count INTEGER DEFAULT 0,
+            next_poll_at TIMESTAMP,
+            error_message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP,
+            completed_at TIMESTAMP
+        )
+    """)
+    
+    # get_due_llm_batches: open batches whose next poll is due
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_llm_batches_due
+        ON llm_batches (status, next_poll_at)
+    """)
+
+
+def _migration_llm_usage(cursor: sqlite3.Cursor):
+    """Per-call LLM token usage, split by provider prompt cache hits and misses."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS llm_usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            provider TEXT NOT NULL,
+            model TEXT,
+            input_tokens INTEGER DEFAULT 0,
+            cache_read_tokens INTEGER DEFAULT 0,
+            cache_write_tokens INTEGER DEFAULT 0,
+            output_tokens INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_usage_created ON llm_usage (created_at)")
+
+
+def _migration_utc_upload_times(cursor: sqlite3.Cursor):
+    """
+    Store videos.uploaded_at in UTC like the CURRENT_TIMESTAMP columns.
+    
+    It was written as local-time ISO strings, so daily_stats bucketed uploads
+    near midnight on the wrong UTC day. Earlier rollups are left as they are.
+    """
+    cursor.execute("""
+        UPDATE videos SET uploaded_at = datetime(uploaded_at, 'utc')
+        WHERE uploaded_at LIKE '____-__-__T%'
+    """)
+
+
+def _migration_archived_urls(cursor: sqlite3.Cursor):
+    """
+    Remember the URLs of archived articles.
+    
+    RetentionManager moves old articles out of the hot database; their URLs
+    stay here so the seen-URL filter keeps skipping those stories.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS archived_urls (
+            url TEXT PRIMARY KEY,
+            collected_at TIMESTAMP
+        ) WITHOUT ROWID
+    """)
+
+
+def _migration_row_changes(cursor: sqlite3.Cursor):
+    """
+    Log updates of scripts and videos for incremental history exports.
+    
+    Their rows change after they are first exported (a video's upload status
+    and URL are set later by the upload worker). Each updated row gets a new
+    sequence number here; HistoryExporter re-exports rows changed since its
+    watermark. One entry per row, so the log doesn't grow with repeated updates.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS row_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            UNIQUE (table_name, row_id)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_row_changes_table ON row_changes (table_name, seq)")
+    
+    for table in ('scripts', 'videos'):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS row_changes_{table} AFTER UPDATE ON {table} BEGIN
+                INSERT OR REPLACE INTO row_changes (table_name, row_id) VALUES ('{table}', new.id);
+            END
+        """)
+
+
+MIGRATIONS = [
+    (1, "base schema", _migration_base_schema),
+    (2, "covering indexes for query paths", _migration_query_indexes),
+    (3, "compressed content-addressed article bodies", _migration_article_bodies),
+    (4, "full-text search over scripts and articles", _migration_full_text_search),
+    (5, "daily statistics rollups", _migration_daily_stats),
+    (6, "leased upload queue", _migration_upload_leases),
+    (7, "provider batch jobs", _migration_llm_batches),
+    (8, "LLM token usage", _migration_llm_usage),
+    (9, "UTC video upload times", _migration_utc_upload_times),
+    (10, "archived article URLs", _migration_archived_urls),
+    (11, "row change log for history exports", _migration_row_changes),
+]
+
+
+class DatabaseWriter:
+    """
+    Write-behind writer thread for pipeline stages.
+    
+    Stages enqueue writes (any callable doing Database writes) and get a
+    Future back immediately. The writer thread drains the queue and commits
+    writes in groups, closing a group when it reaches max_batch writes or
+    max_delay seconds after its first write. Each write runs in its own
+    savepoint, so one failing write only fails its own Future.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, db: 'Database', max_batch: int = 200, max_delay: float = 0.2, max_queue: int = 10000):
+        """
+        Initialize and start the writer thread.
+        
+        Args:
+            db: Database the writes go to
+            max_batch: Writes per transaction at most
+            max_delay: Seconds to wait for more writes before committing a group
+            max_queue: Pending writes before submit() blocks (back-pressure)
+        """
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.stats = {'writes': 0, 'failed': 0, 'transactions': 0}
+        
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+    
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Queue a write.
+        
+        Args:
+            fn: Callable performing the write (e.g. db.add_articles)
+        
+        Returns:
+            Future resolving to fn's result once its transaction has committed
+        """
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+    
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Barrier: block until every write submitted before this call is committed.
+        
+        Use it when a stage needs to read its own writes.
+        """
+        barrier = Future()
+        self._queue.put((barrier, None, (), {}))
+        barrier.result(timeout)
+    
+    def pending(self) -> int:
+        """Approximate number of queued writes."""
+        return self._queue.qsize()
+    
+    def close(self):
+        """Commit everything queued and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+    
+    def _run(self):
+        """Writer loop: gather a group of writes, commit it, resolve the futures."""
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            
+            # A barrier closes the group immediately
+            while len(batch) < self.max_batch and batch[-1][1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            self._commit(batch)
+            if stop:
+                return
+    
+    def _commit(self, batch: List[tuple]):
+        """Run one group of writes in a single transaction."""
+        results = []
+        
+        try:
+            with self.db.transaction():
+                for future, fn, args, kwargs in batch:
+                    if fn is None:
+                        continue
+                    try:
+                        with self.db.transaction():
+                            results.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        print(f"⚠️  Write-behind {getattr(fn, '__name__', 'write')} failed: {e}")
+                        results.append((future, None, e))
+        except Exception as e:
+            print(f"⚠️  Write-behind transaction failed: {e}")
+            results = [(future, None, e) for future, fn, _, _ in batch if fn is not None]
+        
+        self.stats['transactions'] += 1
+        for future, result, error in results:
+            self.stats['writes'] += 1
+            if error is not None:
+                self.stats['failed'] += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        
+        # Barriers resolve once everything before them is durable
+        for future, fn, _, _ in batch:
+            if fn is None:
+                future.set_result(None)
 
 
 class Database:
     """SQLite database for content tracking and history."""
     
+    # Rows per multi-row upsert statement (5 parameters each, well under SQLite's limit)
+    UPSERT_BATCH_SIZE = 150
+    
     def __init__(self, db_path: str = "reporter.db"):
         """Initialize database connection."""
         self.db_path = db_path
-        self.conn = None
+        self.pool = ConnectionPool(db_path)
+        self._tx = threading.local()
+        self.url_filter = SeenURLFilter()
+        self._vector_index = None
+        self._vector_lock = threading.Lock()
+        self._vector_dirty = False
+        self._writer = None
+        self._writer_lock = threading.Lock()
         self.init_database()
+        self.load_url_filter()
     
-    def init_database(self):
-        """Create database tables if they don't exist."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        cursor = self.conn.cursor()
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's connection."""
+        return self.pool.get()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block in a write transaction on the calling thread's connection.
         
-        # Articles table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT UNIQUE NOT NULL,
-                title TEXT,
-                content TEXT,
-                category TEXT,
-                collected_at TIMESTAMP,
-                used_in_video BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        Nested use becomes a savepoint, so a failing inner block only rolls
+        back its own changes. Callbacks registered with after_commit() run
+        once the outermost transaction has committed.
+        """
+        conn = self.conn
+        depth = getattr(self._tx, 'depth', 0)
         
-        # Scripts table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS scripts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                category TEXT,
-                script_text TEXT,
-                description TEXT,
-                tags TEXT,
-                word_count INTEGER,
-                estimated_duration INTEGER,
-                language TEXT DEFAULT 'en',
-                video_generated BOOLEAN DEFAULT 0,
-                uploaded BOOLEAN DEFAULT 0,
-                youtube_url TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+            self._tx.after_commit = []
+        else:
+            conn.execute(f"SAVEPOINT sp_{depth}")
         
-        # Videos table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS videos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                script_id INTEGER,
-                file_path TEXT,
-                thumbnail_path TEXT,
-                video_mode TEXT,
-                duration REAL,
-                uploaded BOOLEAN DEFAULT 0,
-                youtube_id TEXT,
-                youtube_url TEXT,
-                views INTEGER DEFAULT 0,
-                likes INTEGER DEFAULT 0,
-                comments INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                uploaded_at TIMESTAMP,
-                FOREIGN KEY (script_id) REFERENCES scripts(id)
-            )
-        """)
+        callbacks = len(self._tx.after_commit)
+        self._tx.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            # Rolled-back work doesn't get its callbacks
+            del self._tx.after_commit[callbacks:]
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute(f"ROLLBACK TO sp_{depth}")
+                conn.execute(f"RELEASE sp_{depth}")
+            raise
+        else:
+            if depth == 0:
+                conn.execute("COMMIT")
+            else:
+                conn.execute(f"RELEASE sp_{depth}")
+        finally:
+            self._tx.depth = depth
         
-        # Analytics table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS analytics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                video_id INTEGER,
-                views INTEGER,
-                likes INTEGER,
-                comments INTEGER,
-                watch_time REAL,
-                recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (video_id) REFERENCES videos(id)
-            )
-        """)
+        if depth == 0:
+            pending, self._tx.after_commit = self._tx.after_commit, []
+            for callback in pending:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"⚠️  After-commit {getattr(callback, '__name__', 'callback')} failed: {e}")
+    
+    def after_commit(self, callback: Callable[[], None]):
+        """Run callback once the calling thread's transaction commits (right away outside one)."""
+        if getattr(self._tx, 'depth', 0) == 0:
+            callback()
+        else:
+            self._tx.after_commit.append(callback)
+    
+    def _close_writer(self):
+        """Commit queued writes and save the vector index they updated."""
+        self._writer.close()
+        self.save_vector_index()
+    
+    def get_writer(self) -> DatabaseWriter:
+        """Get the write-behind writer, starting its thread on first use."""
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = DatabaseWriter(
+                        self,
+                        max_batch=Config.DB_WRITER_BATCH_SIZE,
+                        max_delay=Config.DB_WRITER_MAX_DELAY_MS / 1000
+                    )
+                    # Don't lose queued writes (or the index updates they make) when the process exits
+                    atexit.register(self._close_writer)
+        return self._writer
+    
+    def write_behind(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Perform a write off the calling thread when DB_WRITE_BEHIND is enabled.
         
-        # Upload queue table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS upload_queue (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                video_id INTEGER,
-                scheduled_time TIMESTAMP,
-                status TEXT DEFAULT 'pending',
-                retry_count INTEGER DEFAULT 0,
-                error_message TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (video_id) REFERENCES videos(id)
+        Otherwise the write runs inline. Either way a Future is returned.
+        
+        Args:
+            fn: Database method (or callable) performing the write
+        """
+        if Config.DB_WRITE_BEHIND:
+            return self.get_writer().submit(fn, *args, **kwargs)
+        
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until all write-behind writes submitted so far are committed, then save the vector index."""
+        if self._writer is not None:
+            self._writer.flush(timeout)
+        self.save_vector_index()
+    
+    def init_database(self):
+        """Create or upgrade the schema by applying pending migrations."""
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
         
-        self.conn.commit()
+        for version, description, migrate in MIGRATIONS:
+            with self.transaction() as conn:
+                # Re-read inside the write lock: another process may have migrated already
+                current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+                if version <= current:
+                    continue
+                
+                migrate(conn.cursor())
+                conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+            
+            print(f"✓ Applied database migration {version}: {description}")
+        
         print("✓ Database initialized")
     
+    def schema_version(self) -> int:
+        """Get the current schema version."""
+        row = self.conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()
+        return row[0]
+    
+    def load_url_filter(self):
+        """Build the seen-URL filter from the articles table and the archived URLs."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT url, collected_at, created_at, used_in_video FROM articles")
+        
+        for row in cursor:
+            self.url_filter.add(row['url'], row['collected_at'] or row['created_at'], bool(row['used_in_video']))
+        
+        # Archived stories count as used: they are never fetched (and covered) again
+        for row in self.conn.execute("SELECT url, collected_at FROM archived_urls"):
+            self.url_filter.add(row['url'], row['collected_at'], used=True)
+    
+    def should_fetch_url(self, url: str) -> bool:
+        """Check the seen-URL filter before fetching an article page."""
+        return self.url_filter.should_fetch(url, Config.REFETCH_SEEN_AFTER_HOURS)
+    
     def add_article(self, article: Dict) -> int:
         """
         Add article to database.
@@ -114,26 +1016,167 @@ class Database:
         Returns:
             Article ID or existing ID if duplicate
         """
-        cursor = self.conn.cursor()
+        return self.add_articles([article])[0]
+    
+    def add_articles(self, articles: List[Dict]) -> List[Optional[int]]:
+        """
+        Upsert a batch of articles in a single transaction.
         
-        try:
-            cursor.execute("""
-                INSERT INTO articles (url, title, content, category, collected_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
+        Bodies go to the compressed article_bodies table keyed by content
+        hash, so syndicated copies share one blob. Existing rows keep their
+        used flag and first collection time (so re-collected stories still
+        age out); the title is refreshed and the body is replaced only by a
+        longer one.
+        
+        Returns:
+            Article IDs in the same order as the input
+        """
+        rows = []
+        bodies = {}
+        
+        for article in articles:
+            if not article.get('url'):
+                continue
+            
+            content = article.get('content', '') or ''
+            body_hash = None
+            if content:
+                body_hash = hash_body(content)
+                bodies.setdefault(body_hash, content)
+            
+            rows.append((
                 article['url'],
-                article.get('title', ''),
-                article.get('content', ''),
-                article.get('category', ''),
+                article.get('title', '') or '',
+                body_hash,
+                article.get('category', '') or '',
                 article.get('collected_at', datetime.now().isoformat())
             ))
-            self.conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            # Article already exists
-            cursor.execute("SELECT id FROM articles WHERE url = ?", (article['url'],))
-            row = cursor.fetchone()
-            return row[0] if row else None
+        
+        ids_by_url = {}
+        
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO article_bodies (hash, body, size) VALUES (?, ?, ?)",
+                [(body_hash, compress_body(body), len(body)) for body_hash, body in bodies.items()]
+            )
+            
+            # Indexed title and body of existing rows, to replace their full-text entries
+            existing = {row['id']: (row['id'], row['title'], row['content_hash']) for row in conn.execute("""
+                SELECT id, url, title, content_hash FROM articles
+                WHERE url IN (SELECT value FROM json_each(?))
+            """, (json.dumps([row[0] for row in rows]),)).fetchall()}
+            indexed = []
+            
+            # Multi-row VALUES so RETURNING works (executemany discards returned rows)
+            for start in range(0, len(rows), self.UPSERT_BATCH_SIZE):
+                chunk = rows[start:start + self.UPSERT_BATCH_SIZE]
+                placeholders = ", ".join(["(?, ?, ?, ?, ?)"] * len(chunk))
+                
+                cursor = conn.execute(f"""
+                    INSERT INTO articles (url, title, content_hash, category, collected_at)
+                    VALUES {placeholders}
+                    ON CONFLICT(url) DO UPDATE SET
+                        title = CASE WHEN excluded.title != '' THEN excluded.title ELSE articles.title END,
+                        content_hash = CASE
+                            WHEN COALESCE((SELECT size FROM article_bodies WHERE hash = excluded.content_hash), 0)
+                               > COALESCE((SELECT size FROM article_bodies WHERE hash = articles.content_hash), 0)
+                            THEN excluded.content_hash ELSE articles.content_hash END,
+                        category = COALESCE(NULLIF(articles.category, ''), excluded.category)
+                    RETURNING id, url, title, content_hash
+                """, [value for row in chunk for value in row])
+                
+                for row in cursor.fetchall():
+                    ids_by_url[row['url']] = row['id']
+                    indexed.append((row['id'], row['title'], row['content_hash']))
+            
+            changed = [row for row in indexed if existing.get(row[0]) != row]
+            self.index_articles(conn, [existing[row[0]] for row in changed if row[0] in existing], remove=True)
+            self.index_articles(conn, changed, bodies)
+        
+        for url, _, _, _, collected_at in rows:
+            self.url_filter.add(url, collected_at)
+        
+        return [ids_by_url.get(article.get('url')) for article in articles]
+    
+    def index_articles(self, conn: sqlite3.Connection, rows: List[Tuple], bodies: Optional[Dict[str, str]] = None,
+                       remove: bool = False):
+        """
+        Add articles to (or remove them from) the full-text index, inside a transaction.
+        
+        articles_fts is contentless, so an entry can only be removed with the
+        exact title and body it was added with: callers remove the old entry
+        before a row's title or body changes or the row is deleted. Rows with
+        neither title nor body are not indexed.
+        
+        Args:
+            conn: Connection with an open transaction
+            rows: (id, title, content_hash) of each article
+            bodies: Already decompressed bodies by content hash
+            remove: Remove the entries instead of adding them
+        """
+        rows = [(article_id, title or '', body_hash) for article_id, title, body_hash in rows
+                if title or body_hash]
+        if not rows:
+            return
+        
+        bodies = dict(bodies or {})
+        missing = list({body_hash for _, _, body_hash in rows if body_hash and body_hash not in bodies})
+        if missing:
+            cursor = conn.execute("""
+                SELECT hash, body FROM article_bodies
+                WHERE hash IN (SELECT value FROM json_each(?))
+            """, (json.dumps(missing),))
+            bodies.update({row['hash']: decompress_body(row['body']) for row in cursor.fetchall()})
+        
+        if remove:
+            sql = "INSERT INTO articles_fts (articles_fts, rowid, title, body) VALUES ('delete', ?, ?, ?)"
+        else:
+            sql = "INSERT INTO articles_fts (rowid, title, body) VALUES (?, ?, ?)"
+        
+        conn.executemany(sql, [(article_id, title, bodies.get(body_hash, '') if body_hash else '')
+                               for article_id, title, body_hash in rows])
+    
+    def get_articles_by_url(self, urls: List[str]) -> List[Dict]:
+        """Articles (without bodies, see load_article_bodies) in the order of urls."""
+        cursor = self.conn.execute("""
+            SELECT id, url, title, category, collected_at, used_in_video, created_at, content_hash
+            FROM articles
+            WHERE url IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(urls)),))
+        articles = {row['url']: dict(row) for row in cursor.fetchall()}
+        
+        return [articles[url] for url in urls if url in articles]
+    
+    def get_article_body(self, content_hash: Optional[str]) -> str:
+        """Load one article body by its content hash."""
+        if not content_hash:
+            return ""
+        
+        row = self.conn.execute("SELECT body FROM article_bodies WHERE hash = ?", (content_hash,)).fetchone()
+        return decompress_body(row['body']) if row else ""
+    
+    def load_article_bodies(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Fill in 'content' for articles listed without their bodies.
+        
+        Args:
+            articles: Article dictionaries with 'content_hash' (updated in place)
+        """
+        hashes = list({article['content_hash'] for article in articles
+                       if article.get('content_hash') and not article.get('content')})
+        
+        if hashes:
+            cursor = self.conn.execute("""
+                SELECT hash, body FROM article_bodies
+                WHERE hash IN (SELECT value FROM json_each(?))
+            """, (json.dumps(hashes),))
+            bodies = {row['hash']: decompress_body(row['body']) for row in cursor.fetchall()}
+            
+            for article in articles:
+                if not article.get('content'):
+                    article['content'] = bodies.get(article.get('content_hash'), '')
+        
+        return articles
     
     def is_article_used(self, url: str) -> bool:
         """Check if article was already used in a video."""
@@ -143,96 +1186,496 @@ class Database:
         return row[0] == 1 if row else False
     
     def mark_articles_used(self, urls: List[str]):
-        """Mark articles as used in video."""
-        cursor = self.conn.cursor()
+        """Mark articles as used in video (one set-based UPDATE)."""
+        with self.transaction() as conn:
+            conn.execute("""
+                UPDATE articles SET used_in_video = 1
+                WHERE url IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(urls)),))
+        
         for url in urls:
-            cursor.execute("UPDATE articles SET used_in_video = 1 WHERE url = ?", (url,))
-        self.conn.commit()
+            self.url_filter.mark_used(url)
+        
+        self._index_coverage(None, None, list(urls))
+    
+    def release_articles(self, urls: List[str]) -> int:
+        """
+        Clear the used flag of articles no script was made from, so they are
+        picked up again (e.g. the batch job they were submitted in failed).
+        
+        Returns:
+            Number of articles released
+        """
+        with self.transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE articles SET used_in_video = 0
+                WHERE url IN (SELECT value FROM json_each(?)) AND used_in_video = 1
+                  AND NOT EXISTS (SELECT 1 FROM script_sources WHERE script_sources.article_id = articles.id)
+                RETURNING id, url
+            """, (json.dumps(list(urls)),))
+            released = cursor.fetchall()
+            
+            # They no longer count as coverage either
+            self.unindex_coverage('article', [row['id'] for row in released])
+        
+        for row in released:
+            self.url_filter.mark_unused(row['url'])
+        
+        return len(released)
+    
+    def unindex_coverage(self, kind: str, doc_ids: List[int]):
+        """
+        Drop documents from the vector index once the current transaction commits.
+        
+        Args:
+            kind: 'script' or 'article'
+            doc_ids: Row ids of the documents
+        """
+        index = self.get_vector_index() if Config.SEMANTIC_COVERAGE_CHECK else None
+        if index is None or not doc_ids:
+            return
+        
+        def remove_from_index():
+            if index.remove_many(kind, doc_ids, save=False):
+                self._vector_dirty = True
+        self.after_commit(remove_from_index)
     
     def add_script(self, script_data: Dict) -> int:
-        """Add generated script to database."""
-        cursor = self.conn.cursor()
+        """
+        Add generated script to database.
         
-        cursor.execute("""
-            INSERT INTO scripts (
-                title, category, script_text, description, tags,
-                word_count, estimated_duration, language
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            script_data.get('title', ''),
-            script_data.get('category', ''),
-            script_data.get('script', ''),
-            script_data.get('description', ''),
-            json.dumps(script_data.get('tags', [])),
-            script_data.get('word_count', 0),
-            script_data.get('estimated_duration', 0),
-            script_data.get('language', 'en')
-        ))
+        The script row, its script_sources links and the used flag on its
+        source articles are written in one transaction.
+        """
+        sources = list(dict.fromkeys(script_data.get('sources', [])))
+        
+        with self.transaction() as conn:
+            cursor = conn.execute("""
+                INSERT INTO scripts (
+                    title, category, script_text, description, tags,
+                    word_count, estimated_duration, language
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                script_data.get('title', ''),
+                script_data.get('category', ''),
+                script_data.get('script', ''),
+                script_data.get('description', ''),
+                json.dumps(script_data.get('tags', [])),
+                script_data.get('word_count', 0),
+                script_data.get('estimated_duration', 0),
+                script_data.get('language', 'en')
+            ))
+            script_id = cursor.lastrowid
+            
+            if sources:
+                self._link_sources(conn, script_id, sources, script_data.get('category', ''))
         
-        self.conn.commit()
-        script_id = cursor.lastrowid
+        for url in sources:
+            self.url_filter.mark_used(url)
         
-        # Mark source articles as used
-        if 'sources' in script_data:
-            self.mark_articles_used(script_data['sources'])
+        self._index_coverage(script_id, script_data, sources)
         
         return script_id
     
-    def add_video(self, video_data: Dict) -> int:
-        """Add generated video to database."""
+    def _link_sources(self, conn: sqlite3.Connection, script_id: int, urls: List[str], category: str):
+        """Record a script's source articles and mark them used (inside a transaction)."""
+        urls_json = json.dumps(urls)
+        
+        # Sources that never went through a collector still get an article row
+        conn.execute("""
+            INSERT INTO articles (url, category, collected_at)
+            SELECT value, ?, ? FROM json_each(?) WHERE true
+            ON CONFLICT(url) DO NOTHING
+        """, (category, datetime.now().isoformat(), urls_json))
+        
+        conn.execute("""
+            INSERT OR IGNORE INTO script_sources (script_id, article_id, position)
+            SELECT ?, articles.id, sources.key
+            FROM json_each(?) AS sources
+            JOIN articles ON articles.url = sources.value
+        """, (script_id, urls_json))
+        
+        conn.execute("""
+            UPDATE articles SET used_in_video = 1
+            WHERE id IN (SELECT article_id FROM script_sources WHERE script_id = ?)
+        """, (script_id,))
+    
+    def get_script_sources(self, script_id: int) -> List[Dict]:
+        """Get the articles that fed a script, in prompt order."""
         cursor = self.conn.cursor()
         
         cursor.execute("""
-            INSERT INTO videos (
-                script_id, file_path, thumbnail_path, video_mode, duration
-            ) VALUES (?, ?, ?, ?, ?)
-        """, (
-            video_data.get('script_id'),
-            video_data.get('file_path', ''),
-            video_data.get('thumbnail_path', ''),
-            video_data.get('video_mode', ''),
-            video_data.get('duration', 0)
-        ))
+            SELECT articles.id, articles.url, articles.title, articles.category, articles.collected_at
+            FROM script_sources
+            JOIN articles ON articles.id = script_sources.article_id
+            WHERE script_sources.script_id = ?
+            ORDER BY script_sources.position
+        """, (script_id,))
         
-        self.conn.commit()
-        return cursor.lastrowid
+        return [dict(row) for row in cursor.fetchall()]
     
-    def mark_video_uploaded(self, video_id: int, youtube_url: str, youtube_id: str):
-        """Mark video as uploaded to YouTube."""
+    def get_scripts_for_article(self, url: str) -> List[Dict]:
+        """Get the scripts an article was used in."""
         cursor = self.conn.cursor()
         
         cursor.execute("""
-            UPDATE videos 
-            SET uploaded = 1, youtube_url = ?, youtube_id = ?, uploaded_at = ?
-            WHERE id = ?
-        """, (youtube_url, youtube_id, datetime.now().isoformat(), video_id))
+            SELECT scripts.id, scripts.title, scripts.category, scripts.created_at
+            FROM articles
+            JOIN script_sources ON script_sources.article_id = articles.id
+            JOIN scripts ON scripts.id = script_sources.script_id
+            WHERE articles.url = ?
+            ORDER BY scripts.created_at DESC
+        """, (url,))
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def add_video(self, video_data: Dict) -> int:
+        """Add generated video to database."""
+        with self.transaction() as conn:
+            cursor = conn.execute("""
+                INSERT INTO videos (
+                    script_id, file_path, thumbnail_path, video_mode, duration
+                ) VALUES (?, ?, ?, ?, ?)
+            """, (
+                video_data.get('script_id'),
+                video_data.get('file_path', ''),
+                video_data.get('thumbnail_path', ''),
+                video_data.get('video_mode', ''),
+                video_data.get('duration', 0)
+            ))
+            return cursor.lastrowid
+    
+    def mark_video_uploaded(self, video_id: int, youtube_url: str, youtube_id: str):
+        """Mark video as uploaded to YouTube."""
+        with self.transaction() as conn:
+            conn.execute("""
+                UPDATE videos 
+                SET uploaded = 1, youtube_url = ?, youtube_id = ?, uploaded_at = datetime('now')
+                WHERE id = ?
+            """, (youtube_url, youtube_id, video_id))
+    
+    def enqueue_upload(self, video_id: Optional[int], payload: Dict, delay_seconds: int = 0) -> int:
+        """
+        Add an upload job to the queue.
+        
+        Args:
+            video_id: videos row the job uploads
+            payload: Upload arguments (video_file, title, description, tags, ...)
+            delay_seconds: Earliest start, relative to now
+        
+        Returns:
+            Job ID
+        """
+        with self.transaction() as conn:
+            cursor = conn.execute("""
+                INSERT INTO upload_queue (video_id, payload, scheduled_time, status, updated_at)
+                VALUES (?, ?, datetime('now', '+' || ? || ' seconds'), 'pending', datetime('now'))
+            """, (video_id, json.dumps(payload), delay_seconds))
+            return cursor.lastrowid
+    
+    def claim_upload(self, worker_id: str, lease_seconds: int = 900,
+                     max_attempts: Optional[int] = None) -> Optional[Dict]:
+        """
+        Atomically claim the next due upload job.
+        
+        Due jobs are pending ones whose scheduled time has passed, and
+        in-flight ones whose lease expired (their worker crashed or stalled).
+        
+        Args:
+            worker_id: Identity of the claiming worker
+            lease_seconds: How long the claim holds without renewal
+            max_attempts: Expired jobs claimed this often are dead-lettered instead
+                (a job that keeps crashing its worker never reports a failure);
+                defaults to UPLOAD_MAX_ATTEMPTS
+        
+        Returns:
+            The claimed job (payload decoded) or None if nothing is due
+        """
+        if max_attempts is None:
+            max_attempts = Config.UPLOAD_MAX_ATTEMPTS
+        
+        with self.transaction() as conn:
+            conn.execute("""
+                UPDATE upload_queue
+                SET status = 'dead', lease_owner = NULL, updated_at = datetime('now'),
+                    error_message = COALESCE(error_message, 'lease expired too many times')
+                WHERE status = 'processing' AND lease_expires_at < datetime('now') AND attempts >= ?
+            """, (max_attempts,))
+            
+            row = conn.execute("""
+                UPDATE upload_queue
+                SET status = 'processing', lease_owner = ?, attempts = COALESCE(attempts, 0) + 1,
+                    lease_expires_at = datetime('now', '+' || ? || ' seconds'), updated_at = datetime('now')
+                WHERE id = (
+                    SELECT id FROM upload_queue
+                    WHERE (status = 'pending' AND COALESCE(scheduled_time, '') <= datetime('now'))
+                       OR (status = 'processing' AND lease_expires_at < datetime('now'))
+                    ORDER BY scheduled_time, id
+                    LIMIT 1
+                )
+                RETURNING *
+            """, (worker_id, lease_seconds)).fetchone()
+        
+        if row is None:
+            return None
+        
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'] or '{}')
+        return job
+    
+    def renew_upload_lease(self, job_id: int, worker_id: str, lease_seconds: int = 900) -> bool:
+        """Extend a claimed job's lease (heartbeat). False if the lease was lost."""
+        with self.transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE upload_queue
+                SET lease_expires_at = datetime('now', '+' || ? || ' seconds'), updated_at = datetime('now')
+                WHERE id = ? AND status = 'processing' AND lease_owner = ?
+            """, (lease_seconds, job_id, worker_id))
+            return cursor.rowcount == 1
+    
+    def complete_upload(self, job_id: int, worker_id: str, youtube_url: str, youtube_id: str) -> bool:
+        """
+        Mark a claimed job done and its video uploaded.
+        
+        Returns:
+            False if the worker no longer holds the lease (nothing is changed)
+        """
+        with self.transaction() as conn:
+            row = conn.execute("""
+                UPDATE upload_queue
+                SET status = 'uploaded', lease_owner = NULL, lease_expires_at = NULL, error_message = NULL,
+                    completed_at = datetime('now'), updated_at = datetime('now')
+                WHERE id = ? AND status = 'processing' AND lease_owner = ?
+                RETURNING video_id
+            """, (job_id, worker_id)).fetchone()
+            
+            if row is None:
+                return False
+            
+            if row['video_id'] is not None:
+                self.mark_video_uploaded(row['video_id'], youtube_url, youtube_id)
+            return True
+    
+    def fail_upload(self, job_id: int, worker_id: str, error: str, max_retries: int = 5,
+                    base_delay: int = 60, permanent: bool = False) -> Optional[str]:
+        """
+        Record a failed attempt: retry later with exponential backoff, or dead-letter.
+        
+        Args:
+            job_id: Job ID
+            worker_id: Worker holding the lease
+            error: Error message to record
+            max_retries: Failures before the job is dead-lettered
+            base_delay: Seconds before the first retry (doubles each time)
+            permanent: Dead-letter immediately (e.g. the video file is missing)
+        
+        Returns:
+            New status ('pending' or 'dead'), or None if the lease was lost
+        """
+        with self.transaction() as conn:
+            row = conn.execute("""
+                SELECT retry_count FROM upload_queue
+                WHERE id = ? AND status = 'processing' AND lease_owner = ?
+            """, (job_id, worker_id)).fetchone()
+            
+            if row is None:
+                return None
+            
+            retries = (row['retry_count'] or 0) + 1
+            status = 'dead' if permanent or retries >= max_retries else 'pending'
+            # Jitter spreads out retries of jobs that failed together
+            delay = int(base_delay * 2 ** (retries - 1) * random.uniform(0.8, 1.2))
+            
+            conn.execute("""
+                UPDATE upload_queue
+                SET status = ?, retry_count = ?, error_message = ?, lease_owner = NULL, lease_expires_at = NULL,
+                    scheduled_time = datetime('now', '+' || ? || ' seconds'), updated_at = datetime('now')
+                WHERE id = ?
+            """, (status, retries, error[:1000], delay, job_id))
+            return status
+    
+    def retry_dead_uploads(self, job_ids: Optional[List[int]] = None) -> int:
+        """Put dead-lettered jobs (all, or the given ones) back in the queue."""
+        with self.transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE upload_queue
+                SET status = 'pending', retry_count = 0, scheduled_time = datetime('now'), updated_at = datetime('now')
+                WHERE status = 'dead' AND (? IS NULL OR id IN (SELECT value FROM json_each(?)))
+            """, (None if job_ids is None else 1, json.dumps(job_ids or [])))
+            return cursor.rowcount
+    
+    def get_upload_jobs(self, status: Optional[str] = None, limit: int = 100,
+                        job_ids: Optional[List[int]] = None) -> List[Dict]:
+        """
+        List upload jobs, newest activity first.
         
-        self.conn.commit()
+        Pass status='processing' to see in-flight jobs with their lease owner
+        and expiry, or status='dead' for the dead-letter queue.
+        
+        Args:
+            status: Only jobs in this status
+            limit: Maximum jobs to return
+            job_ids: Only these jobs
+        """
+        cursor = self.conn.execute("""
+            SELECT id, video_id, status, attempts, retry_count, error_message, lease_owner,
+                   lease_expires_at, scheduled_time, updated_at, completed_at,
+                   json_extract(payload, '$.title') AS title
+            FROM upload_queue
+            WHERE (? IS NULL OR status = ?)
+              AND (? IS NULL OR id IN (SELECT value FROM json_each(?)))
+            ORDER BY updated_at DESC, id DESC
+            LIMIT ?
+        """, (status, status, None if job_ids is None else 1, json.dumps(job_ids or []), limit))
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_upload_queue_counts(self) -> Dict[str, int]:
+        """Number of upload jobs per status (due and waiting pending jobs are both 'pending')."""
+        cursor = self.conn.execute("SELECT status, COUNT(*) AS count FROM upload_queue GROUP BY status")
+        return {row['status']: row['count'] for row in cursor.fetchall()}
+    
+    def add_llm_batch(self, provider: str, model: str, batch_id: str, requests: Dict[str, Dict],
+                      first_poll_seconds: int = 60) -> int:
+        """
+        Record a submitted provider batch job.
+        
+        Args:
+            provider: LLM provider (openai, anthropic)
+            model: Model the prompts were sent to
+            batch_id: Provider's batch job ID
+            requests: Per custom_id, what is needed to use the result (category, sources)
+            first_poll_seconds: Delay before the first status check
+        
+        Returns:
+            Row ID
+        """
+        with self.transaction() as conn:
+            cursor = conn.execute("""
+                INSERT INTO llm_batches (provider, model, batch_id, requests, next_poll_at, updated_at)
+                VALUES (?, ?, ?, ?, datetime('now', '+' || ? || ' seconds'), datetime('now'))
+            """, (provider, model, batch_id, json.dumps(requests), first_poll_seconds))
+            return cursor.lastrowid
+    
+    def get_due_llm_batches(self, provider: Optional[str] = None) -> List[Dict]:
+        """Open batch jobs whose next status check is due (requests decoded)."""
+        cursor = self.conn.execute("""
+            SELECT * FROM llm_batches
+            WHERE status = 'submitted' AND next_poll_at <= datetime('now')
+              AND (? IS NULL OR provider = ?)
+            ORDER BY next_poll_at, id
+        """, (provider, provider))
+        
+        batches = []
+        for row in cursor.fetchall():
+            batch = dict(row)
+            batch['requests'] = json.loads(batch['requests'])
+            batches.append(batch)
+        return batches
+    
+    def schedule_llm_batch_poll(self, batch_id: str, provider_status: str, delay_seconds: int):
+        """Record a status check of a batch that isn't done, and when to check next."""
+        with self.transaction() as conn:
+            conn.execute("""
+                UPDATE llm_batches
+                SET provider_status = ?, poll_count = poll_count + 1,
+                    next_poll_at = datetime('now', '+' || ? || ' seconds'), updated_at = datetime('now')
+                WHERE batch_id = ?
+            """, (provider_status, delay_seconds, batch_id))
+    
+    def finish_llm_batch(self, batch_id: str, status: str, provider_status: Optional[str] = None,
+                         error: Optional[str] = None):
+        """
+        Close a batch job.
+        
+        Args:
+            batch_id: Provider's batch job ID
+            status: 'collected' (results used) or 'failed'
+            provider_status: Last status reported by the provider
+            error: Error message to record
+        """
+        with self.transaction() as conn:
+            conn.execute("""
+                UPDATE llm_batches
+                SET status = ?, provider_status = COALESCE(?, provider_status), error_message = ?,
+                    next_poll_at = NULL, completed_at = datetime('now'), updated_at = datetime('now')
+                WHERE batch_id = ?
+            """, (status, provider_status, error[:1000] if error else None, batch_id))
+    
+    def record_llm_usage(self, provider: str, model: str, input_tokens: int, cache_read_tokens: int,
+                         cache_write_tokens: int, output_tokens: int):
+        """
+        Record the tokens of one LLM call.
+        
+        Args:
+            provider: LLM provider
+            model: Model name
+            input_tokens: Input tokens that missed the prompt cache
+            cache_read_tokens: Input tokens read from the prompt cache
+            cache_write_tokens: Input tokens written to the prompt cache
+            output_tokens: Completion tokens
+        """
+        with self.transaction() as conn:
+            conn.execute("""
+                INSERT INTO llm_usage (provider, model, input_tokens, cache_read_tokens, cache_write_tokens, output_tokens)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (provider, model, input_tokens, cache_read_tokens, cache_write_tokens, output_tokens))
+    
+    def get_llm_usage(self, hours: int = 24) -> Dict:
+        """Token totals of the LLM calls in the last N hours, with the prompt cache hit rate."""
+        row = self.conn.execute("""
+            SELECT COUNT(*) AS calls,
+                   COALESCE(SUM(input_tokens), 0) AS input_tokens,
+                   COALESCE(SUM(cache_read_tokens), 0) AS cache_read_tokens,
+                   COALESCE(SUM(cache_write_tokens), 0) AS cache_write_tokens,
+                   COALESCE(SUM(output_tokens), 0) AS output_tokens
+            FROM llm_usage
+            WHERE created_at >= datetime('now', '-' || ? || ' hours')
+        """, (hours,)).fetchone()
+        
+        usage = dict(row)
+        total_input = usage['input_tokens'] + usage['cache_read_tokens'] + usage['cache_write_tokens']
+        usage['cache_hit_rate'] = usage['cache_read_tokens'] / total_input if total_input else 0.0
+        return usage
     
     def get_statistics(self, days: int = 30) -> Dict:
-        """Get statistics for the last N days."""
+        """
+        Get statistics for the last N days.
+        
+        Reads the daily_stats rollups, so the cost grows with the number of
+        days rather than the number of scripts.
+        """
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d')
         cursor = self.conn.cursor()
         
         cursor.execute("""
-            SELECT 
-                COUNT(*) as total_scripts,
-                COUNT(CASE WHEN video_generated = 1 THEN 1 END) as videos_generated,
-                COUNT(CASE WHEN uploaded = 1 THEN 1 END) as videos_uploaded
-            FROM scripts
-            WHERE created_at >= datetime('now', '-' || ? || ' days')
-        """, (days,))
+            SELECT
+                COALESCE(SUM(scripts), 0) as total_scripts,
+                COALESCE(SUM(videos_generated), 0) as videos_generated,
+                COALESCE(SUM(videos_uploaded), 0) as videos_uploaded,
+                COALESCE(SUM(views), 0) as views,
+                COALESCE(SUM(likes), 0) as likes
+            FROM daily_stats
+            WHERE day >= ?
+        """, (since,))
         
         stats = dict(cursor.fetchone())
         
-        # Get category breakdown
-        cursor.execute("""
-            SELECT category, COUNT(*) as count
-            FROM scripts
-            WHERE created_at >= datetime('now', '-' || ? || ' days')
-            GROUP BY category
-        """, (days,))
-        
-        stats['by_category'] = {row['category']: row['count'] for row in cursor.fetchall()}
+        # Breakdowns: scripts by category and language, videos by mode
+        for key, column, measure in (
+            ('by_category', 'category', 'scripts'),
+            ('by_language', 'language', 'scripts'),
+            ('by_video_mode', 'video_mode', 'videos_generated')
+        ):
+            cursor.execute(f"""
+                SELECT {column}, SUM({measure}) as count
+                FROM daily_stats
+                WHERE day >= ?
+                GROUP BY {column}
+                HAVING count > 0
+            """, (since,))
+            
+            stats[key] = {row[column]: row['count'] for row in cursor.fetchall()}
         
         return stats
     
@@ -248,32 +1691,268 @@ class Database:
         
         return [row['title'] for row in cursor.fetchall()]
     
-    def get_unused_articles(self, category: str, limit: int = 10) -> List[Dict]:
-        """Get articles that haven't been used yet."""
+    def find_recent_coverage(self, text: str, days: int = 7, limit: int = 5,
+                             category: Optional[str] = None) -> List[Dict]:
+        """
+        Full-text search for recent scripts and used articles similar to text.
+        
+        Args:
+            text: Story title (and optionally summary) to check
+            days: How far back to look
+            limit: Maximum matches to return
+            category: Restrict to one category
+        
+        Returns:
+            Matches (best first) with 'kind' ('script' or 'article'), 'id',
+            'title', 'category', 'date' and BM25 'score' (higher is closer)
+        """
+        query = fts_query(text)
+        if not query:
+            return []
+        
+        cursor = self.conn.cursor()
+        matches = []
+        
+        # Titles weigh much more than body text
+        cursor.execute("""
+            SELECT scripts.id, scripts.title, scripts.category, scripts.created_at AS date,
+                   -bm25(scripts_fts, 10.0, 1.0) AS score
+            FROM scripts_fts
+            JOIN scripts ON scripts.id = scripts_fts.rowid
+            WHERE scripts_fts MATCH ?
+              AND scripts.created_at >= datetime('now', '-' || ? || ' days')
+              AND (? IS NULL OR scripts.category = ?)
+            ORDER BY bm25(scripts_fts, 10.0, 1.0)
+            LIMIT ?
+        """, (query, days, category, category, limit))
+        matches.extend(dict(row, kind='script') for row in cursor.fetchall())
+        
+        cursor.execute("""
+            SELECT articles.id, articles.title, articles.category, articles.collected_at AS date,
+                   -bm25(articles_fts, 10.0, 1.0) AS score
+            FROM articles_fts
+            JOIN articles ON articles.id = articles_fts.rowid
+            WHERE articles_fts MATCH ?
+              AND articles.used_in_video = 1
+              AND articles.created_at >= datetime('now', '-' || ? || ' days')
+              AND (? IS NULL OR articles.category = ?)
+            ORDER BY bm25(articles_fts, 10.0, 1.0)
+            LIMIT ?
+        """, (query, days, category, category, limit))
+        matches.extend(dict(row, kind='article') for row in cursor.fetchall())
+        
+        matches.sort(key=lambda match: match['score'], reverse=True)
+        return matches[:limit]
+    
+    def has_recent_coverage(self, text: str, days: int = 7, category: Optional[str] = None,
+                            min_score: Optional[float] = None) -> bool:
+        """Check whether we covered something like text in the last N days."""
+        if min_score is None:
+            min_score = Config.COVERAGE_MIN_SCORE
+        
+        matches = self.find_recent_coverage(text, days=days, limit=1, category=category)
+        return bool(matches) and matches[0]['score'] >= min_score
+    
+    def get_vector_index(self):
+        """
+        Get the local vector index of recent scripts and used articles.
+        
+        Loaded lazily from <db name>.vectors.npz next to the database and
+        rebuilt from the tables when that file is missing.
+        
+        Returns:
+            VectorIndex, or None if NumPy is not installed
+        """
+        if self._vector_index is None:
+            with self._vector_lock:
+                if self._vector_index is None:
+                    try:
+                        from vector_index import VectorIndex
+                    except ImportError:
+                        print("⚠️  numpy not installed - semantic coverage checks disabled. Install with: pip install numpy")
+                        self._vector_index = False
+                        return None
+                    
+                    index = VectorIndex(
+                        str(Path(self.db_path).with_suffix('.vectors.npz')),
+                        dim=Config.VECTOR_INDEX_DIM,
+                        retention_days=Config.VECTOR_INDEX_RETENTION_DAYS
+                    )
+                    if not len(index):
+                        self._rebuild_vector_index(index)
+                    self._vector_index = index
+                    atexit.register(self.save_vector_index)
+        
+        # An empty index is falsy, so compare with the "numpy missing" marker
+        return self._vector_index if self._vector_index is not False else None
+    
+    def _rebuild_vector_index(self, index):
+        """Fill an empty vector index from scripts and used articles within its retention."""
+        cursor = self.conn.execute("""
+            SELECT id, title, script_text, created_at FROM scripts
+            WHERE created_at >= datetime('now', '-' || ? || ' days')
+        """, (index.retention_days,))
+        
+        documents = [
+            ('script', row['id'], f"{row['title']}\n{row['script_text']}", SeenURLFilter._timestamp(row['created_at']))
+            for row in cursor.fetchall()
+        ]
+        documents.extend(self._article_documents(
+            "used_in_video = 1 AND created_at >= datetime('now', '-' || ? || ' days')",
+            (index.retention_days,)
+        ))
+        
+        if documents:
+            index.add_many(documents)
+            print(f"✓ Vector index built: {len(index)} documents")
+    
+    def _article_documents(self, where: str, params: tuple) -> List[tuple]:
+        """Vector index documents (title plus the start of the body) for matching articles."""
+        cursor = self.conn.execute(f"""
+            SELECT id, title, content_hash, collected_at, created_at FROM articles
+            WHERE {where}
+        """, params)
+        articles = self.load_article_bodies([dict(row) for row in cursor.fetchall()])
+        
+        return [
+            ('article', article['id'],
+             f"{article['title'] or ''}\n{(article.get('content') or '')[:2000]}",
+             SeenURLFilter._timestamp(article['collected_at'] or article['created_at']) or None)
+            for article in articles
+        ]
+    
+    def _index_coverage(self, script_id: Optional[int], script_data: Optional[Dict], urls: List[str]):
+        """
+        Add a new script and the articles it used to the vector index.
+        
+        The in-memory index is updated once the write commits, so the write
+        lock isn't held for it; the file is saved by flush() and close().
+        """
+        if not Config.SEMANTIC_COVERAGE_CHECK:
+            return
+        
+        index = self.get_vector_index()
+        if index is None:
+            return
+        
+        try:
+            documents = []
+            if script_id is not None:
+                documents.append(('script', script_id,
+                                  f"{script_data.get('title', '')}\n{script_data.get('script', '')}", None))
+            if urls:
+                documents.extend(self._article_documents(
+                    "url IN (SELECT value FROM json_each(?))", (json.dumps(urls),)
+                ))
+        except Exception as e:
+            print(f"⚠️  Error updating vector index: {e}")
+            return
+        
+        def add_to_index():
+            index.add_many(documents, save=False)
+            self._vector_dirty = True
+        
+        self.after_commit(add_to_index)
+    
+    def save_vector_index(self):
+        """Persist the vector index if it changed since it was last saved."""
+        if self._vector_index is None or self._vector_index is False or not self._vector_dirty:
+            return
+        
+        self._vector_dirty = False
+        try:
+            self._vector_index.save()
+        except Exception as e:
+            self._vector_dirty = True
+            print(f"⚠️  Error saving vector index: {e}")
+    
+    def find_similar_coverage(self, text: str, days: int = 7, limit: int = 5) -> List[Dict]:
+        """
+        Semantic search for recent scripts and used articles similar to text.
+        
+        Catches rephrased coverage that full-text matching misses.
+        
+        Args:
+            text: Story title and lead to check
+            days: How far back to look
+            limit: Maximum matches to return
+        
+        Returns:
+            Matches (best first) with 'kind', 'id', 'title', 'date' and cosine
+            'score' (0-1, higher is closer)
+        """
+        index = self.get_vector_index()
+        if index is None:
+            return []
+        
+        matches = index.query(text, k=limit, days=days)
+        
+        titles = {}
+        for kind, table in (('script', 'scripts'), ('article', 'articles')):
+            ids = [match['id'] for match in matches if match['kind'] == kind]
+            if ids:
+                cursor = self.conn.execute(f"""
+                    SELECT id, title FROM {table}
+                    WHERE id IN (SELECT value FROM json_each(?))
+                """, (json.dumps(ids),))
+                titles.update({(kind, row['id']): row['title'] for row in cursor.fetchall()})
+        
+        return [
+            dict(match, title=titles.get((match['kind'], match['id'])) or '',
+                 date=datetime.fromtimestamp(match.pop('timestamp')).isoformat())
+            for match in matches
+        ]
+    
+    def has_similar_coverage(self, text: str, days: int = 7, min_score: Optional[float] = None) -> bool:
+        """Check whether we covered a story semantically close to text in the last N days."""
+        if min_score is None:
+            min_score = Config.SEMANTIC_COVERAGE_MIN_SCORE
+        
+        matches = self.find_similar_coverage(text, days=days, limit=1)
+        return bool(matches) and matches[0]['score'] >= min_score
+    
+    def get_unused_articles(self, category: str, limit: int = 10, include_content: bool = False) -> List[Dict]:
+        """
+        Get articles that haven't been used yet.
+        
+        Bodies are not loaded unless include_content is set; pass the result
+        to load_article_bodies() when they are needed.
+        """
         cursor = self.conn.cursor()
         
         cursor.execute("""
-            SELECT * FROM articles
+            SELECT id, url, title, category, collected_at, used_in_video, created_at, content_hash
+            FROM articles
             WHERE category = ? AND used_in_video = 0
             ORDER BY collected_at DESC
             LIMIT ?
         """, (category, limit))
         
-        return [dict(row) for row in cursor.fetchall()]
+        articles = [dict(row) for row in cursor.fetchall()]
+        
+        if include_content:
+            self.load_article_bodies(articles)
+        
+        return articles
     
     def close(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """Commit pending write-behind writes and close all database connections."""
+        if self._writer is not None:
+            self._writer.close()
+        self.save_vector_index()
+        self.pool.close_all()
 
 
 # Singleton instance
 _db_instance = None
+_db_lock = threading.Lock()
 
 def get_database() -> Database:
-    """Get database singleton instance."""
+    """Get database singleton instance (safe to share across threads)."""
     global _db_instance
     if _db_instance is None:
-        _db_instance = Database()
+        with _db_lock:
+            if _db_instance is None:
+                _db_instance = Database()
     return _db_instance
 
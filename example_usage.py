@@ -28,7 +28,10 @@ def example_1_database_tracking():
     print(f"  Total scripts: {stats['total_scripts']}")
     print(f"  Videos generated: {stats['videos_generated']}")
     print(f"  Videos uploaded: {stats['videos_uploaded']}")
+    print(f"  Views: {stats['views']}  Likes: {stats['likes']}")
     print(f"  By category: {stats['by_category']}")
+    print(f"  By language: {stats['by_language']}")
+    print(f"  By video mode: {stats['by_video_mode']}")
     
     # Check recent topics to avoid duplicates
     recent_topics = db.get_recent_topics('sports', days=7)
@@ -69,7 +72,8 @@ def example_3_multiple_news_sources():
         language='en',
         use_newsapi=Config.USE_NEWSAPI,
         use_rss=Config.USE_RSS_FEEDS,
-        use_reddit=Config.USE_REDDIT
+        use_reddit=Config.USE_REDDIT,
+        enrich=Config.ENRICH_FULL_TEXT
     )
     
     print(f"\n📰 Collected {len(articles)} articles")
@@ -260,7 +264,7 @@ def main():
         print("3. Run: python main.py --once")
         print("\nRead NEW_FEATURES.md for detailed usage guide.")
         print("="*70 + "\n")
-        
+    
     except Exception as e:
         print(f"\n❌ Error running examples: {str(e)}")
         print("Make sure all dependencies are installed and configured.")
@@ -0,0 +1,292 @@
+"""Columnar export of scripts, videos and analytics for offline analysis."""
+
+import csv
+import gzip
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from config import Config
+
+
+class HistoryExporter:
+    """
+    Stream tables out of reporter.db into compressed columnar files.
+    
+    Reads go through a separate read-only connection holding one snapshot
+    (WAL lets the pipeline keep writing meanwhile), in chunks of
+    EXPORT_CHUNK_ROWS. Each run exports only rows added or updated since the
+    previous run's watermark unless full=True: per table, the highest id
+    exported and the last row_changes entry seen (scripts and videos are
+    updated after they are inserted, so changed rows are exported again).
+    """
+    
+    TABLES = ['scripts', 'videos', 'analytics']
+    FORMATS = ['parquet', 'arrow', 'csv.gz', 'npz']
+    
+    # SQLite declared type -> Arrow type
+    ARROW_TYPES = {'INTEGER': 'int64', 'BOOLEAN': 'int64', 'REAL': 'float64'}
+    
+    def __init__(self, db_path: str = "reporter.db", output_dir: Optional[str] = None,
+                 format: str = "auto", chunk_rows: Optional[int] = None):
+        """
+        Initialize the exporter.
+        
+        Args:
+            db_path: Database to export from
+            output_dir: Directory for export files and the watermark file
+            format: parquet, arrow, csv.gz, npz or auto (Parquet if pyarrow is installed)
+            chunk_rows: Rows fetched (and written) per chunk
+        """
+        if format == "auto":
+            format = "parquet" if PYARROW_AVAILABLE else "csv.gz"
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown export format: {format} (choose from {', '.join(self.FORMATS)})")
+        if format in ('parquet', 'arrow') and not PYARROW_AVAILABLE:
+            raise ValueError(f"{format} export needs pyarrow. Install with: pip install pyarrow")
+        
+        self.db_path = db_path
+        self.output_dir = Path(output_dir or Config.EXPORT_DIR)
+        self.format = format
+        self.chunk_rows = chunk_rows or Config.EXPORT_CHUNK_ROWS
+        self.watermark_file = self.output_dir / "watermarks.json"
+        self.output_dir.mkdir(exist_ok=True)
+    
+    def export(self, tables: Optional[List[str]] = None, full: bool = False) -> Dict[str, Dict]:
+        """
+        Export tables from one consistent snapshot.
+        
+        Args:
+            tables: Tables to export (defaults to scripts, videos, analytics)
+            full: Ignore the watermarks and export every row
+        
+        Returns:
+            Per table: rows exported, output file and new watermark
+        """
+        # Only the tables exported now get new watermarks; the others keep theirs
+        watermarks = self._load_watermarks()
+        results = {}
+        
+        # mode=ro: the export can never write or take the write lock
+        conn = sqlite3.connect(f"file:{Path(self.db_path).resolve()}?mode=ro", uri=True, isolation_level=None)
+        try:
+            # One read transaction for every table, so they agree with each other
+            conn.execute("BEGIN")
+            
+            for table in tables or self.TABLES:
+                since = {'id': 0, 'change': 0} if full else self._watermark(watermarks, table)
+                results[table] = self._export_table(conn, table, since)
+                if results[table]['rows']:
+                    watermarks[table] = results[table]['watermark']
+            
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        
+        self._save_watermarks(watermarks)
+        return results
+    
+    def _export_table(self, conn: sqlite3.Connection, table: str, since: Dict[str, int]) -> Dict:
+        """Stream one table's new and changed rows into a file."""
+        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        if not columns:
+            raise ValueError(f"Unknown table: {table}")
+        
+        names = [column[1] for column in columns]
+        types = [(column[2] or 'TEXT').upper() for column in columns]
+        since_id = since['id']
+        
+        # Databases from before the change log only get new rows
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'row_changes'").fetchone():
+            change = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM row_changes WHERE table_name = ?", (table,)
+            ).fetchone()[0]
+            cursor = conn.execute(f"""
+                SELECT * FROM {table}
+                WHERE id > ? OR id IN (SELECT row_id FROM row_changes WHERE table_name = ? AND seq > ?)
+                ORDER BY id
+            """, (since_id, table, since['change']))
+        else:
+            change = since['change']
+            cursor = conn.execute(f"SELECT * FROM {table} WHERE id > ? ORDER BY id", (since_id,))
+        id_index = names.index('id')
+        
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = self.output_dir / table / f"{table}-{stamp}-from-{since_id + 1}.{self.format}"
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        
+        writer = self._open_writer(tmp_path, names, types)
+        rows = 0
+        watermark = since_id
+        
+        try:
+            while True:
+                chunk = cursor.fetchmany(self.chunk_rows)
+                if not chunk:
+                    break
+                
+                writer.write(chunk)
+                rows += len(chunk)
+                watermark = max(watermark, chunk[-1][id_index])
+        finally:
+            writer.close()
+        
+        if rows:
+            os.replace(tmp_path, path)
+            print(f"✓ Exported {rows} {table} rows -> {path}")
+        else:
+            tmp_path.unlink(missing_ok=True)
+            path = None
+            print(f"  No new {table} rows")
+        
+        return {'rows': rows, 'path': str(path) if path else None,
+                'watermark': {'id': watermark, 'change': change}}
+    
+    def _open_writer(self, path: Path, names: List[str], types: List[str]):
+        """Chunk writer for the configured format."""
+        if self.format in ('parquet', 'arrow'):
+            schema = pa.schema([
+                (name, pa.type_for_alias(self.ARROW_TYPES.get(sql_type, 'string')))
+                for name, sql_type in zip(names, types)
+            ])
+            return _ArrowWriter(path, schema, self.format)
+        if self.format == 'npz':
+            return _NpzWriter(path, names)
+        return _CsvGzWriter(path, names)
+    
+    @staticmethod
+    def _watermark(watermarks: Dict, table: str) -> Dict[str, int]:
+        """A table's watermark; files from before change tracking hold only the id."""
+        watermark = watermarks.get(table, 0)
+        if isinstance(watermark, int):
+            return {'id': watermark, 'change': 0}
+        return watermark
+    
+    def _load_watermarks(self) -> Dict[str, Dict[str, int]]:
+        """Highest exported id and change per table from the previous run."""
+        if self.watermark_file.exists():
+            with open(self.watermark_file, 'r') as f:
+                return json.load(f)
+        return {}
+    
+    def _save_watermarks(self, watermarks: Dict[str, Dict[str, int]]):
+        """Persist watermarks (atomically, after the files are in place)."""
+        tmp_path = self.watermark_file.with_name(self.watermark_file.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(tmp_path, self.watermark_file)
+
+
+class _ArrowWriter:
+    """Parquet (one row group per chunk) or Arrow IPC file writer, zstd-compressed."""
+    
+    def __init__(self, path: Path, schema, format: str):
+        """Open the file for the given Arrow schema."""
+        self.schema = schema
+        if format == 'parquet':
+            self._writer = pa.parquet.ParquetWriter(str(path), schema, compression='zstd')
+        else:
+            self._writer = pa.ipc.new_file(
+                str(path), schema, options=pa.ipc.IpcWriteOptions(compression='zstd')
+            )
+    
+    def write(self, rows: List[tuple]):
+        """Write one chunk of rows."""
+        columns = list(zip(*rows))
+        arrays = [pa.array(column, type=field.type) for column, field in zip(columns, self.schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+    
+    def close(self):
+        """Finish the file."""
+        self._writer.close()
+
+
+class _CsvGzWriter:
+    """Gzipped CSV with a header row."""
+    
+    def __init__(self, path: Path, names: List[str]):
+        """Open the file and write the header."""
+        self._file = gzip.open(path, 'wt', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(names)
+    
+    def write(self, rows: List[tuple]):
+        """Write one chunk of rows."""
+        self._writer.writerows(rows)
+    
+    def close(self):
+        """Finish the file."""
+        self._file.close()
+
+
+class _NpzWriter:
+    """
+    Compressed NumPy archive with one array per column.
+    
+    NPZ members can't be appended to, so chunks are collected column-wise
+    and written on close.
+    """
+    
+    def __init__(self, path: Path, names: List[str]):
+        """Prepare empty column buffers."""
+        import numpy as np
+        self._np = np
+        self.path = path
+        self.names = names
+        self._columns: List[list] = [[] for _ in names]
+    
+    def write(self, rows: List[tuple]):
+        """Buffer one chunk of rows."""
+        for values, column in zip(zip(*rows), self._columns):
+            column.extend(values)
+    
+    def close(self):
+        """Write all columns."""
+        np = self._np
+        arrays = {}
+        
+        for name, values in zip(self.names, self._columns):
+            if values and all(isinstance(value, int) for value in values):
+                arrays[name] = np.array(values, dtype=np.int64)
+            elif values and all(isinstance(value, (int, float)) for value in values):
+                arrays[name] = np.array(values, dtype=np.float64)
+            else:
+                arrays[name] = np.array(['' if value is None else str(value) for value in values])
+        
+        with open(self.path, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+
+
+def main():
+    """Command line entry point: python history_export.py [--format F] [--full] [--tables a,b]"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Export reporter.db history for offline analysis")
+    parser.add_argument('--format', default='auto', choices=['auto'] + HistoryExporter.FORMATS)
+    parser.add_argument('--full', action='store_true', help="ignore watermarks and export everything")
+    parser.add_argument('--tables', default=','.join(HistoryExporter.TABLES), help="comma-separated tables")
+    parser.add_argument('--db', default="reporter.db", help="database file")
+    parser.add_argument('--out', default=None, help="output directory")
+    args = parser.parse_args()
+    
+    exporter = HistoryExporter(args.db, output_dir=args.out, format=args.format)
+    print(f"\n📦 Exporting {args.tables} as {exporter.format} to {exporter.output_dir}/")
+    
+    results = exporter.export(args.tables.split(','), full=args.full)
+    print(f"✓ Export complete: {sum(result['rows'] for result in results.values())} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Persistent content-addressed cache of LLM completions."""
+
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from config import Config
+from database import ConnectionPool, compress_body, decompress_body, get_database
+
+
+class LLMCache:
+    """
+    SQLite cache of LLM completions keyed by a hash of the full request.
+    
+    The key covers provider, model, system prompt, user prompt, temperature
+    and max_tokens, so any change to the request is a miss. Entries store
+    the raw completion (compressed) and the parsed result, expire after a
+    TTL, and the least recently used ones are dropped beyond a size cap.
+    """
+    
+    def __init__(self, path: Optional[str] = None, ttl_hours: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: Cache database file (defaults to LLM_CACHE_FILE, else
+                llm_cache.db next to the main database)
+            ttl_hours: Entries older than this are ignored and pruned
+            max_entries: Entries kept at most (least recently used go first)
+        """
+        self.ttl_seconds = (ttl_hours if ttl_hours is not None else Config.LLM_CACHE_TTL_HOURS) * 3600
+        self.max_entries = max_entries if max_entries is not None else Config.LLM_CACHE_MAX_ENTRIES
+        path = path or Config.LLM_CACHE_FILE or str(Path(get_database().db_path).resolve().with_name("llm_cache.db"))
+        self.pool = ConnectionPool(path)
+        self.stats = {'hits': 0, 'misses': 0}
+        
+        self.pool.get().execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                provider TEXT,
+                model TEXT,
+                completion BLOB NOT NULL,
+                parsed TEXT,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL,
+                hits INTEGER DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        self.pool.get().execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used_at)")
+    
+    @staticmethod
+    def key(provider: str, model: str, system_prompt: Optional[str], prompt: str,
+            temperature: Optional[float], max_tokens: Optional[int]) -> str:
+        """Content address of an LLM request."""
+        request = json.dumps([provider, model, system_prompt or "", prompt, temperature, max_tokens])
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached completion.
+        
+        Returns:
+            {'completion': str, 'parsed': object or None}, or None on a miss
+        """
+        conn = self.pool.get()
+        row = conn.execute(
+            "SELECT completion, parsed FROM llm_cache WHERE key = ? AND created_at >= ?",
+            (key, time.time() - self.ttl_seconds)
+        ).fetchone()
+        
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        
+        conn.execute(
+            "UPDATE llm_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?",
+            (time.time(), key)
+        )
+        self.stats['hits'] += 1
+        
+        return {
+            'completion': decompress_body(row['completion']),
+            'parsed': json.loads(row['parsed']) if row['parsed'] else None
+        }
+    
+    def put(self, key: str, completion: str, parsed: Any = None, provider: str = "", model: str = ""):
+        """Store a completion and its parsed result, then enforce TTL and size cap."""
+        now = time.time()
+        conn = self.pool.get()
+        
+        conn.execute("""
+            INSERT OR REPLACE INTO llm_cache (key, provider, model, completion, parsed, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (key, provider, model, compress_body(completion),
+              json.dumps(parsed) if parsed is not None else None, now, now))
+        
+        self.prune()
+    
+    def prune(self):
+        """Drop expired entries and the least recently used ones beyond the cap."""
+        conn = self.pool.get()
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        conn.execute("""
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+    
+    def clear(self):
+        """Remove every cached completion."""
+        self.pool.get().execute("DELETE FROM llm_cache")
+
+
+# Singleton instance
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Get the shared LLM cache (None when LLM_CACHE_ENABLED is off)."""
+    global _cache_instance
+    if not Config.LLM_CACHE_ENABLED:
+        return None
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = LLMCache()
+    return _cache_instance
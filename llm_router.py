@@ -0,0 +1,259 @@
+"""Hedged, deadline-bound LLM calls with failover across providers and models."""
+
+import math
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import Config
+from rate_limiter import RateLimiter, get_rate_limiter
+
+
+class Route:
+    """
+    One provider and model to send LLM requests to, with its health.
+    
+    Health is the latency of recent successful calls (for the hedging
+    percentile) and a failure count: after FAILURES_TO_OPEN consecutive
+    failures the route is skipped for LLM_ROUTE_COOLDOWN_SECONDS.
+    """
+    
+    FAILURES_TO_OPEN = 3
+    LATENCY_SAMPLES = 100
+    
+    def __init__(self, provider: str, model: str):
+        """
+        Initialize the route and its API client.
+        
+        Args:
+            provider: openai or anthropic
+            model: Model name
+        """
+        self.provider = provider
+        self.model = model
+        self.name = f"{provider}:{model}"
+        self.client = self._create_client()
+        self.rate_limiter: RateLimiter = get_rate_limiter(provider)
+        
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=self.LATENCY_SAMPLES)
+        self.failures = 0
+        self.open_until = 0.0
+        self.stats = {'calls': 0, 'failures': 0, 'hedges': 0}
+    
+    def _create_client(self):
+        """
+        Provider SDK client.
+        
+        Its timeout is the call deadline, and the SDK's own retries are off:
+        retrying is left to the router, so one attempt is one request (and
+        one latency sample) and can't run past the deadline.
+        """
+        if self.provider == "openai":
+            from openai import OpenAI
+            return OpenAI(api_key=Config.OPENAI_API_KEY, base_url=Config.OPENAI_BASE_URL,
+                          timeout=Config.LLM_CALL_DEADLINE_SECONDS, max_retries=0)
+        elif self.provider == "anthropic":
+            from anthropic import Anthropic
+            return Anthropic(api_key=Config.ANTHROPIC_API_KEY, base_url=Config.ANTHROPIC_BASE_URL,
+                             timeout=Config.LLM_CALL_DEADLINE_SECONDS, max_retries=0)
+        else:
+            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+    
+    @property
+    def healthy(self) -> bool:
+        """False while the route is cooling down after repeated failures."""
+        return time.monotonic() >= self.open_until
+    
+    def latency_percentile(self, percentile: float, min_samples: int = 20) -> Optional[float]:
+        """Latency percentile of recent successful calls (None until there are enough)."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        
+        if len(samples) < min_samples:
+            return None
+        return samples[max(0, math.ceil(percentile / 100 * len(samples)) - 1)]
+    
+    def record_success(self, latency: float):
+        """Record a completed call."""
+        with self._lock:
+            self._latencies.append(latency)
+            self.failures = 0
+            self.open_until = 0.0
+            self.stats['calls'] += 1
+    
+    def record_failure(self):
+        """Record a failed call, opening the route after repeated failures."""
+        with self._lock:
+            self.failures += 1
+            self.stats['calls'] += 1
+            self.stats['failures'] += 1
+            
+            if self.failures >= self.FAILURES_TO_OPEN:
+                self.open_until = time.monotonic() + Config.LLM_ROUTE_COOLDOWN_SECONDS
+                print(f"⚠️  LLM route {self.name} failed {self.failures} times in a row; "
+                      f"skipping it for {Config.LLM_ROUTE_COOLDOWN_SECONDS}s")
+
+
+class LLMRouter:
+    """
+    Send each request to the healthiest route, hedging slow calls and failing over.
+    
+    A request starts on the first healthy route. If it hasn't answered after
+    that route's p95 latency (LLM_HEDGE_PERCENTILE), a duplicate goes to the
+    next route and the first valid response wins; hedges only ever go to a
+    different route. A failed or invalid response fails over to the next
+    route straight away (a lone route is retried once). Everything must
+    finish within LLM_CALL_DEADLINE_SECONDS; calls that lose the race run
+    to completion in the background and only update route health.
+    """
+    
+    def __init__(self, routes: List[Route], max_workers: int = 16):
+        """
+        Initialize the router.
+        
+        Args:
+            routes: Primary route first, then fallbacks in order of preference
+            max_workers: Threads running provider calls (including hedges)
+        """
+        self.routes = routes
+        self.primary = routes[0]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-route")
+    
+    def call(self, attempt: Callable[[Route], Any], validate: Callable[[Any], bool] = bool,
+             hedge: bool = True) -> Tuple[Any, Route]:
+        """
+        Run a request on the routes until one returns a valid response.
+        
+        Args:
+            attempt: Makes the request on a route and returns the response
+            validate: Whether a response is usable
+            hedge: Send duplicates after the p95 latency (off for streamed
+                responses, whose subscribers must see a single stream)
+        
+        Returns:
+            (response, route that produced it)
+        """
+        deadline = time.monotonic() + Config.LLM_CALL_DEADLINE_SECONDS
+        hedge = hedge and Config.LLM_HEDGE_PERCENTILE > 0
+        
+        # Cooling-down routes are kept as a last resort
+        ordered = [route for route in self.routes if route.healthy] + [route for route in self.routes if not route.healthy]
+        # A single route still gets one retry after a failure (but no hedge)
+        sequence = ordered if len(ordered) > 1 else ordered * 2
+        
+        pending: Dict = {}
+        errors = []
+        launched = []
+        
+        def launch():
+            route = sequence[len(launched)]
+            launched.append((route, time.monotonic()))
+            pending[self._executor.submit(self._run, route, attempt)] = route
+        
+        launch()
+        
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            
+            timeout = deadline - now
+            hedge_at = None
+            # Duplicating a call on a route that is already running it adds cost, not diversity
+            if hedge and len(launched) < len(sequence) and sequence[len(launched)] not in pending.values():
+                last_route, started = launched[-1]
+                delay = last_route.latency_percentile(Config.LLM_HEDGE_PERCENTILE)
+                # Before there are enough samples, hedge half way to the deadline
+                hedge_at = started + (delay if delay is not None else Config.LLM_CALL_DEADLINE_SECONDS / 2)
+                timeout = min(timeout, max(0.0, hedge_at - now))
+            
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            if not done:
+                if hedge_at is not None and time.monotonic() >= hedge_at:
+                    last_route, started = launched[-1]
+                    last_route.stats['hedges'] += 1
+                    print(f"⏱️  {last_route.name} slow ({time.monotonic() - started:.1f}s); "
+                          f"hedging with {sequence[len(launched)].name}")
+                    launch()
+                continue
+            
+            for future in done:
+                route = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    errors.append(f"{route.name}: {str(e)}")
+                    continue
+                
+                if validate(response):
+                    return response, route
+                errors.append(f"{route.name}: invalid response")
+            
+            # Fail over as soon as nothing is left in flight
+            if not pending and len(launched) < len(sequence):
+                print(f"↪ Failing over to {sequence[len(launched)].name} ({errors[-1]})")
+                launch()
+        
+        if pending:
+            raise TimeoutError(f"No LLM response within {Config.LLM_CALL_DEADLINE_SECONDS:.0f}s "
+                               f"({', '.join(route.name for route in pending.values())} still running)")
+        raise RuntimeError(f"All LLM routes failed: {'; '.join(errors)}")
+    
+    def _run(self, route: Route, attempt: Callable[[Route], Any]) -> Any:
+        """Run one attempt and record the route's health."""
+        started = time.monotonic()
+        try:
+            response = attempt(route)
+        except Exception:
+            route.record_failure()
+            raise
+        
+        route.record_success(time.monotonic() - started)
+        return response
+    
+    def status(self) -> List[Dict]:
+        """Health of every route."""
+        return [{
+            'route': route.name,
+            'healthy': route.healthy,
+            'p95_seconds': route.latency_percentile(95),
+            'consecutive_failures': route.failures,
+            **route.stats
+        } for route in self.routes]
+
+
+# One router per primary route, shared by every generator in the process
+_routers: Dict[str, LLMRouter] = {}
+_routers_lock = threading.Lock()
+
+def get_llm_router(provider: Optional[str] = None, model: Optional[str] = None) -> LLMRouter:
+    """
+    Get the shared router for a primary provider and model.
+    
+    Fallbacks come from LLM_FALLBACK_ROUTES (provider:model, comma-separated);
+    ones whose provider has no API key configured are left out.
+    """
+    provider = provider or Config.LLM_PROVIDER
+    model = model or Config.MODEL_NAME
+    
+    with _routers_lock:
+        key = f"{provider}:{model}"
+        if key not in _routers:
+            routes = [Route(provider, model)]
+            
+            for spec in Config.LLM_FALLBACK_ROUTES:
+                fallback_provider, _, fallback_model = spec.strip().partition(':')
+                api_key = {'openai': Config.OPENAI_API_KEY, 'anthropic': Config.ANTHROPIC_API_KEY}.get(fallback_provider)
+                
+                if not fallback_model or spec.strip() == key:
+                    continue
+                if not api_key:
+                    print(f"⚠️  Skipping LLM fallback route {spec}: no API key for {fallback_provider}")
+                    continue
+                routes.append(Route(fallback_provider, fallback_model))
+            
+            _routers[key] = LLMRouter(routes, max_workers=max(4, Config.LLM_MAX_CONCURRENCY * 3))
+        return _routers[key]
@@ -3,11 +3,15 @@
 import time
 import schedule
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from config import Config
 from news_collector import NewsCollector
 from script_generator import ScriptGenerator
 from youtube_uploader import YouTubeUploader, print_script_preview
 from video_generator_manager import VideoGeneratorManager
+from database import get_database
+from retention import RetentionManager
+from upload_queue import run_upload_workers
 
 
 class AutomatedYouTubeReporter:
@@ -19,6 +23,7 @@ class AutomatedYouTubeReporter:
         self.generator = ScriptGenerator()
         self.video_manager = VideoGeneratorManager()
         self.uploader = YouTubeUploader() if Config.AUTO_UPLOAD else None
+        self.db = get_database()
     
     def run_single_cycle(self, save_only: bool = True):
         """
@@ -48,30 +53,8 @@ class AutomatedYouTubeReporter:
         print("STEP 2: Generating video scripts...")
         print("-"*70 + "\n")
         
-        generated_scripts = []
-        scripts_to_generate = min(Config.MAX_ARTICLES_PER_RUN, len(Config.CATEGORIES))
-        
-        for category, news_items in all_news.items():
-            if len(generated_scripts) >= scripts_to_generate:
-                break
-            
-            if not news_items:
-                print(f"Skipping {category} - no news items")
-                continue
-            
-            print(f"\nGenerating script for: {category.upper()}")
-            print(f"Using {len(news_items)} news sources...")
-            
-            script = self.generator.generate_video_script(news_items, category)
-            
-            if script:
-                generated_scripts.append(script)
-                print_script_preview(script)
-            else:
-                print(f"✗ Failed to generate script for {category}")
-            
-            # Small delay between generations
-            time.sleep(2)
+        # Scripts of batch jobs submitted by earlier cycles come first
+        generated_scripts = self._collect_batch_scripts() + self._generate_scripts(all_news)
         
         print(f"\n✓ Generation complete: {len(generated_scripts)} scripts generated")
         
@@ -111,7 +94,12 @@ class AutomatedYouTubeReporter:
                 if video_path:
                     generated_videos.append({
                         'path': video_path,
-                        'script': script
+                        'script': script,
+                        'video_id': self.db.add_video({
+                            'script_id': script.get('script_id'),
+                            'file_path': video_path,
+                            'video_mode': Config.VIDEO_MODE
+                        })
                     })
                     print(f"✓ Video ready: {video_path}")
                 else:
@@ -126,29 +114,28 @@ class AutomatedYouTubeReporter:
             print("STEP 4: Uploading to YouTube...")
             print("-"*70 + "\n")
             
+            # Queue the uploads; workers claim them with a lease, so a crashed
+            # or slow upload doesn't hold up the rest and failures are retried
+            job_ids = []
             for video_data in generated_videos:
-                video_path = video_data['path']
                 script = video_data['script']
-                
-                print(f"\nUploading: {script['title']}...")
-                
-                # Get category ID
-                category_id = self.uploader.get_upload_category(script.get('category', 'news'))
-                
-                result = self.uploader.upload_video(
-                    video_file=video_path,
-                    title=script['title'],
-                    description=script['description'],
-                    tags=script.get('tags', []),
-                    category_id=category_id,
-                    privacy_status="private"  # Upload as private for review
-                )
-                
-                if result:
-                    uploaded_count += 1
-                    print(f"✓ Uploaded: {result['url']}")
-                
-                time.sleep(5)  # Delay between uploads
+                job_ids.append(self.db.enqueue_upload(video_data['video_id'], {
+                    'video_file': video_data['path'],
+                    'title': script['title'],
+                    'description': script['description'],
+                    'tags': script.get('tags', []),
+                    'category_id': self.uploader.get_upload_category(script.get('category', 'news')),
+                    'privacy_status': "private"  # Upload as private for review
+                }))
+            
+            print(f"Queued {len(job_ids)} uploads for {Config.UPLOAD_WORKERS} worker(s)")
+            run_upload_workers(Config.UPLOAD_WORKERS, drain=True, uploader=self.uploader)
+            
+            jobs = self.db.get_upload_jobs(job_ids=job_ids)
+            uploaded_count = sum(1 for job in jobs if job['status'] == 'uploaded')
+            retrying = sum(1 for job in jobs if job['status'] == 'pending')
+            if retrying:
+                print(f"⚠️  {retrying} uploads will be retried (python upload_queue.py --status)")
         
         # Summary
         print("\n" + "="*70)
@@ -158,6 +145,11 @@ class AutomatedYouTubeReporter:
         print(f"✓ Scripts generated: {len(generated_scripts)}")
         print(f"✓ Scripts saved: {saved_count}")
         
+        self.db.flush()
+        usage = self.db.get_llm_usage(hours=24)
+        if usage['calls']:
+            print(f"✓ Prompt cache (24h): {usage['cache_hit_rate']:.0%} of input tokens reused over {usage['calls']} LLM calls")
+        
         if Config.VIDEO_MODE != "script_only":
             print(f"✓ Videos generated: {len(generated_videos)}")
             print(f"📁 Videos saved in: generated_videos/")
@@ -176,6 +168,147 @@ class AutomatedYouTubeReporter:
         
         print("="*70 + "\n")
     
+    def _generate_scripts(self, all_news: dict) -> list:
+        """
+        Generate scripts for several categories concurrently.
+        
+        Categories are started in order, and a new one only when a running
+        one fails, so the result is the first MAX_ARTICLES_PER_RUN successful
+        categories, in category order. A running category claims its articles;
+        a failed one releases them for the categories started after it.
+        Categories in BATCH_CATEGORIES are submitted as one provider batch job
+        instead; their scripts arrive on a later cycle.
+        """
+        scripts_to_generate = min(Config.MAX_ARTICLES_PER_RUN, len(Config.CATEGORIES))
+        categories = iter(enumerate(all_news.items()))
+        claimed_urls = set()
+        batch_jobs = []
+        results = {}
+        running = {}
+        
+        def start_next() -> bool:
+            """Submit the next category that still has news (False when none are left)."""
+            for position, (category, news_items) in categories:
+                if Config.SKIP_COVERED_STORIES:
+                    # Coverage checks must see the scripts queued so far
+                    self.db.flush()
+                    news_items = self._drop_covered_stories(category, news_items)
+                
+                # Two categories running at once must not both cover the same article
+                news_items = [item for item in news_items if item.get('url') not in claimed_urls]
+                
+                if not news_items:
+                    print(f"Skipping {category} - no news items")
+                    continue
+                
+                urls = {item.get('url') for item in news_items[:5]}
+                claimed_urls.update(urls)
+                
+                if category in Config.BATCH_CATEGORIES:
+                    batch_jobs.append((category, news_items))
+                    continue
+                
+                print(f"\nGenerating script for: {category.upper()}")
+                print(f"Using {len(news_items)} news sources...")
+                
+                future = executor.submit(self.generator.generate_video_script, news_items, category)
+                running[future] = (position, category, urls)
+                return True
+            return False
+        
+        with ThreadPoolExecutor(max_workers=max(1, Config.LLM_MAX_CONCURRENCY)) as executor:
+            while True:
+                # Never run more categories than could still be needed
+                slots = min(Config.LLM_MAX_CONCURRENCY, scripts_to_generate - len(results)) - len(running)
+                while slots > 0 and start_next():
+                    slots -= 1
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position, category, urls = running.pop(future)
+                    script = future.result()
+                    
+                    if script:
+                        # Records the script, links its sources and marks them used in one transaction
+                        results[position] = (script, self.db.write_behind(self.db.add_script, dict(script)))
+                    else:
+                        print(f"✗ Failed to generate script for {category}")
+                        # Let the replacement category use these stories
+                        claimed_urls.difference_update(urls)
+        
+        if batch_jobs:
+            print(f"\nSubmitting batch for: {', '.join(category.upper() for category, _ in batch_jobs)}")
+            if self.generator.submit_batch(batch_jobs):
+                # Later cycles must not batch the same stories again while this one runs
+                self.db.write_behind(self.db.mark_articles_used, [
+                    item.get('url') for _, news_items in batch_jobs for item in news_items[:5]
+                ])
+        
+        generated_scripts = []
+        for position in sorted(results):
+            script, write = results[position]
+            try:
+                script['script_id'] = write.result()
+            except Exception as e:
+                print(f"⚠️  Could not record script '{script['title']}': {e}")
+            
+            generated_scripts.append(script)
+            print_script_preview(script)
+        
+        return generated_scripts
+    
+    def _collect_batch_scripts(self) -> list:
+        """Record the scripts of finished batch jobs from earlier cycles."""
+        collected = []
+        
+        for batch, scripts in self.generator.poll_batches():
+            # Scripts and the batch's 'collected' mark commit together, so a crash can't record them twice
+            with self.db.transaction():
+                for script in scripts:
+                    script['script_id'] = self.db.add_script(dict(script))
+                self.db.finish_llm_batch(batch['batch_id'], 'collected')
+            
+            for script in scripts:
+                print_script_preview(script)
+            collected.extend(scripts)
+        
+        return collected
+    
+    def _drop_covered_stories(self, category: str, news_items: list) -> list:
+        """Remove articles we already covered recently (checked before paying for generation)."""
+        fresh = []
+        
+        for item in news_items:
+            matches = self.db.find_recent_coverage(
+                item.get('title', ''),
+                days=Config.COVERAGE_LOOKBACK_DAYS,
+                limit=1,
+                category=category
+            )
+            
+            if matches and matches[0]['score'] >= Config.COVERAGE_MIN_SCORE:
+                print(f"  ↷ Already covered: {item.get('title', '')[:60]} (~ '{matches[0]['title'][:40]}')")
+                continue
+            
+            if Config.SEMANTIC_COVERAGE_CHECK:
+                # Catches rephrased coverage the keyword match misses
+                similar = self.db.find_similar_coverage(
+                    f"{item.get('title', '')}\n{(item.get('content') or '')[:1000]}",
+                    days=Config.COVERAGE_LOOKBACK_DAYS,
+                    limit=1
+                )
+                
+                if similar and similar[0]['score'] >= Config.SEMANTIC_COVERAGE_MIN_SCORE:
+                    print(f"  ↷ Similar to recent coverage: {item.get('title', '')[:60]} (~ '{similar[0]['title'][:40]}')")
+                    continue
+            
+            fresh.append(item)
+        
+        return fresh
+    
     def run_scheduled(self):
         """Run the reporter on a schedule."""
         print("\n" + "="*70)
@@ -185,12 +318,22 @@ class AutomatedYouTubeReporter:
         print(f"Interval: Every {Config.PUBLISH_INTERVAL_HOURS} hours")
         print(f"Max scripts per run: {Config.MAX_ARTICLES_PER_RUN}")
         print(f"LLM Provider: {Config.LLM_PROVIDER} ({Config.MODEL_NAME})")
+        if Config.LLM_FALLBACK_ROUTES:
+            print(f"LLM Fallbacks: {', '.join(Config.LLM_FALLBACK_ROUTES)}")
+        if Config.LLM_SPLIT_MODE:
+            print(f"Split scripts: metadata on {Config.LLM_METADATA_MODEL or Config.MODEL_NAME}")
         print(f"Video Style: {Config.VIDEO_STYLE}")
+        if Config.RETENTION_DAYS > 0:
+            print(f"Retention: archive after {Config.RETENTION_DAYS} days ({Config.ARCHIVE_DIR}/)")
         print("="*70 + "\n")
         
         # Schedule the job
         schedule.every(Config.PUBLISH_INTERVAL_HOURS).hours.do(self.run_single_cycle)
         
+        # Keep the hot database small: archive old rows once a day
+        if Config.RETENTION_DAYS > 0:
+            schedule.every().day.at("03:30").do(RetentionManager(self.db).run)
+        
         # Run immediately on start
         print("Running initial cycle...")
         self.run_single_cycle()
@@ -230,7 +373,11 @@ def main():
     
     # Check if running in scheduled mode or single run
     import sys
-    if len(sys.argv) > 1 and sys.argv[1] == "--once":
+    if "--fresh" in sys.argv:
+        # Skip cached LLM completions (fresh ones are still cached)
+        Config.LLM_CACHE_BYPASS = True
+    
+    if "--once" in sys.argv[1:]:
         print("\nRunning in SINGLE-RUN mode...")
         reporter.run_single_cycle()
     else:
@@ -1,13 +1,169 @@
 """News collection module using Google Search and content extraction."""
 
+import os
 import re
+import atexit
+import json
 import time
-from typing import List, Dict
+import queue
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
-from urllib.parse import urlparse, unquote
+from urllib.parse import urlparse, unquote, urljoin, parse_qsl, urlencode
 import requests
 from googlesearch import search
 from config import Config
+from singleflight import get_fetch_group
+from database import get_database
+
+
+# Query parameters that never change which article a URL points to
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ocid', 'cmpid', 'ref', 'smid', 'mc_cid', 'mc_eid'}
+
+
+def clean_html_text(fragment: str) -> str:
+    """Strip tags, collapse whitespace and decode common entities in an HTML fragment."""
+    content_clean = re.sub(r'<[^>]+>', ' ', fragment)
+    content_clean = re.sub(r'\s+', ' ', content_clean).strip()
+    
+    # Convert HTML entities to characters
+    content_clean = content_clean.replace('&nbsp;', ' ')
+    content_clean = content_clean.replace('&amp;', '&')
+    content_clean = content_clean.replace('&lt;', '<')
+    content_clean = content_clean.replace('&gt;', '>')
+    content_clean = content_clean.replace('&quot;', '"')
+    content_clean = content_clean.replace('&#39;', "'")
+    content_clean = content_clean.replace('&rsquo;', "'")
+    content_clean = content_clean.replace('&lsquo;', "'")
+    content_clean = content_clean.replace('&rdquo;', '"')
+    content_clean = content_clean.replace('&ldquo;', '"')
+    content_clean = content_clean.replace('&mdash;', '—')
+    content_clean = content_clean.replace('&ndash;', '–')
+    
+    return content_clean
+
+
+def canonical_url(url: str) -> str:
+    """Normalize an article URL (scheme/host case, tracking params, fragment, trailing slash)."""
+    parsed = urlparse(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+             if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS]
+    
+    return parsed._replace(
+        scheme=parsed.scheme.lower(),
+        netloc=parsed.netloc.lower(),
+        path=parsed.path.rstrip('/') or '/',
+        query=urlencode(query),
+        fragment=''
+    ).geturl()
+
+
+def title_from_url(url: str) -> str:
+    """Extract title from URL as fallback."""
+    parse_result = urlparse(url)
+    path = parse_result.path
+    
+    # Get last segment of URL and replace hyphens with spaces
+    title = unquote(path.split('/')[-1].replace('-', ' ').replace('_', ' '))
+    
+    # Capitalize words
+    title = ' '.join(word.capitalize() for word in title.split())
+    
+    return title if title else "Untitled Article"
+
+
+def find_variant_href(html: str) -> Optional[str]:
+    """Find an amphtml or print-alternate <link> href in a page's HTML."""
+    for tag in re.findall(r'<link\b[^>]*>', html[:200000], re.IGNORECASE):
+        attrs = {k.lower(): v for k, v in re.findall(r'([\w-]+)\s*=\s*["\']([^"\']*)["\']', tag)}
+        rel = attrs.get('rel', '').lower()
+        
+        if rel == 'amphtml' or (rel == 'alternate' and attrs.get('media', '').lower() == 'print'):
+            if attrs.get('href'):
+                return attrs['href']
+    
+    return None
+
+
+def parse_article_html(html: str, url: str) -> Dict[str, str]:
+    """
+    Extract title and main article text from raw HTML.
+    
+    Module-level (and free of collector state) so it can run in a process pool.
+    """
+    # Extract title
+    title_match = re.search(r'<title>(.*?)</title>', html, re.IGNORECASE)
+    title = title_match.group(1).strip() if title_match else title_from_url(url)
+    
+    # Clean title (remove site name suffixes)
+    title = re.sub(r'\s*[-|]\s*[^-|]+$', '', title).strip()
+    
+    # Step 1: Clean HTML of non-relevant elements
+    html_clean = re.sub(r'<script[^>]*>.*?</script>', ' ', html, flags=re.DOTALL | re.IGNORECASE)
+    html_clean = re.sub(r'<style[^>]*>.*?</style>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
+    html_clean = re.sub(r'<!--.*?-->', ' ', html_clean, flags=re.DOTALL)
+    html_clean = re.sub(r'<nav[^>]*>.*?</nav>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
+    html_clean = re.sub(r'<header[^>]*>.*?</header>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
+    html_clean = re.sub(r'<footer[^>]*>.*?</footer>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
+    html_clean = re.sub(r'<aside[^>]*>.*?</aside>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
+    html_clean = re.sub(r'<iframe[^>]*>.*?</iframe>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
+    
+    # Step 2: Try to identify main content
+    content = ""
+    
+    # Patterns to find main content in news sites
+    content_patterns = [
+        r'<article[^>]*>(.*?)</article>',
+        r'<div[^>]*class="[^"]*(?:content|article|post|news|story|text|entry|body|main)[^"]*"[^>]*>(.*?)</div>',
+        r'<div[^>]*id="[^"]*(?:content|article|post|news|story|text|entry|body|main)[^"]*"[^>]*>(.*?)</div>',
+        r'<main[^>]*>(.*?)</main>',
+        r'<section[^>]*class="[^"]*(?:content|article|post|news|story)[^"]*"[^>]*>(.*?)</section>'
+    ]
+    
+    # Try each pattern until finding significant content
+    for pattern in content_patterns:
+        matches = re.findall(pattern, html_clean, re.DOTALL | re.IGNORECASE)
+        
+        if matches:
+            for match in matches:
+                if len(match) > 500:  # At least 500 characters
+                    content = match
+                    break
+            
+            if content:
+                break
+    
+    # Strategy 2: If no content found by pattern, extract all <p> tags
+    if not content or len(content) < 500:
+        paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', html_clean, re.DOTALL | re.IGNORECASE)
+        content = ' '.join([p for p in paragraphs if len(p) > 30])
+    
+    # Step 3: Clean extracted content
+    content_clean = clean_html_text(content)
+    
+    # If content is too large, limit size
+    if len(content_clean) > 15000:
+        content_clean = content_clean[:15000] + "..."
+    
+    print(f"  Extracted content size: {len(content_clean)} characters")
+    
+    return {
+        "title": title,
+        "content": content_clean,
+        "url": url
+    }
+
+
+def _parse_job(html: str, url: str) -> Tuple[Dict[str, str], Optional[str], float]:
+    """Process-pool entry point: parse a page and report the CPU time spent."""
+    started = time.perf_counter()
+    article = parse_article_html(html, url)
+    variant_href = find_variant_href(html)
+    return article, variant_href, time.perf_counter() - started
 
 
 class NewsCollector:
@@ -43,6 +199,26 @@ class NewsCollector:
             'youtube.com', 'linkedin.com', 'tiktok.com',
             'reddit.com', 'pinterest.com'
         ]
+        
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Cache-Control': 'max-age=0'
+        }
+        
+        # Database-backed filter of already collected/used article URLs
+        self.db = get_database() if Config.SKIP_SEEN_URLS else None
+        
+        # Per-domain rules for lightweight (AMP / print) page variants
+        self.variants_file = Path(Config.LIGHTWEIGHT_VARIANTS_FILE)
+        self.variant_rules = self._load_variant_rules() if Config.USE_LIGHTWEIGHT_VARIANTS else {}
+        self._variant_lock = threading.Lock()
+        
+        # Two-stage fetch/parse pipeline (created on first parallel collection)
+        self.pipeline = None
     
     def search_news(self, query: str, num_results: int = 10, days_back: int = 1) -> List[str]:
         """
@@ -52,7 +228,7 @@ class NewsCollector:
             query: Search query
             num_results: Number of results to retrieve
             days_back: How many days back to search
-            
+        
         Returns:
             List of URLs
         """
@@ -66,124 +242,88 @@ class NewsCollector:
             # Add "after:" to limit by date
             query_with_date = f"{query} after:{date_from.strftime('%Y-%m-%d')}"
             
-            # Use googlesearch-python library
-            for url in search(query_with_date, num_results=num_results, lang="en"):
+            # Identical concurrent searches share one request
+            urls = get_fetch_group().do(
+                ('search', query_with_date, num_results),
+                self._run_search, query_with_date, num_results
+            )
+            
+            for url in urls:
                 # Filter out social media and non-news sites
                 if not any(domain in url for domain in self.ignored_domains):
                     results.append(url)
                     print(f"  Found: {url}")
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
             
             return results
         except Exception as e:
             print(f"Error searching '{query}': {e}")
             return []
     
+    def _run_search(self, query: str, num_results: int) -> List[str]:
+        """Run one Google search and return all result URLs."""
+        urls = []
+        
+        # Use googlesearch-python library
+        for url in search(query, num_results=num_results, lang="en"):
+            urls.append(url)
+            
+            # Small delay to avoid rate limiting
+            time.sleep(0.5)
+        
+        return urls
+    
     def extract_page_content(self, url: str) -> Dict[str, str]:
         """
         Extract full content from a news page.
         
+        Concurrent requests for the same article share one fetch and parse.
+        
         Args:
             url: URL of the news article
-            
+        
         Returns:
             Dictionary with 'title', 'content', 'url'
         """
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'max-age=0'
-            }
-            
-            # Increase timeout for slower sites
-            response = requests.get(url, headers=headers, timeout=20)
-            response.raise_for_status()
-            
-            html = response.text
-            
-            # Extract title
-            title_match = re.search(r'<title>(.*?)</title>', html, re.IGNORECASE)
-            title = title_match.group(1).strip() if title_match else self._extract_title_from_url(url)
-            
-            # Clean title (remove site name suffixes)
-            title = re.sub(r'\s*[-|]\s*[^-|]+$', '', title).strip()
-            
-            # Step 1: Clean HTML of non-relevant elements
-            html_clean = re.sub(r'<script[^>]*>.*?</script>', ' ', html, flags=re.DOTALL | re.IGNORECASE)
-            html_clean = re.sub(r'<style[^>]*>.*?</style>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
-            html_clean = re.sub(r'<!--.*?-->', ' ', html_clean, flags=re.DOTALL)
-            html_clean = re.sub(r'<nav[^>]*>.*?</nav>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
-            html_clean = re.sub(r'<header[^>]*>.*?</header>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
-            html_clean = re.sub(r'<footer[^>]*>.*?</footer>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
-            html_clean = re.sub(r'<aside[^>]*>.*?</aside>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
-            html_clean = re.sub(r'<iframe[^>]*>.*?</iframe>', ' ', html_clean, flags=re.DOTALL | re.IGNORECASE)
-            
-            # Step 2: Try to identify main content
-            content = ""
-            
-            # Patterns to find main content in news sites
-            content_patterns = [
-                r'<article[^>]*>(.*?)</article>',
-                r'<div[^>]*class="[^"]*(?:content|article|post|news|story|text|entry|body|main)[^"]*"[^>]*>(.*?)</div>',
-                r'<div[^>]*id="[^"]*(?:content|article|post|news|story|text|entry|body|main)[^"]*"[^>]*>(.*?)</div>',
-                r'<main[^>]*>(.*?)</main>',
-                r'<section[^>]*class="[^"]*(?:content|article|post|news|story)[^"]*"[^>]*>(.*?)</section>'
-            ]
-            
-            # Try each pattern until finding significant content
-            for pattern in content_patterns:
-                matches = re.findall(pattern, html_clean, re.DOTALL | re.IGNORECASE)
+        article = get_fetch_group().do(('page', canonical_url(url)), self._extract_page_content, url)
+        return dict(article, url=url)
+    
+    def _extract_page_content(self, url: str) -> Dict[str, str]:
+        """
+        Fetch and parse one news page.
+        
+        Prefers a previously discovered lightweight variant (AMP or print
+        page) for the article's domain and falls back to the full page when
+        the variant yields less than LIGHTWEIGHT_MIN_CONTENT_CHARS.
+        
+        Args:
+            url: URL of the news article
+        
+        Returns:
+            Dictionary with 'title', 'content', 'url'
+        """
+        variant_url = self._lightweight_url(url)
+        
+        if variant_url:
+            try:
+                html = self._fetch_html(variant_url)
+                article = self._parse_html(html, url)
                 
-                if matches:
-                    for match in matches:
-                        if len(match) > 500:  # At least 500 characters
-                            content = match
-                            break
-                    
-                    if content:
-                        break
-            
-            # Strategy 2: If no content found by pattern, extract all <p> tags
-            if not content or len(content) < 500:
-                paragraphs = re.findall(r'<p[^>]*>(.*?)</p>', html_clean, re.DOTALL | re.IGNORECASE)
-                content = ' '.join([p for p in paragraphs if len(p) > 30])
-            
-            # Step 3: Clean extracted content
-            content_clean = re.sub(r'<[^>]+>', ' ', content)
-            content_clean = re.sub(r'\s+', ' ', content_clean).strip()
-            
-            # Convert HTML entities to characters
-            content_clean = content_clean.replace('&nbsp;', ' ')
-            content_clean = content_clean.replace('&amp;', '&')
-            content_clean = content_clean.replace('&lt;', '<')
-            content_clean = content_clean.replace('&gt;', '>')
-            content_clean = content_clean.replace('&quot;', '"')
-            content_clean = content_clean.replace('&#39;', "'")
-            content_clean = content_clean.replace('&rsquo;', "'")
-            content_clean = content_clean.replace('&lsquo;', "'")
-            content_clean = content_clean.replace('&rdquo;', '"')
-            content_clean = content_clean.replace('&ldquo;', '"')
-            content_clean = content_clean.replace('&mdash;', '—')
-            content_clean = content_clean.replace('&ndash;', '–')
-            
-            # If content is too large, limit size
-            if len(content_clean) > 15000:
-                content_clean = content_clean[:15000] + "..."
-            
-            print(f"  Extracted content size: {len(content_clean)} characters")
-            
-            return {
-                "title": title,
-                "content": content_clean,
-                "url": url
-            }
+                if len(article['content']) >= Config.LIGHTWEIGHT_MIN_CONTENT_CHARS:
+                    print(f"  Used lightweight variant: {variant_url}")
+                    self._record_variant_result(url, success=True)
+                    return article
+                
+                print(f"  Lightweight variant too thin, fetching full page")
+            except Exception as e:
+                print(f"  Lightweight variant failed ({e}), fetching full page")
             
+            self._record_variant_result(url, success=False)
+        
+        try:
+            html = self._fetch_html(url)
+            self._discover_variant(url, html)
+            return self._parse_html(html, url)
+        
         except Exception as e:
             print(f"  Error extracting content from {url}: {e}")
             return {
@@ -192,18 +332,159 @@ class NewsCollector:
                 "url": url
             }
     
-    def _extract_title_from_url(self, url: str) -> str:
-        """Extract title from URL as fallback."""
-        parse_result = urlparse(url)
-        path = parse_result.path
+    def _fetch_html(self, url: str) -> str:
+        """Download a page and return its HTML."""
+        # Increase timeout for slower sites
+        response = requests.get(url, headers=self.headers, timeout=20)
+        response.raise_for_status()
+        return response.text
+    
+    def _parse_html(self, html: str, url: str) -> Dict[str, str]:
+        """Extract title and main article text from raw HTML."""
+        return parse_article_html(html, url)
+    
+    def _load_variant_rules(self) -> Dict[str, Dict]:
+        """Load remembered per-domain lightweight variant rules."""
+        if self.variants_file.exists():
+            try:
+                with open(self.variants_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️  Error loading variant rules: {e}")
+        return {}
+    
+    def _save_variant_rules(self):
+        """Persist per-domain lightweight variant rules."""
+        try:
+            with open(self.variants_file, 'w') as f:
+                json.dump(self.variant_rules, f, indent=2)
+        except Exception as e:
+            print(f"⚠️  Error saving variant rules: {e}")
+    
+    def _lightweight_url(self, url: str) -> Optional[str]:
+        """Build the lightweight variant URL for an article, if its domain has one."""
+        if not Config.USE_LIGHTWEIGHT_VARIANTS:
+            return None
+        
+        rule = self.variant_rules.get(urlparse(url).netloc.lower())
+        if not rule or rule.get('disabled'):
+            return None
         
-        # Get last segment of URL and replace hyphens with spaces
-        title = unquote(path.split('/')[-1].replace('-', ' ').replace('_', ' '))
+        return self._apply_variant_rule(url, rule)
+    
+    def _apply_variant_rule(self, url: str, rule: Dict) -> str:
+        """Rewrite a canonical URL into its lightweight variant."""
+        parsed = urlparse(url)
+        path = rule['prefix'] + parsed.path.rstrip('/') + rule['suffix']
         
-        # Capitalize words
-        title = ' '.join(word.capitalize() for word in title.split())
+        query = parse_qsl(parsed.query, keep_blank_values=True) if rule['keep_query'] else []
+        query.extend(tuple(pair) for pair in rule['query'])
         
-        return title if title else "Untitled Article"
+        return parsed._replace(
+            netloc=rule['host'] or parsed.netloc,
+            path=path or '/',
+            query=urlencode(query),
+            fragment=''
+        ).geturl()
+    
+    def _discover_variant(self, url: str, html: str):
+        """Learn a domain's lightweight variant from a canonical page's <link> tags."""
+        self._remember_variant(url, find_variant_href(html))
+    
+    def _remember_variant(self, url: str, variant_href: Optional[str]):
+        """Store a rewrite rule for the variant advertised by a canonical page."""
+        if not Config.USE_LIGHTWEIGHT_VARIANTS or not variant_href:
+            return
+        
+        domain = urlparse(url).netloc.lower()
+        
+        with self._variant_lock:
+            if domain in self.variant_rules:
+                return
+            
+            rule = self._learn_variant_rule(url, urljoin(url, variant_href))
+            if not rule:
+                return
+            
+            self.variant_rules[domain] = rule
+            self._save_variant_rules()
+        
+        print(f"  Discovered lightweight variant for {domain}")
+    
+    def _learn_variant_rule(self, url: str, variant_url: str) -> Optional[Dict]:
+        """
+        Generalize one canonical/variant URL pair into a reusable rewrite rule.
+        
+        Returns:
+            Rule dictionary, or None if the variant URL cannot be derived
+            from the canonical URL (e.g. an opaque AMP cache id)
+        """
+        canonical = urlparse(url)
+        variant = urlparse(variant_url)
+        
+        canonical_path = canonical.path.rstrip('/')
+        variant_path = variant.path.rstrip('/')
+        
+        if canonical_path and variant_path.endswith(canonical_path):
+            prefix = variant_path[:-len(canonical_path)]
+            suffix = ''
+        elif variant.path.startswith(canonical_path):
+            prefix = ''
+            suffix = variant.path[len(canonical_path):]
+        else:
+            return None
+        
+        canonical_query = parse_qsl(canonical.query, keep_blank_values=True)
+        variant_query = parse_qsl(variant.query, keep_blank_values=True)
+        keep_query = all(pair in variant_query for pair in canonical_query)
+        extra_query = [pair for pair in variant_query
+                       if not keep_query or pair not in canonical_query]
+        
+        rule = {
+            'host': variant.netloc if variant.netloc != canonical.netloc else '',
+            'prefix': prefix,
+            'suffix': suffix,
+            'query': extra_query,
+            'keep_query': keep_query,
+            'thin_count': 0,
+            'disabled': False
+        }
+        
+        # Only keep rules that reproduce the advertised variant
+        rebuilt = urlparse(self._apply_variant_rule(url, rule))
+        if (rebuilt.netloc != variant.netloc
+                or rebuilt.path.rstrip('/') != variant_path
+                or sorted(parse_qsl(rebuilt.query, keep_blank_values=True))
+                != sorted(parse_qsl(variant.query, keep_blank_values=True))):
+            return None
+        
+        return rule
+    
+    def _record_variant_result(self, url: str, success: bool):
+        """Track variant quality; stop using a domain's variant after repeated thin results."""
+        domain = urlparse(url).netloc.lower()
+        
+        with self._variant_lock:
+            rule = self.variant_rules.get(domain)
+            if not rule:
+                return
+            
+            if success:
+                # Persist the reset too, or a recovered domain stays demoted after a restart
+                if rule.get('thin_count'):
+                    rule['thin_count'] = 0
+                    self._save_variant_rules()
+                return
+            
+            rule['thin_count'] = rule.get('thin_count', 0) + 1
+            if rule['thin_count'] >= 3:
+                rule['disabled'] = True
+                print(f"  Disabled lightweight variant for {domain} (repeatedly too thin)")
+            self._save_variant_rules()
+    
+    def _extract_title_from_url(self, url: str) -> str:
+        """Extract title from URL as fallback."""
+        return title_from_url(url)
     
     def collect_category_news(self, category: str, articles_per_query: int = 3) -> List[Dict]:
         """
@@ -212,7 +493,7 @@ class NewsCollector:
         Args:
             category: Category to collect (sports, politics, finance)
             articles_per_query: Number of articles per search query
-            
+        
         Returns:
             List of article dictionaries with title, content, url
         """
@@ -224,6 +505,7 @@ class NewsCollector:
         
         all_articles = []
         seen_urls = set()
+        pending = []
         
         queries = self.search_queries[category]
         
@@ -240,27 +522,63 @@ class NewsCollector:
                 
                 seen_urls.add(url)
                 
-                article = self.extract_page_content(url)
+                if self.db and not self.db.should_fetch_url(url):
+                    print(f"  ↷ Skipped (already collected): {url}")
+                    continue
                 
-                # Only add if we got meaningful content
-                if article['content'] and len(article['content']) > 200:
-                    article['category'] = category
-                    article['collected_at'] = datetime.now().isoformat()
-                    all_articles.append(article)
-                    print(f"  ✓ Added: {article['title'][:60]}...")
+                if Config.PARALLEL_EXTRACTION:
+                    # Fetch/parse in the background while we keep searching
+                    pending.append((url, self._get_pipeline().submit(url)))
                 else:
-                    print(f"  ✗ Skipped (insufficient content): {url}")
+                    self._accept_article(self.extract_page_content(url), category, all_articles)
             
             # Small delay between queries
             time.sleep(2)
             
-            # Stop if we have enough articles
-            if len(all_articles) >= 5:
+            # Stop if we have enough articles (counting background extractions already done)
+            finished = sum(1 for _, future in pending
+                           if future.done() and len(future.result()['content']) > 200)
+            if len(all_articles) + finished >= 5:
                 break
         
+        for url, future in pending:
+            self._accept_article(dict(future.result(), url=url), category, all_articles)
+        
+        # Store the whole batch in one transaction (off this thread with write-behind)
+        if self.db and all_articles:
+            write = self.db.write_behind(self.db.add_articles, [dict(article) for article in all_articles])
+            write.add_done_callback(lambda write: self._report_write(write, category))
+        
         print(f"\nCollected {len(all_articles)} articles for {category}")
         return all_articles
     
+    @staticmethod
+    def _report_write(write: Future, category: str):
+        """Log a failed write-behind store of a category's articles (nothing waits on it)."""
+        if write.exception():
+            print(f"⚠️  Could not store {category} articles: {write.exception()}")
+    
+    def _accept_article(self, article: Dict, category: str, all_articles: List[Dict]):
+        """Keep an extracted article if it has meaningful content."""
+        if article['content'] and len(article['content']) > 200:
+            article['category'] = category
+            article['collected_at'] = datetime.now().isoformat()
+            all_articles.append(article)
+            print(f"  ✓ Added: {article['title'][:60]}...")
+        else:
+            print(f"  ✗ Skipped (insufficient content): {article['url']}")
+    
+    def _get_pipeline(self) -> 'ExtractionPipeline':
+        """Get (creating on first use) the two-stage extraction pipeline."""
+        if self.pipeline is None:
+            self.pipeline = ExtractionPipeline(
+                self,
+                io_workers=Config.COLLECTOR_IO_WORKERS,
+                parse_workers=Config.COLLECTOR_PARSE_WORKERS,
+                queue_size=Config.COLLECTOR_QUEUE_SIZE
+            )
+        return self.pipeline
+    
     def collect_all_categories(self) -> Dict[str, List[Dict]]:
         """
         Collect news from all configured categories.
@@ -279,4 +597,250 @@ class NewsCollector:
             articles = self.collect_category_news(category)
             all_news[category] = articles
         
+        if self.pipeline:
+            self.pipeline.print_stats()
+            self.pipeline.reset_stats()
+        
         return all_news
+
+
+class ExtractionPipeline:
+    """
+    Two-stage article extraction: I/O threads fetch, a process pool parses.
+    
+    Fetchers hand raw HTML to the parse stage through a bounded queue, and
+    the number of pages being parsed is capped, so slow parsing pushes back
+    on fetching instead of buffering pages in memory.
+    """
+    
+    def __init__(self, collector: NewsCollector, io_workers: int = 8,
+                 parse_workers: int = 0, queue_size: int = 16):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            collector: Collector providing fetching and variant rules
+            io_workers: Number of fetch threads
+            parse_workers: Number of parser processes (0 = one per core)
+            queue_size: Capacity of the fetch -> parse queue
+        """
+        self.collector = collector
+        self.io_workers = io_workers
+        self.parse_workers = parse_workers or os.cpu_count() or 1
+        
+        self.fetch_queue = queue.Queue()
+        self.parse_queue = queue.Queue(maxsize=queue_size)
+        self.parse_slots = threading.BoundedSemaphore(self.parse_workers * 2)
+        self.pool = None
+        self.threads = []
+        
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.reset_stats()
+        
+        # The parser processes live as long as the process (spawning them costs an
+        # interpreter start and imports each); they are only replaced if the pool breaks
+        atexit.register(self.close)
+    
+    def start(self):
+        """Start the process pool, fetch threads and dispatcher."""
+        if self.pool is not None:
+            return
+        
+        self.pool = self._create_pool()
+        
+        for i in range(self.io_workers):
+            thread = threading.Thread(target=self._fetch_worker, name=f"fetch-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        
+        dispatcher = threading.Thread(target=self._dispatch_worker, name="parse-dispatch", daemon=True)
+        dispatcher.start()
+        self.threads.append(dispatcher)
+    
+    def _create_pool(self) -> ProcessPoolExecutor:
+        """Process pool of HTML parsers."""
+        # Spawned (not forked) workers: the fetch threads may already be running
+        return ProcessPoolExecutor(
+            max_workers=self.parse_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    
+    def close(self):
+        """Stop all workers and shut down the process pool."""
+        if self.pool is None:
+            return
+        
+        for _ in range(self.io_workers):
+            self.fetch_queue.put(None)
+        self.parse_queue.put(None)
+        
+        for thread in self.threads:
+            thread.join()
+        
+        self.pool.shutdown()
+        self.pool = None
+        self.threads = []
+    
+    def submit(self, url: str) -> Future:
+        """
+        Queue a URL for extraction.
+        
+        Returns:
+            Future resolving to the article dictionary ('title', 'content', 'url')
+        """
+        self.start()
+        key = canonical_url(url)
+        
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            
+            future = Future()
+            self._inflight[key] = future
+            self.stats['submitted'] += 1
+        
+        self.fetch_queue.put((future, key, url, True))
+        return future
+    
+    def _fetch_worker(self):
+        """Stage 1: download pages (preferring lightweight variants)."""
+        while True:
+            item = self.fetch_queue.get()
+            if item is None:
+                return
+            
+            future, key, url, allow_variant = item
+            variant_url = self.collector._lightweight_url(url) if allow_variant else None
+            
+            started = time.perf_counter()
+            try:
+                html = self.collector._fetch_html(variant_url or url)
+            except Exception as e:
+                self._add_busy('fetch_busy', started)
+                
+                if variant_url:
+                    print(f"  Lightweight variant failed ({e}), fetching full page")
+                    self.collector._record_variant_result(url, success=False)
+                    self.fetch_queue.put((future, key, url, False))
+                else:
+                    print(f"  Error extracting content from {url}: {e}")
+                    self._finish(key, future, {"title": title_from_url(url), "content": "", "url": url})
+                continue
+            
+            self._add_busy('fetch_busy', started)
+            
+            # Blocks when the parse stage is behind (backpressure)
+            waited = time.perf_counter()
+            self.parse_queue.put((future, key, url, variant_url, html))
+            self._add_busy('fetch_blocked', waited)
+    
+    def _dispatch_worker(self):
+        """Stage 2: hand fetched pages to the process pool."""
+        while True:
+            item = self.parse_queue.get()
+            if item is None:
+                return
+            
+            self.parse_slots.acquire()
+            
+            future, key, url, variant_url, html = item
+            try:
+                job = self.pool.submit(_parse_job, html, url)
+            except Exception as e:
+                # Keep dispatching: a dead worker or unpicklable job must not strand the caller
+                self.parse_slots.release()
+                print(f"  Error extracting content from {url}: {e}")
+                self._finish(key, future, {"title": title_from_url(url), "content": "", "url": url})
+                
+                if isinstance(e, BrokenProcessPool):
+                    print("⚠️  Parser process pool broke; starting a new one")
+                    self.pool.shutdown(wait=False)
+                    self.pool = self._create_pool()
+                continue
+            
+            job.add_done_callback(
+                lambda job, item=(future, key, url, variant_url): self._on_parsed(job, *item)
+            )
+    
+    def _on_parsed(self, job: Future, future: Future, key: str, url: str, variant_url: Optional[str]):
+        """Handle a parse result: accept it, or retry the full page if a variant was too thin."""
+        self.parse_slots.release()
+        
+        try:
+            article, variant_href, busy = job.result()
+        except Exception as e:
+            print(f"  Error extracting content from {url}: {e}")
+            self._finish(key, future, {"title": title_from_url(url), "content": "", "url": url})
+            return
+        
+        with self._lock:
+            self.stats['parse_busy'] += busy
+            self.stats['parsed'] += 1
+        
+        if variant_url:
+            if len(article['content']) < Config.LIGHTWEIGHT_MIN_CONTENT_CHARS:
+                print(f"  Lightweight variant too thin, fetching full page")
+                self.collector._record_variant_result(url, success=False)
+                self.fetch_queue.put((future, key, url, False))
+                return
+            
+            print(f"  Used lightweight variant: {variant_url}")
+            self.collector._record_variant_result(url, success=True)
+        else:
+            self.collector._remember_variant(url, variant_href)
+        
+        self._finish(key, future, article)
+    
+    def _finish(self, key: str, future: Future, article: Dict):
+        """Resolve an extraction future."""
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(article)
+    
+    def _add_busy(self, stat: str, started: float):
+        """Accumulate time spent in a stage."""
+        with self._lock:
+            self.stats[stat] += time.perf_counter() - started
+    
+    def reset_stats(self):
+        """Start a new utilization measurement window."""
+        with self._lock:
+            self.stats = {
+                'submitted': 0,
+                'parsed': 0,
+                'fetch_busy': 0.0,
+                'fetch_blocked': 0.0,
+                'parse_busy': 0.0,
+                'started_at': time.perf_counter()
+            }
+    
+    def utilization(self) -> Dict[str, float]:
+        """
+        Per-stage utilization since the last reset.
+        
+        Returns:
+            Fraction of available worker time each stage spent busy, plus the
+            fraction of fetch time spent blocked on a full parse queue
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        
+        elapsed = max(time.perf_counter() - stats['started_at'], 1e-9)
+        fetch_time = stats['fetch_busy'] + stats['fetch_blocked']
+        
+        return {
+            'fetch': stats['fetch_busy'] / (elapsed * self.io_workers),
+            'parse': stats['parse_busy'] / (elapsed * self.parse_workers),
+            'fetch_blocked': stats['fetch_blocked'] / fetch_time if fetch_time else 0.0,
+            'pages': stats['parsed']
+        }
+    
+    def print_stats(self):
+        """Print per-stage utilization."""
+        usage = self.utilization()
+        print(f"\n⚙️  Extraction pipeline: {usage['pages']} pages parsed")
+        print(f"   Fetch stage: {usage['fetch']:.0%} of {self.io_workers} threads busy "
+              f"({usage['fetch_blocked']:.0%} of fetch time blocked on parsing)")
+        print(f"   Parse stage: {usage['parse']:.0%} of {self.parse_workers} processes busy")
@@ -1,12 +1,19 @@
 """Enhanced news collection with multiple sources: NewsAPI, RSS, Reddit."""
 
 import os
+import re
 import time
+import threading
 import feedparser
 import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from config import Config
+from news_collector import NewsCollector, clean_html_text, canonical_url
+from singleflight import get_fetch_group
+from database import get_database
 
 
 class NewsAPICollector:
@@ -46,20 +53,12 @@ class NewsAPICollector:
         try:
             print(f"📰 Fetching from NewsAPI: {category}")
             
-            response = requests.get(
-                f"{self.base_url}/top-headlines",
-                params={
-                    'apiKey': self.api_key,
-                    'category': newsapi_category,
-                    'language': language,
-                    'pageSize': max_results
-                },
-                timeout=10
+            # Categories sharing a NewsAPI category share one in-flight request
+            data = get_fetch_group().do(
+                ('newsapi', newsapi_category, language, max_results),
+                self._fetch_headlines, newsapi_category, language, max_results
             )
             
-            response.raise_for_status()
-            data = response.json()
-            
             if data['status'] != 'ok':
                 print(f"❌ NewsAPI error: {data.get('message', 'Unknown error')}")
                 return []
@@ -82,6 +81,22 @@ class NewsAPICollector:
         except Exception as e:
             print(f"❌ NewsAPI error: {str(e)}")
             return []
+    
+    def _fetch_headlines(self, newsapi_category: str, language: str, max_results: int) -> Dict:
+        """Request top headlines for one NewsAPI category."""
+        response = requests.get(
+            f"{self.base_url}/top-headlines",
+            params={
+                'apiKey': self.api_key,
+                'category': newsapi_category,
+                'language': language,
+                'pageSize': max_results
+            },
+            timeout=10
+        )
+        
+        response.raise_for_status()
+        return response.json()
 
 
 class RSSFeedCollector:
@@ -135,12 +150,13 @@ class RSSFeedCollector:
             try:
                 print(f"📡 Fetching RSS: {feed_url}")
                 
-                feed = feedparser.parse(feed_url)
+                # Feeds shared by several categories are fetched once when concurrent
+                feed = get_fetch_group().do(('rss', feed_url), feedparser.parse, feed_url)
                 
                 for entry in feed.entries[:max_per_feed]:
                     articles.append({
                         'title': entry.get('title', ''),
-                        'content': entry.get('summary', entry.get('description', '')),
+                        'content': self._entry_content(entry),
                         'url': entry.get('link', ''),
                         'source': feed.feed.get('title', 'RSS Feed'),
                         'published_at': entry.get('published', ''),
@@ -156,6 +172,15 @@ class RSSFeedCollector:
         
         print(f"✓ Collected {len(articles)} articles from RSS feeds")
         return articles
+    
+    def _entry_content(self, entry) -> str:
+        """Prefer the full body from content:encoded over the summary."""
+        for content in entry.get('content', []):
+            body = clean_html_text(content.get('value', ''))
+            if body:
+                return body
+        
+        return entry.get('summary', entry.get('description', ''))
 
 
 class RedditCollector:
@@ -189,17 +214,11 @@ class RedditCollector:
             try:
                 print(f"🔴 Fetching from r/{subreddit}")
                 
-                # Use Reddit JSON API (no auth required for public posts)
-                response = requests.get(
-                    f"https://www.reddit.com/r/{subreddit}/hot.json",
-                    headers={'User-Agent': 'Mozilla/5.0'},
-                    params={'limit': max_posts},
-                    timeout=10
+                data = get_fetch_group().do(
+                    ('reddit', subreddit, max_posts),
+                    self._fetch_hot_posts, subreddit, max_posts
                 )
                 
-                response.raise_for_status()
-                data = response.json()
-                
                 for post in data['data']['children']:
                     post_data = post['data']
                     
@@ -229,6 +248,125 @@ class RedditCollector:
         
         print(f"✓ Collected {len(articles)} posts from Reddit")
         return articles[:max_posts]
+    
+    def _fetch_hot_posts(self, subreddit: str, max_posts: int) -> Dict:
+        """Request hot posts for one subreddit."""
+        # Use Reddit JSON API (no auth required for public posts)
+        response = requests.get(
+            f"https://www.reddit.com/r/{subreddit}/hot.json",
+            headers={'User-Agent': 'Mozilla/5.0'},
+            params={'limit': max_posts},
+            timeout=10
+        )
+        
+        response.raise_for_status()
+        return response.json()
+
+
+class ArticleEnricher:
+    """Fetch full article text for feed/API articles whose content is too thin."""
+    
+    # NewsAPI appends "... [+1234 chars]" to truncated content
+    TRUNCATION_MARKER = re.compile(r'\[\+\d+ chars\]\s*$')
+    
+    def __init__(self, extractor: Optional[NewsCollector] = None):
+        """
+        Initialize the enricher.
+        
+        Args:
+            extractor: Collector whose page-extraction path is used for fetching
+        """
+        self.extractor = extractor or NewsCollector()
+        self.min_chars = Config.ENRICH_MIN_CONTENT_CHARS
+        self.max_workers = Config.ENRICH_MAX_WORKERS
+        
+        # Enriched bodies keyed by canonical URL (LRU)
+        self.cache: "OrderedDict[str, str]" = OrderedDict()
+        self.cache_size = Config.ENRICH_CACHE_SIZE
+        self._lock = threading.Lock()
+    
+    def needs_enrichment(self, article: Dict) -> bool:
+        """Check whether an article's feed content is insufficient."""
+        url = article.get('url', '')
+        if not url or any(domain in url for domain in self.extractor.ignored_domains):
+            return False
+        
+        # Don't fetch pages we already have (or already turned into videos)
+        if self.extractor.db and not self.extractor.db.should_fetch_url(url):
+            return False
+        
+        content = article.get('content') or ''
+        return bool(self.TRUNCATION_MARKER.search(content)) or len(content) < self.min_chars
+    
+    def enrich(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Replace thin content with the full article text, fetching concurrently.
+        
+        Args:
+            articles: Articles from NewsAPI/RSS/Reddit collectors (updated in place)
+        """
+        pending = {}
+        
+        for article in articles:
+            if not self.needs_enrichment(article):
+                continue
+            
+            key = canonical_url(article['url'])
+            body = self._cache_get(key)
+            
+            if body is not None:
+                self._apply(article, body)
+            else:
+                pending.setdefault(key, []).append(article)
+        
+        if pending:
+            print(f"📖 Enriching {len(pending)} articles with full text...")
+            
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                urls = [group[0]['url'] for group in pending.values()]
+                bodies = executor.map(self._fetch_full_text, urls)
+                
+                for (key, group), body in zip(pending.items(), bodies):
+                    self._cache_put(key, body)
+                    for article in group:
+                        self._apply(article, body)
+        
+        enriched = sum(1 for article in articles if article.get('enriched'))
+        print(f"✓ Enriched {enriched} articles")
+        return articles
+    
+    def _fetch_full_text(self, url: str) -> str:
+        """Fetch and extract one article body; empty string on failure."""
+        article = self.extractor.extract_page_content(url)
+        return article.get('content', '')
+    
+    def _apply(self, article: Dict, body: str):
+        """Use the enriched body if it is longer than what the feed provided."""
+        feed_content = self.TRUNCATION_MARKER.sub('', article.get('content') or '')
+        
+        if len(body) > len(feed_content):
+            article['content'] = body
+            article['enriched'] = True
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up an enriched body by canonical URL."""
+        with self._lock:
+            if key not in self.cache:
+                return None
+            self.cache.move_to_end(key)
+            return self.cache[key]
+    
+    def _cache_put(self, key: str, body: str):
+        """Store an enriched body, evicting the least recently used entries."""
+        # Don't cache failures so the next cycle can retry
+        if not body:
+            return
+        
+        with self._lock:
+            self.cache[key] = body
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
 
 
 class EnhancedNewsCollector:
@@ -239,6 +377,8 @@ class EnhancedNewsCollector:
         self.newsapi = NewsAPICollector()
         self.rss = RSSFeedCollector()
         self.reddit = RedditCollector()
+        self.enricher = None
+        self.db = get_database() if Config.SKIP_SEEN_URLS else None
     
     def collect_from_all_sources(
         self, 
@@ -246,7 +386,8 @@ class EnhancedNewsCollector:
         language: str = 'en',
         use_newsapi: bool = True,
         use_rss: bool = True,
-        use_reddit: bool = False
+        use_reddit: bool = False,
+        enrich: bool = False
     ) -> List[Dict]:
         """
         Collect news from all enabled sources.
@@ -257,6 +398,7 @@ class EnhancedNewsCollector:
             use_newsapi: Use NewsAPI
             use_rss: Use RSS feeds
             use_reddit: Use Reddit
+            enrich: Fetch full text for articles with truncated or missing content
         """
         all_articles = []
         
@@ -284,5 +426,21 @@ class EnhancedNewsCollector:
         
         print(f"\n📊 Total unique articles collected: {len(unique_articles)}")
         
+        if enrich:
+            if self.enricher is None:
+                self.enricher = ArticleEnricher()
+            self.enricher.enrich(unique_articles)
+        
+        # Record the batch so later cycles skip these URLs
+        if self.db and unique_articles:
+            write = self.db.write_behind(self.db.add_articles, [dict(article) for article in unique_articles])
+            write.add_done_callback(self._report_write)
+        
         return unique_articles
+    
+    @staticmethod
+    def _report_write(write):
+        """Log a failed write-behind store of collected articles (nothing waits on it)."""
+        if write.exception():
+            print(f"⚠️  Could not store collected articles: {write.exception()}")
 
@@ -0,0 +1,73 @@
+"""Provider-aware rate limiting for LLM API calls."""
+
+import time
+import threading
+from typing import Dict, Optional
+from config import Config
+
+
+class RateLimiter:
+    """
+    Token bucket limiting calls per minute, shared by all threads.
+    
+    Up to `burst` calls may start back to back; after that calls are spaced
+    out to the configured rate.
+    """
+    
+    def __init__(self, per_minute: int, burst: Optional[int] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            per_minute: Sustained calls per minute (0 = unlimited)
+            burst: Calls allowed at once (defaults to a tenth of a minute's worth)
+        """
+        self.per_minute = per_minute
+        self.burst = burst or max(1, per_minute // 10)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Block until a call may start.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        if self.per_minute <= 0:
+            return 0.0
+        
+        waited = 0.0
+        rate = self.per_minute / 60.0
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                
+                delay = (1 - self._tokens) / rate
+            
+            time.sleep(delay)
+            waited += delay
+
+
+# One limiter per provider, shared by every generator in the process
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """Get the shared rate limiter for an LLM provider."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            per_minute = {
+                'openai': Config.OPENAI_REQUESTS_PER_MINUTE,
+                'anthropic': Config.ANTHROPIC_REQUESTS_PER_MINUTE
+            }.get(provider, 0)
+            _limiters[provider] = RateLimiter(per_minute)
+        return _limiters[provider]
@@ -0,0 +1,343 @@
+"""Time-partitioned archival and retention for reporter.db."""
+
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from config import Config
+from database import Database, get_database
+
+
+class RetentionManager:
+    """
+    Move old rows out of the hot database into monthly archive databases.
+    
+    Scripts older than the horizon move together with their videos,
+    analytics, upload queue entries and source links; old articles move
+    unless a script still in the hot database uses them. Each archive
+    (archive/reporter-YYYY-MM.db) has the same schema as the hot tables, so
+    it can be ATTACHed for historical queries. Statistics are unaffected:
+    the daily_stats rollups stay in the hot database.
+    """
+    
+    # Archived with each script: (table, filter on the temp.retention_scripts ids).
+    # Children come first because their filters look up the script's videos.
+    SCRIPT_TABLES = [
+        ('analytics', "video_id IN (SELECT id FROM videos WHERE script_id IN (SELECT id FROM temp.retention_scripts))"),
+        ('upload_queue', "video_id IN (SELECT id FROM videos WHERE script_id IN (SELECT id FROM temp.retention_scripts))"),
+        ('videos', "script_id IN (SELECT id FROM temp.retention_scripts)"),
+        ('script_sources', "script_id IN (SELECT id FROM temp.retention_scripts)"),
+        ('scripts', "id IN (SELECT id FROM temp.retention_scripts)"),
+    ]
+    
+    # Queue states that keep a script (and its video) in the hot database
+    ACTIVE_UPLOAD_STATES = ('pending', 'processing')
+    
+    def __init__(self, db: Optional[Database] = None, archive_dir: Optional[str] = None,
+                 retention_days: Optional[int] = None):
+        """
+        Initialize the retention manager.
+        
+        Args:
+            db: Database to archive from (defaults to the shared instance)
+            archive_dir: Directory for monthly archive databases
+            retention_days: Rows older than this many days are archived
+        """
+        self.db = db or get_database()
+        self.archive_dir = Path(archive_dir or Config.ARCHIVE_DIR)
+        self.retention_days = retention_days if retention_days is not None else Config.RETENTION_DAYS
+        self.archive_dir.mkdir(exist_ok=True)
+    
+    def archive_path(self, month: str) -> Path:
+        """Archive database file for a month ('YYYY-MM')."""
+        return self.archive_dir / f"reporter-{month}.db"
+    
+    def list_archives(self) -> List[str]:
+        """Months that have an archive database, oldest first."""
+        return sorted(
+            match.group(1) for match in
+            (re.fullmatch(r'reporter-(\d{4}-\d{2})\.db', path.name) for path in self.archive_dir.iterdir())
+            if match
+        )
+    
+    def attach_archives(self, conn: Optional[sqlite3.Connection] = None,
+                        months: Optional[List[str]] = None) -> List[str]:
+        """
+        ATTACH archive databases for historical queries.
+        
+        Each archive is attached as archive_YYYY_MM, e.g.
+        SELECT title FROM archive_2024_01.scripts UNION ALL SELECT title FROM main.scripts
+        
+        Args:
+            conn: Connection to attach to (defaults to the calling thread's)
+            months: Months to attach (defaults to all)
+        
+        Returns:
+            The schema names attached
+        """
+        conn = conn or self.db.conn
+        attached = {row['name'] for row in conn.execute("PRAGMA database_list")}
+        names = []
+        
+        for month in months or self.list_archives():
+            name = f"archive_{month.replace('-', '_')}"
+            if name not in attached:
+                conn.execute("ATTACH DATABASE ? AS " + name, (str(self.archive_path(month)),))
+            names.append(name)
+        
+        return names
+    
+    def run(self, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Archive everything older than the retention horizon, then reclaim space.
+        
+        Args:
+            dry_run: Only count what would be archived
+        
+        Returns:
+            Number of rows archived per table
+        """
+        if self.retention_days <= 0:
+            print("Retention disabled (RETENTION_DAYS=0)")
+            return {}
+        
+        # Queued write-behind writes belong to the hot database first
+        self.db.flush()
+        
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).strftime('%Y-%m-%d %H:%M:%S')
+        conn = self.db.conn
+        totals: Dict[str, int] = {}
+        
+        print(f"\n🗄️  Archiving rows older than {self.retention_days} days (before {cutoff[:10]})...")
+        
+        for month in self._months(conn, cutoff):
+            if dry_run:
+                counts = self._count_month(conn, month, cutoff)
+            else:
+                counts = self._archive_month(conn, month, cutoff)
+            
+            for table, count in counts.items():
+                totals[table] = totals.get(table, 0) + count
+            
+            moved = ", ".join(f"{count} {table}" for table, count in counts.items() if count)
+            print(f"  {'Would archive' if dry_run else '✓ Archived'} {month}: {moved or 'nothing'}")
+        
+        if not dry_run and any(totals.values()):
+            removed = self._collect_garbage(conn)
+            totals['article_bodies'] = totals.get('article_bodies', 0) + removed
+            self.reclaim_space()
+        
+        if not any(totals.values()):
+            print("  Nothing to archive")
+        
+        return totals
+    
+    def _months(self, conn: sqlite3.Connection, cutoff: str) -> List[str]:
+        """Months with rows older than the cutoff."""
+        cursor = conn.execute("""
+            SELECT strftime('%Y-%m', created_at) AS month FROM scripts WHERE created_at < ?
+            UNION
+            SELECT strftime('%Y-%m', created_at) FROM articles
+            WHERE julianday(COALESCE(collected_at, created_at)) < julianday(?)
+            ORDER BY month
+        """, (cutoff, cutoff))
+        
+        return [row['month'] for row in cursor.fetchall() if row['month']]
+    
+    def _select_rows(self, conn: sqlite3.Connection, month: str, cutoff: str):
+        """Fill temp tables with the script and article ids to archive for a month."""
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS retention_scripts (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS retention_articles (id INTEGER PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.retention_scripts")
+        conn.execute("DELETE FROM temp.retention_articles")
+        
+        placeholders = ", ".join("?" * len(self.ACTIVE_UPLOAD_STATES))
+        conn.execute(f"""
+            INSERT INTO temp.retention_scripts (id)
+            SELECT id FROM scripts
+            WHERE created_at < ? AND strftime('%Y-%m', created_at) = ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM videos
+                  JOIN upload_queue ON upload_queue.video_id = videos.id
+                  WHERE videos.script_id = scripts.id AND upload_queue.status IN ({placeholders})
+              )
+        """, (cutoff, month, *self.ACTIVE_UPLOAD_STATES))
+        
+        # Articles still used by a script that stays hot remain hot too
+        conn.execute(f"""
+            INSERT INTO temp.retention_articles (id)
+            SELECT id FROM articles
+            WHERE julianday(COALESCE(collected_at, created_at)) < julianday(?)
+              AND strftime('%Y-%m', created_at) = ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM script_sources
+                  JOIN scripts ON scripts.id = script_sources.script_id
+                  WHERE script_sources.article_id = articles.id
+                    AND (scripts.created_at >= ? OR EXISTS (
+                        SELECT 1 FROM videos
+                        JOIN upload_queue ON upload_queue.video_id = videos.id
+                        WHERE videos.script_id = scripts.id AND upload_queue.status IN ({placeholders})
+                    ))
+              )
+        """, (cutoff, month, cutoff, *self.ACTIVE_UPLOAD_STATES))
+    
+    def _count_month(self, conn: sqlite3.Connection, month: str, cutoff: str) -> Dict[str, int]:
+        """Count the rows a month's archival would move (touches only temp tables)."""
+        self._select_rows(conn, month, cutoff)
+        
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}").fetchone()[0]
+            for table, where in self.SCRIPT_TABLES
+        }
+        counts['articles'] = conn.execute("SELECT COUNT(*) FROM temp.retention_articles").fetchone()[0]
+        return counts
+    
+    def _archive_month(self, conn: sqlite3.Connection, month: str, cutoff: str) -> Dict[str, int]:
+        """Copy a month's old rows into its archive database and delete them from the hot one."""
+        path = self.archive_path(month)
+        # Reuse an attachment made by attach_archives(); a file can't be attached twice
+        schema = next((row['name'] for row in conn.execute("PRAGMA database_list")
+                       if row['file'] and Path(row['file']).resolve() == path.resolve()), None)
+        attached_here = schema is None
+        if attached_here:
+            schema = 'retention_archive'
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (str(path),))
+        counts = {}
+        
+        try:
+            self._ensure_archive_schema(conn, schema)
+            
+            # Inserts are idempotent (OR IGNORE on the original ids), so a run
+            # interrupted between the two files' commits is safe to repeat
+            with self.db.transaction():
+                self._select_rows(conn, month, cutoff)
+                
+                # Archived rows stop counting as coverage
+                self.db.unindex_coverage('script', [row[0] for row in conn.execute(
+                    "SELECT id FROM temp.retention_scripts").fetchall()])
+                self.db.unindex_coverage('article', [row[0] for row in conn.execute(
+                    "SELECT id FROM temp.retention_articles").fetchall()])
+                
+                for table, where in self.SCRIPT_TABLES:
+                    counts[table] = self._move(conn, schema, table, where)
+                
+                self._copy(conn, schema, 'article_bodies', """
+                    hash IN (SELECT content_hash FROM articles
+                             WHERE id IN (SELECT id FROM temp.retention_articles))
+                """)
+                # Drop their full-text entries while the bodies are still here
+                self.db.index_articles(conn, [tuple(row) for row in conn.execute("""
+                    SELECT id, title, content_hash FROM articles
+                    WHERE id IN (SELECT id FROM temp.retention_articles)
+                """).fetchall()], remove=True)
+                # Their URLs stay known, so the collectors don't fetch the stories again
+                archived_urls = [row[0] for row in conn.execute("""
+                    INSERT OR IGNORE INTO main.archived_urls (url, collected_at)
+                    SELECT url, COALESCE(collected_at, created_at) FROM articles
+                    WHERE id IN (SELECT id FROM temp.retention_articles)
+                    RETURNING url
+                """).fetchall()]
+                counts['articles'] = self._move(
+                    conn, schema, 'articles', "id IN (SELECT id FROM temp.retention_articles)"
+                )
+            
+            for url in archived_urls:
+                self.db.url_filter.mark_used(url)
+        finally:
+            if attached_here:
+                conn.execute(f"DETACH DATABASE {schema}")
+        
+        return counts
+    
+    def _ensure_archive_schema(self, conn: sqlite3.Connection, schema: str):
+        """Create the archive tables from the hot schema and add any newer columns."""
+        tables = [table for table, _ in self.SCRIPT_TABLES] + ['articles', 'article_bodies']
+        
+        for table in tables:
+            sql = conn.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()['sql']
+            conn.execute(re.sub(
+                r'^CREATE TABLE\s+"?\w+"?',
+                f'CREATE TABLE IF NOT EXISTS {schema}.{table}',
+                sql
+            ))
+            
+            archived = {row['name'] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")}
+            for row in conn.execute(f"PRAGMA main.table_info({table})").fetchall():
+                if row['name'] not in archived:
+                    conn.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {row['name']} {row['type']}")
+    
+    def _copy(self, conn: sqlite3.Connection, schema: str, table: str, where: str) -> int:
+        """Copy matching rows into the attached archive."""
+        columns = ", ".join(row['name'] for row in conn.execute(f"PRAGMA main.table_info({table})").fetchall())
+        cursor = conn.execute(f"""
+            INSERT OR IGNORE INTO {schema}.{table} ({columns})
+            SELECT {columns} FROM main.{table} WHERE {where}
+        """)
+        return cursor.rowcount
+    
+    def _move(self, conn: sqlite3.Connection, schema: str, table: str, where: str) -> int:
+        """Copy matching rows into the attached archive, then delete them from the hot database."""
+        self._copy(conn, schema, table, where)
+        return conn.execute(f"DELETE FROM main.{table} WHERE {where}").rowcount
+    
+    def _collect_garbage(self, conn: sqlite3.Connection) -> int:
+        """Delete article bodies no hot article references any more."""
+        with self.db.transaction():
+            return conn.execute("""
+                DELETE FROM article_bodies
+                WHERE hash NOT IN (SELECT content_hash FROM articles WHERE content_hash IS NOT NULL)
+            """).rowcount
+    
+    def reclaim_space(self, max_pages: int = 0):
+        """
+        Return free pages to the filesystem.
+        
+        Databases created before incremental auto-vacuum was enabled get a
+        one-time full VACUUM to switch modes; afterwards only free pages are
+        released, which is cheap.
+        
+        Args:
+            max_pages: Pages to release per call (0 = all free pages)
+        """
+        conn = self.db.conn
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            print("  Enabling incremental auto-vacuum (one-time VACUUM)...")
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        elif free_pages:
+            conn.execute(f"PRAGMA incremental_vacuum({max_pages or free_pages})").fetchall()
+        
+        # Shrink the WAL file as well
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        print(f"  ✓ Reclaimed ~{free_pages * page_size / 1024 / 1024:.1f} MB")
+
+
+def main():
+    """Command line entry point: python retention.py [--dry-run] [--days N] [--vacuum]"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Archive old rows out of reporter.db")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would be archived")
+    parser.add_argument('--days', type=int, default=None, help="retention horizon in days")
+    parser.add_argument('--vacuum', action='store_true', help="only reclaim free space")
+    args = parser.parse_args()
+    
+    manager = RetentionManager(retention_days=args.days)
+    
+    if args.vacuum:
+        manager.reclaim_space()
+    else:
+        manager.run(dry_run=args.dry_run)
+    
+    print(f"Archives: {', '.join(manager.list_archives()) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,304 @@
 """YouTube video script generation module using LLMs."""
 
-from typing import List, Dict, Optional
+import re
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from datetime import datetime
 from config import Config
+from llm_router import Route, get_llm_router
+from llm_cache import LLMCache, get_llm_cache
+from context_packer import ContextPacker, count_tokens
+from database import get_database
+
+
+# Subscriber callback: on_event(event, value)
+ScriptEventCallback = Callable[[str, Any], None]
+
+
+class ScriptStreamParser:
+    """
+    Incremental parser for a streamed script completion.
+    
+    Text chunks are fed as they arrive and each section is emitted to the
+    subscribers as soon as it is complete, so work like TTS for the hook or
+    thumbnail rendering can start while the model is still writing:
+        
+        title, tags, thumbnail_text  - at the end of their line
+        hook, description            - when the next section starts
+        script_paragraph             - per script line, as in _parse_script_response
+        done                         - the full completion, after the last event
+        reset                        - the events so far are void: a provider call
+                                       failed and the next attempt starts over
+    
+    When the completion is retried or failed over, every provider call feeds
+    the parser through its own start_attempt() handle; only the latest
+    attempt's text gets through.
+    """
+    
+    SECTIONS = {
+        'TITLE:': 'title',
+        'HOOK:': 'hook',
+        'SCRIPT:': 'script',
+        'DESCRIPTION:': 'description',
+        'TAGS:': 'tags',
+        'THUMBNAIL_TEXT:': 'thumbnail_text'
+    }
+    
+    def __init__(self, on_event: Optional[ScriptEventCallback] = None):
+        """
+        Initialize the parser.
+        
+        Args:
+            on_event: Optional first subscriber
+        """
+        self._subscribers: List[ScriptEventCallback] = []
+        self._chunks: List[str] = []
+        self._partial_line = ""
+        self._section = None
+        self._section_lines: List[str] = []
+        self._attempt = 0
+        self._attempt_lock = threading.RLock()
+        
+        if on_event:
+            self.subscribe(on_event)
+    
+    def subscribe(self, callback: ScriptEventCallback):
+        """Register a callback for section events."""
+        self._subscribers.append(callback)
+    
+    def feed(self, text: str):
+        """Consume the next chunk of the completion."""
+        if not text:
+            return
+        
+        self._chunks.append(text)
+        *lines, self._partial_line = (self._partial_line + text).split('\n')
+        
+        for line in lines:
+            self._handle_line(line)
+    
+    def close(self) -> str:
+        """
+        Flush the last line and open section.
+        
+        Returns:
+            The full completion text
+        """
+        if self._partial_line:
+            self._handle_line(self._partial_line)
+            self._partial_line = ""
+        self._finish_section()
+        
+        content = ''.join(self._chunks)
+        self._emit('done', content)
+        return content
+    
+    def start_attempt(self) -> 'ScriptStreamAttempt':
+        """
+        Start feeding a new provider call, superseding earlier ones.
+        
+        If an earlier attempt already produced text, its state is dropped
+        and subscribers get a 'reset' event first.
+        """
+        with self._attempt_lock:
+            if self._chunks or self._partial_line:
+                self._chunks = []
+                self._partial_line = ""
+                self._section = None
+                self._section_lines = []
+                self._emit('reset', None)
+            
+            self._attempt += 1
+            return ScriptStreamAttempt(self, self._attempt)
+    
+    def abandon(self):
+        """Ignore every attempt started so far (the request is over)."""
+        with self._attempt_lock:
+            self._attempt += 1
+    
+    def _feed_attempt(self, attempt: int, text: str):
+        """feed() on behalf of an attempt, unless it was superseded."""
+        with self._attempt_lock:
+            if attempt == self._attempt:
+                self.feed(text)
+    
+    def _close_attempt(self, attempt: int):
+        """close() on behalf of an attempt, unless it was superseded."""
+        with self._attempt_lock:
+            if attempt == self._attempt:
+                self.close()
+    
+    def _handle_line(self, line: str):
+        """Route one complete line to its section."""
+        line_stripped = line.strip()
+        
+        for marker, section in self.SECTIONS.items():
+            if line_stripped.startswith(marker):
+                self._finish_section()
+                value = line_stripped[len(marker):].strip()
+                
+                if section == 'title':
+                    self._emit('title', value)
+                elif section == 'tags':
+                    self._emit('tags', [tag.strip() for tag in value.replace('[', '').replace(']', '').split(',')])
+                elif section == 'thumbnail_text':
+                    self._emit('thumbnail_text', value)
+                else:
+                    self._section = section
+                    self._section_lines = [value] if value else []
+                return
+        
+        if not line_stripped or self._section is None:
+            return
+        
+        if self._section == 'script':
+            self._emit('script_paragraph', line_stripped)
+        else:
+            self._section_lines.append(line_stripped)
+    
+    def _finish_section(self):
+        """Emit a multi-line section once the next one begins."""
+        if self._section == 'hook':
+            self._emit('hook', " ".join(self._section_lines))
+        elif self._section == 'description':
+            self._emit('description', '\n'.join(self._section_lines))
+        
+        self._section = None
+        self._section_lines = []
+    
+    def _emit(self, event: str, value: Any):
+        """Deliver an event; a failing subscriber must not break the stream."""
+        for callback in self._subscribers:
+            try:
+                callback(event, value)
+            except Exception as e:
+                print(f"⚠️  Script event subscriber failed on {event}: {str(e)}")
+
+
+class ScriptStreamAttempt:
+    """One provider call's stream into a shared ScriptStreamParser."""
+    
+    def __init__(self, parser: ScriptStreamParser, attempt: int):
+        """
+        Initialize the attempt.
+        
+        Args:
+            parser: Parser the subscribers listen to
+            attempt: Number the parser gave this attempt
+        """
+        self.parser = parser
+        self.attempt = attempt
+        self._chunks: List[str] = []
+    
+    def feed(self, text: str):
+        """Consume the next chunk (passed on only while this is the current attempt)."""
+        if text:
+            self._chunks.append(text)
+            self.parser._feed_attempt(self.attempt, text)
+    
+    def close(self) -> str:
+        """
+        Finish the attempt.
+        
+        Returns:
+            This attempt's full completion text
+        """
+        self.parser._close_attempt(self.attempt)
+        return ''.join(self._chunks)
 
 
 class ScriptGenerator:
     """Generates professional YouTube video scripts using LLMs."""
     
+    SYSTEM_PROMPT = "You are a professional YouTube content creator and scriptwriter."
+    TEMPERATURE = 0.7
+    MAX_TOKENS = 3000
+    BATCH_MAX_ATTEMPTS = 3
+    
+    # Shortest prompt prefix the providers cache (Anthropic's Haiku models need 2048 tokens).
+    # The system prompt is shorter than this, so it is only cached if it grows past it.
+    PROMPT_CACHE_MIN_TOKENS = 1024
+    
+    # Response format closing the system prompt
+    RESPONSE_FORMAT = """TITLE: [Your YouTube-optimized title]
+
+HOOK: [First 10 seconds - the attention grabber]
+
+SCRIPT:
+[Full video script with sections clearly marked]
+
+[Include timestamps like 0:00, 0:45, 2:15, etc.]
+
+DESCRIPTION:
+[Complete YouTube description with summary, links, timestamps, and hashtags]
+
+TAGS: [tag1, tag2, tag3, tag4, tag5, tag6, tag7, tag8]
+
+THUMBNAIL_TEXT: [Short punchy text for thumbnail - max 5 words]"""
+    
+    # LLM_SPLIT_MODE sub-requests replace it with the sections they are asked for
+    SPLIT_FORMATS = {
+        'body': """HOOK: [First 10 seconds - the attention grabber]
+
+SCRIPT:
+[Full video script with sections clearly marked]
+
+[Include timestamps like 0:00, 0:45, 2:15, etc.]""",
+        'description': """DESCRIPTION:
+[Complete YouTube description with summary, links and hashtags - no timestamps, they are added from the script]""",
+        'metadata': """TITLE: [Your YouTube-optimized title]
+
+TAGS: [tag1, tag2, tag3, tag4, tag5, tag6, tag7, tag8]
+
+THUMBNAIL_TEXT: [Short punchy text for thumbnail - max 5 words]"""
+    }
+    
+    # LLM_SPLIT_MODE sub-requests: (instruction closing the prompt, max_tokens, section the reply must have)
+    SPLIT_PARTS = {
+        'body': ("Write only the HOOK and SCRIPT sections for these articles, "
+                 "following the instructions and format exactly.", MAX_TOKENS, 'SCRIPT:'),
+        'description': ("Write only the DESCRIPTION section for a video about these articles, following the "
+                        "format exactly. Leave out timestamps; they are added from the script.", 800, 'DESCRIPTION:'),
+        'metadata': ("Write only the TITLE, TAGS and THUMBNAIL_TEXT lines for a video about these articles, "
+                     "following the format exactly.", 200, 'TITLE:')
+    }
+    
     def __init__(self):
         """Initialize the script generator."""
         self.provider = Config.LLM_PROVIDER
         self.model = Config.MODEL_NAME
         
-        if self.provider == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        elif self.provider == "anthropic":
-            from anthropic import Anthropic
-            self.client = Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        # Primary provider plus LLM_FALLBACK_ROUTES; shared across threads, so route
+        # health and the providers' rate limits are tracked process-wide
+        self.router = get_llm_router(self.provider, self.model)
+        self.client = self.router.primary.client
+        self.rate_limiter = self.router.primary.rate_limiter
+        self.cache = get_llm_cache()
+        
+        # Split mode sends the metadata calls to LLM_METADATA_MODEL (default: the script model)
+        if Config.LLM_METADATA_MODEL:
+            metadata_provider, _, metadata_model = Config.LLM_METADATA_MODEL.rpartition(':')
+            self.metadata_router = get_llm_router(metadata_provider or self.provider, metadata_model)
         else:
-            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+            self.metadata_router = self.router
     
-    def generate_video_script(self, news_items: List[Dict], category: str) -> Optional[Dict]:
+    def generate_video_script(self, news_items: List[Dict], category: str,
+                              use_cache: Optional[bool] = None,
+                              on_event: Optional[ScriptEventCallback] = None) -> Optional[Dict]:
         """
         Generate a comprehensive video script from multiple news sources.
         
         Args:
             news_items: List of news articles to synthesize
             category: Category of the video (sports, politics, finance)
-            
+            use_cache: Reuse a cached completion of the same prompt
+                (defaults to on unless LLM_CACHE_BYPASS; fresh results are cached either way)
+            on_event: Subscriber for section events (see ScriptStreamParser); streams
+                the completion and is called on this thread as each section finishes
+                (streamed scripts are always one call, even in LLM_SPLIT_MODE)
+        
         Returns:
             Dictionary with 'title', 'script', 'description', 'tags', 'category', 'hook', 'timestamps'
         """
@@ -37,17 +306,15 @@ class ScriptGenerator:
             print(f"No news items provided for {category}")
             return None
         
-        # Create context from news items
-        context = self._create_context(news_items)
-        
-        # Generate the script
-        prompt = self._create_prompt(context, category)
+        if use_cache is None:
+            use_cache = not Config.LLM_CACHE_BYPASS
         
         try:
-            if self.provider == "openai":
-                script_data = self._generate_with_openai(prompt)
+            # Generate the script
+            if Config.LLM_SPLIT_MODE and on_event is None:
+                script_data = self._generate_split(news_items, category, use_cache)
             else:
-                script_data = self._generate_with_anthropic(prompt)
+                script_data = self._generate(self._build_prompt(news_items, category), use_cache, on_event)
             
             if script_data:
                 script_data['category'] = category
@@ -55,13 +322,176 @@ class ScriptGenerator:
                 script_data['generated_at'] = datetime.now().isoformat()
             
             return script_data
-            
+        
         except Exception as e:
             print(f"Error generating script for {category}: {str(e)}")
             return None
     
+    def submit_batch(self, jobs: List[Tuple[str, List[Dict]]], attempt: int = 1) -> Optional[str]:
+        """
+        Submit the script prompts of several categories as one provider batch job.
+        
+        Batch jobs (OpenAI Batch, Anthropic Message Batches) cost less and
+        finish within the provider's completion window instead of right away.
+        The job is recorded in the database; poll_batches() collects it on a
+        later cycle.
+        
+        Args:
+            jobs: (category, news_items) pairs
+            attempt: How many times these prompts have been submitted, this time included
+        
+        Returns:
+            Provider batch ID, or None if nothing was submitted
+        """
+        prompts = {}
+        requests = {}
+        
+        for i, (category, news_items) in enumerate(jobs):
+            if not news_items:
+                continue
+            
+            # Providers only accept [A-Za-z0-9_-] in request IDs
+            custom_id = f"{re.sub(r'[^A-Za-z0-9_-]', '_', category)[:48]}-{i}"
+            prompts[custom_id] = self._build_prompt(news_items, category)
+            requests[custom_id] = {
+                'category': category,
+                'sources': [item['url'] for item in news_items[:5]],
+                'cache_key': self._cache_key(prompts[custom_id]),
+                'attempt': attempt
+            }
+        
+        if not prompts:
+            return None
+        
+        try:
+            self.rate_limiter.acquire()
+            
+            if self.provider == "openai":
+                batch_id = self._submit_openai_batch(prompts)
+            else:
+                batch_id = self._submit_anthropic_batch(prompts)
+        except Exception as e:
+            print(f"Error submitting batch: {str(e)}")
+            return None
+        
+        get_database().add_llm_batch(self.provider, self.model, batch_id, requests, Config.BATCH_POLL_INITIAL_SECONDS)
+        print(f"📦 Submitted batch {batch_id} ({len(prompts)} scripts: {', '.join(job['category'] for job in requests.values())})")
+        return batch_id
+    
+    def poll_batches(self) -> List[Tuple[Dict, List[Dict]]]:
+        """
+        Check due batch jobs of this provider and parse the finished ones.
+        
+        Unfinished jobs are checked again after a backoff that doubles with
+        every check, from BATCH_POLL_INITIAL_SECONDS up to BATCH_POLL_MAX_SECONDS.
+        Failed jobs are closed. Finished jobs stay open until the caller has
+        recorded their scripts and calls finish_llm_batch(batch_id, 'collected').
+        The requests of failed jobs, and ones without a usable script, are
+        resubmitted in a new batch (see _retry_batch_requests).
+        
+        Returns:
+            (batch, scripts) for every finished job
+        """
+        db = get_database()
+        finished = []
+        
+        for batch in db.get_due_llm_batches(self.provider):
+            batch_id = batch['batch_id']
+            
+            try:
+                if self.provider == "openai":
+                    provider_status, completions, error = self._poll_openai_batch(batch_id)
+                else:
+                    provider_status, completions, error = self._poll_anthropic_batch(batch_id)
+            except Exception as e:
+                print(f"⚠️  Could not check batch {batch_id}: {str(e)}")
+                provider_status, completions, error = batch['provider_status'] or 'unknown', None, None
+            
+            if error:
+                db.finish_llm_batch(batch_id, 'failed', provider_status, error)
+                print(f"✗ Batch {batch_id} failed: {error}")
+                self._retry_batch_requests(list(batch['requests'].values()))
+                continue
+            
+            if completions is None:
+                delay = min(Config.BATCH_POLL_MAX_SECONDS, Config.BATCH_POLL_INITIAL_SECONDS * 2 ** (batch['poll_count'] + 1))
+                db.schedule_llm_batch_poll(batch_id, provider_status, delay)
+                print(f"⏳ Batch {batch_id} is {provider_status}; next check in {delay // 60} min")
+                continue
+            
+            scripts = []
+            unusable = []
+            for custom_id, request in batch['requests'].items():
+                content = completions.get(custom_id)
+                if content is None:
+                    print(f"✗ Batch {batch_id} has no result for {request['category']}")
+                    unusable.append(request)
+                    continue
+                
+                script_data = self._parse_script_response(content)
+                if self.cache:
+                    self.cache.put(request['cache_key'], content, script_data, provider=self.provider, model=batch['model'])
+                
+                if script_data:
+                    script_data['category'] = request['category']
+                    script_data['sources'] = request['sources']
+                    script_data['generated_at'] = datetime.now().isoformat()
+                    scripts.append(script_data)
+                else:
+                    unusable.append(request)
+            
+            print(f"✓ Batch {batch_id} finished: {len(scripts)}/{len(batch['requests'])} scripts")
+            finished.append((batch, scripts))
+            
+            if unusable:
+                self._retry_batch_requests(unusable)
+        
+        return finished
+    
+    def _retry_batch_requests(self, requests: List[Dict]):
+        """
+        Resubmit batch requests that produced no script.
+        
+        Their articles were marked used when the batch was submitted, so
+        without this they would never be covered. Each request is tried up
+        to BATCH_MAX_ATTEMPTS times; after that its articles are released.
+        """
+        db = get_database()
+        retry = [request for request in requests if request.get('attempt', 1) < self.BATCH_MAX_ATTEMPTS]
+        give_up = [request for request in requests if request.get('attempt', 1) >= self.BATCH_MAX_ATTEMPTS]
+        
+        if retry:
+            jobs = [(request['category'], db.get_articles_by_url(request['sources'])) for request in retry]
+            attempt = max(request.get('attempt', 1) for request in retry) + 1
+            
+            if self.submit_batch(jobs, attempt):
+                print(f"↪ Resubmitted {len(retry)} failed batch requests (attempt {attempt})")
+            else:
+                give_up.extend(retry)
+        
+        if give_up:
+            released = db.release_articles([url for request in give_up for url in request['sources']])
+            print(f"✗ Gave up on {len(give_up)} batch requests; {released} articles marked unused")
+    
+    def _build_prompt(self, news_items: List[Dict], category: str) -> str:
+        """Script prompt for a category's news items."""
+        return self._create_prompt(self._build_context(news_items), category)
+    
+    def _build_context(self, news_items: List[Dict]) -> str:
+        """Article context for a category's news items."""
+        # Articles listed from the database carry only a content hash; load bodies now
+        if any(item.get('content_hash') and not item.get('content') for item in news_items):
+            get_database().load_article_bodies(news_items)
+        
+        # Create context from news items
+        return self._create_context(news_items)
+    
     def _create_context(self, news_items: List[Dict]) -> str:
         """Create context string from news items."""
+        if Config.CONTEXT_TOKEN_BUDGET > 0:
+            # Best sentences of all articles within the token budget
+            return ContextPacker(Config.CONTEXT_TOKEN_BUDGET, self.model).pack(news_items[:5])
+        
         context_parts = []
         
         for i, item in enumerate(news_items[:5], 1):
@@ -77,8 +507,31 @@ URL: {item.get('url', 'N/A')}
         
         return "\n".join(context_parts)
     
-    def _create_prompt(self, context: str, category: str) -> str:
-        """Create the prompt for script generation."""
+    def _create_prompt(self, context: str, category: str,
+                       task: str = "Write the video script for these articles, following the instructions and format exactly.") -> str:
+        """
+        Create the variable part of the prompt for script generation.
+        
+        The instructions and format spec live in _system_prompt(), which is
+        identical for every call, so provider prompt caching can reuse it
+        (split-mode sub-requests share its instructions and only change the
+        format spec and the task).
+        """
+        return f"""Category: {category.upper()}
+
+Source Articles:
+{context}
+
+{task}"""
+    
+    def _system_prompt(self, part: Optional[str] = None) -> str:
+        """
+        Static role, instructions and format spec: the cacheable prompt prefix.
+        
+        Args:
+            part: LLM_SPLIT_MODE sub-request; its format spec only has the
+                sections that call writes (the instructions before it are shared)
+        """
         style_guide = {
             "professional_news": "professional news anchor style, authoritative and informative",
             "casual": "conversational and engaging, like talking to a friend",
@@ -87,12 +540,15 @@ URL: {item.get('url', 'N/A')}
         
         style = style_guide.get(Config.VIDEO_STYLE, style_guide["professional_news"])
         
-        return f"""You are a professional YouTube content creator specializing in news videos. Create a complete video script in English.
-
-Category: {category.upper()}
+        if part:
+            response_format = ("Write only the sections below; the rest of the video is written separately.\n"
+                               "Format your response EXACTLY as:\n" + self.SPLIT_FORMATS[part])
+        else:
+            response_format = "Format your response EXACTLY as:\n" + self.RESPONSE_FORMAT
+        
+        return f"""{self.SYSTEM_PROMPT}
 
-Source Articles:
-{context}
+You specialize in news videos. For the category and source articles you are given, create a complete video script in English.
 
 Instructions:
 1. Create a COMPLETE video script (500-1200 words for 3-8 minute video)
@@ -117,51 +573,360 @@ Instructions:
    - Use [B-ROLL: description] for visual suggestions
    - Maintain engaging pace
 
-Format your response EXACTLY as:
-TITLE: [Your YouTube-optimized title]
-
-HOOK: [First 10 seconds - the attention grabber]
-
-SCRIPT:
-[Full video script with sections clearly marked]
-
-[Include timestamps like 0:00, 0:45, 2:15, etc.]
-
-DESCRIPTION:
-[Complete YouTube description with summary, links, timestamps, and hashtags]
-
-TAGS: [tag1, tag2, tag3, tag4, tag5, tag6, tag7, tag8]
-
-THUMBNAIL_TEXT: [Short punchy text for thumbnail - max 5 words]"""
+{response_format}"""
     
-    def _generate_with_openai(self, prompt: str) -> Optional[Dict]:
-        """Generate script using OpenAI."""
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a professional YouTube content creator and scriptwriter."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=3000
-        )
+    def _generate(self, prompt: str, use_cache: bool = True,
+                  on_event: Optional[ScriptEventCallback] = None) -> Optional[Dict]:
+        """
+        Get the parsed script for a prompt from the LLM cache or the provider.
+        
+        Args:
+            prompt: Prompt from _create_prompt
+            use_cache: Read the cache first (a fresh completion is stored either way)
+            on_event: Section event subscriber (streams the completion)
+        
+        Returns:
+            Parsed script data
+        """
+        key = self._cache_key(prompt)
+        
+        if self.cache and use_cache:
+            cached = self.cache.get(key)
+            if cached and cached['parsed']:
+                print("♻️  Using cached LLM completion")
+                if on_event:
+                    # Subscribers get the same events as from a live stream
+                    parser = ScriptStreamParser(on_event)
+                    parser.feed(cached['completion'])
+                    parser.close()
+                return cached['parsed']
+        
+        # The first parseable script from any route wins; streamed calls aren't hedged
+        # because their subscribers must see a single stream
+        parser = ScriptStreamParser(on_event) if on_event else None
+        try:
+            (content, script_data), route = self.router.call(
+                lambda route: self._attempt(route, prompt, parser),
+                validate=lambda response: response[1] is not None,
+                hedge=parser is None
+            )
+        finally:
+            if parser:
+                # Attempts still streaming after the router gave up must not reach subscribers
+                parser.abandon()
+        
+        # Stored under the primary route's key, which lookups use; the row records the route that answered
+        if self.cache:
+            self.cache.put(key, content, script_data, provider=route.provider, model=route.model)
         
-        content = response.choices[0].message.content
-        return self._parse_script_response(content)
+        return script_data
     
-    def _generate_with_anthropic(self, prompt: str) -> Optional[Dict]:
-        """Generate script using Anthropic."""
-        response = self.client.messages.create(
-            model=self.model,
-            max_tokens=3000,
-            temperature=0.7,
-            messages=[
+    def _generate_split(self, news_items: List[Dict], category: str, use_cache: bool = True) -> Optional[Dict]:
+        """
+        Get the parsed script from concurrent sub-requests (LLM_SPLIT_MODE).
+        
+        The body (hook and script), the description and the short metadata
+        (title, tags, thumbnail text) are requested in parallel from the same
+        context, the latter two on LLM_METADATA_MODEL with small max_tokens.
+        Each reply is sections of the usual format, so they are joined into
+        one completion and parsed by _parse_script_response; the script's
+        timestamps are then added to the description.
+        
+        Args:
+            news_items: List of news articles to synthesize
+            category: Category of the video
+            use_cache: Read the cache first (a fresh result is stored either way)
+        
+        Returns:
+            Parsed script data
+        """
+        context = self._build_context(news_items)
+        prompts = {part: self._create_prompt(context, category, task)
+                   for part, (task, _, _) in self.SPLIT_PARTS.items()}
+        
+        # Keyed on both primary routes, like _cache_key is on the one route of a plain request
+        body_route, metadata_route = self.router.primary, self.metadata_router.primary
+        key = LLMCache.key(f"{body_route.provider}+{metadata_route.provider}",
+                           f"{body_route.model}+{metadata_route.model}",
+                           "\n\n".join(self._system_prompt(part) for part in self.SPLIT_PARTS),
+                           prompts['body'], self.TEMPERATURE, self.MAX_TOKENS)
+        
+        if self.cache and use_cache:
+            cached = self.cache.get(key)
+            if cached and cached['parsed']:
+                print("♻️  Using cached LLM completion")
+                return cached['parsed']
+        
+        def request(part: str) -> Tuple[str, Route]:
+            _, max_tokens, section = self.SPLIT_PARTS[part]
+            router = self.router if part == 'body' else self.metadata_router
+            return router.call(
+                lambda route: self._complete(route, prompts[part], max_tokens, part),
+                validate=lambda response: section in response
+            )
+        
+        # The metadata calls run alongside the body, which is the slow one
+        with ThreadPoolExecutor(max_workers=len(prompts) - 1, thread_name_prefix="script-split") as pool:
+            futures = {part: pool.submit(request, part) for part in prompts if part != 'body'}
+            parts = {'body': request('body')}
+            parts.update({part: future.result() for part, future in futures.items()})
+        
+        # Metadata last, so its TITLE wins over one the body call may have added anyway
+        order = ('body', 'description', 'metadata')
+        content = "\n\n".join(parts[part][0].strip() for part in order)
+        script_data = self._parse_script_response(content)
+        if not script_data:
+            return None
+        
+        if script_data['timestamps']:
+            chapters = [line if len(line) <= 80 else line[:77].rsplit(' ', 1)[0] + "..."
+                        for line in script_data['timestamps']]
+            script_data['description'] = (script_data['description'] + "\n\nTimestamps:\n"
+                                          + "\n".join(chapters))[:5000]
+        
+        # The row records the routes that actually answered each part, failovers included
+        if self.cache:
+            self.cache.put(key, content, script_data,
+                           provider="+".join(parts[part][1].provider for part in order),
+                           model="+".join(parts[part][1].model for part in order))
+        
+        return script_data
+    
+    def _attempt(self, route: Route, prompt: str,
+                 parser: Optional[ScriptStreamParser] = None) -> Tuple[str, Optional[Dict]]:
+        """
+        One provider call on a route.
+        
+        Args:
+            route: Route to call
+            prompt: Prompt from _create_prompt
+            parser: Stream the completion through this request's parser
+        
+        Returns:
+            (raw completion, parsed script or None if it doesn't parse)
+        """
+        if parser and route.provider == "openai":
+            route.rate_limiter.acquire()
+            content = self._stream_with_openai(prompt, route, parser.start_attempt())
+        elif parser:
+            route.rate_limiter.acquire()
+            content = self._stream_with_anthropic(prompt, route, parser.start_attempt())
+        else:
+            content = self._complete(route, prompt)
+        
+        return content, self._parse_script_response(content)
+    
+    def _complete(self, route: Route, prompt: str, max_tokens: Optional[int] = None,
+                  part: Optional[str] = None) -> str:
+        """One non-streamed provider call on a route (optionally a split-mode part); returns the raw completion."""
+        route.rate_limiter.acquire()
+        
+        if route.provider == "openai":
+            return self._generate_with_openai(prompt, route, max_tokens, part)
+        return self._generate_with_anthropic(prompt, route, max_tokens, part)
+    
+    def _cache_key(self, prompt: str, route: Optional[Route] = None) -> str:
+        """LLM cache key of a script request (on the primary route by default)."""
+        route = route or self.router.primary
+        return LLMCache.key(route.provider, route.model, self._system_prompt(), prompt, self.TEMPERATURE, self.MAX_TOKENS)
+    
+    def _request_params(self, prompt: str, route: Optional[Route] = None,
+                        max_tokens: Optional[int] = None, part: Optional[str] = None) -> Dict:
+        """
+        Provider request for a script prompt.
+        
+        The static system prompt comes first and the articles last, so the
+        prefix is byte-identical across calls: OpenAI caches it automatically,
+        Anthropic when the block is marked with cache_control. Either only
+        caches prefixes above a minimum length, so the block is only marked
+        when the system prompt reaches it (see _prompt_cacheable). Shorter
+        prompts are not cached by either provider; the prompt is not padded
+        to get there.
+        
+        Split-mode parts get their own format spec (see _system_prompt).
+        """
+        route = route or self.router.primary
+        max_tokens = max_tokens or self.MAX_TOKENS
+        system_prompt = self._system_prompt(part)
+        
+        if route.provider == "openai":
+            return {
+                'model': route.model,
+                'messages': [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                'temperature': self.TEMPERATURE,
+                'max_tokens': max_tokens
+            }
+        
+        system = {"type": "text", "text": system_prompt}
+        if self._prompt_cacheable(route, system_prompt):
+            system["cache_control"] = {"type": "ephemeral"}
+        
+        return {
+            'model': route.model,
+            'max_tokens': max_tokens,
+            'temperature': self.TEMPERATURE,
+            'system': [system],
+            'messages': [
                 {"role": "user", "content": prompt}
             ]
+        }
+    
+    def _prompt_cacheable(self, route: Route, system_prompt: str) -> bool:
+        """Whether a system prompt is long enough for the route's provider to cache it."""
+        minimum = self.PROMPT_CACHE_MIN_TOKENS * (2 if 'haiku' in route.model.lower() else 1)
+        return count_tokens(system_prompt, route.model) >= minimum
+    
+    def _record_usage(self, usage, route: Optional[Route] = None):
+        """Record the input tokens a call read from, wrote to and missed the provider's prompt cache."""
+        if usage is None:
+            return
+        
+        route = route or self.router.primary
+        try:
+            if route.provider == "openai":
+                details = getattr(usage, 'prompt_tokens_details', None)
+                cache_read = getattr(details, 'cached_tokens', None) or 0
+                cache_write = 0
+                input_tokens = usage.prompt_tokens - cache_read
+                output_tokens = usage.completion_tokens
+            else:
+                # Anthropic's input_tokens already excludes cached and cache-written tokens
+                cache_read = getattr(usage, 'cache_read_input_tokens', None) or 0
+                cache_write = getattr(usage, 'cache_creation_input_tokens', None) or 0
+                input_tokens = usage.input_tokens
+                output_tokens = usage.output_tokens
+            
+            db = get_database()
+            db.write_behind(db.record_llm_usage, route.provider, route.model,
+                            input_tokens, cache_read, cache_write, output_tokens)
+        except Exception as e:
+            print(f"⚠️  Could not record token usage: {str(e)}")
+    
+    def _generate_with_openai(self, prompt: str, route: Route, max_tokens: Optional[int] = None,
+                              part: Optional[str] = None) -> str:
+        """Generate script using OpenAI and return the raw completion."""
+        response = route.client.chat.completions.create(**self._request_params(prompt, route, max_tokens, part))
+        self._record_usage(response.usage, route)
+        
+        return response.choices[0].message.content
+    
+    def _generate_with_anthropic(self, prompt: str, route: Route, max_tokens: Optional[int] = None,
+                                 part: Optional[str] = None) -> str:
+        """Generate script using Anthropic and return the raw completion."""
+        response = route.client.messages.create(**self._request_params(prompt, route, max_tokens, part))
+        self._record_usage(response.usage, route)
+        
+        return response.content[0].text
+    
+    def _stream_with_openai(self, prompt: str, route: Route, parser: ScriptStreamAttempt) -> str:
+        """Stream a script from OpenAI through the parser and return the completion."""
+        stream = route.client.chat.completions.create(
+            **self._request_params(prompt, route),
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parser.feed(chunk.choices[0].delta.content)
+            if getattr(chunk, 'usage', None):
+                self._record_usage(chunk.usage, route)
+        
+        return parser.close()
+    
+    def _stream_with_anthropic(self, prompt: str, route: Route, parser: ScriptStreamAttempt) -> str:
+        """Stream a script from Anthropic through the parser and return the completion."""
+        with route.client.messages.stream(**self._request_params(prompt, route)) as stream:
+            for text in stream.text_stream:
+                parser.feed(text)
+            self._record_usage(stream.get_final_message().usage, route)
+        
+        return parser.close()
+    
+    def _submit_openai_batch(self, prompts: Dict[str, str]) -> str:
+        """Upload the requests as a JSONL file and start an OpenAI batch job."""
+        lines = [json.dumps({
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': self._request_params(prompt)
+        }) for custom_id, prompt in prompts.items()]
+        
+        input_file = self.client.files.create(
+            file=("script_batch.jsonl", "\n".join(lines).encode('utf-8')),
+            purpose="batch"
         )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def _poll_openai_batch(self, batch_id: str) -> Tuple[str, Optional[Dict[str, str]], Optional[str]]:
+        """
+        Check an OpenAI batch job.
+        
+        Returns:
+            (provider status, completions per custom_id or None while running, error)
+        """
+        batch = self.client.batches.retrieve(batch_id)
         
-        content = response.content[0].text
-        return self._parse_script_response(content)
+        if batch.status not in ('completed', 'expired', 'cancelled', 'failed'):
+            return batch.status, None, None
+        
+        # Expired and cancelled jobs still return the requests that finished
+        if not batch.output_file_id:
+            return batch.status, None, f"batch {batch.status} without results"
+        
+        completions = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            
+            result = json.loads(line)
+            response = result.get('response') or {}
+            if response.get('status_code') == 200:
+                completions[result['custom_id']] = response['body']['choices'][0]['message']['content']
+        
+        return batch.status, completions, None
+    
+    def _anthropic_batches(self):
+        """Message Batches resource (under beta in older SDK versions)."""
+        if hasattr(self.client.messages, 'batches'):
+            return self.client.messages.batches
+        return self.client.beta.messages.batches
+    
+    def _submit_anthropic_batch(self, prompts: Dict[str, str]) -> str:
+        """Start an Anthropic Message Batch."""
+        batch = self._anthropic_batches().create(requests=[
+            {'custom_id': custom_id, 'params': self._request_params(prompt)}
+            for custom_id, prompt in prompts.items()
+        ])
+        return batch.id
+    
+    def _poll_anthropic_batch(self, batch_id: str) -> Tuple[str, Optional[Dict[str, str]], Optional[str]]:
+        """
+        Check an Anthropic Message Batch.
+        
+        Returns:
+            (provider status, completions per custom_id or None while running, error)
+        """
+        batches = self._anthropic_batches()
+        batch = batches.retrieve(batch_id)
+        
+        if batch.processing_status != 'ended':
+            return batch.processing_status, None, None
+        
+        completions = {}
+        for entry in batches.results(batch_id):
+            if entry.result.type == 'succeeded':
+                completions[entry.custom_id] = entry.result.message.content[0].text
+        
+        return batch.processing_status, completions, None
     
     def _parse_script_response(self, content: str) -> Optional[Dict]:
         """Parse the LLM response into structured script data."""
@@ -226,7 +991,7 @@ THUMBNAIL_TEXT: [Short punchy text for thumbnail - max 5 words]"""
                 'word_count': len(script_text.split()),
                 'estimated_duration': len(script_text.split()) // 150  # ~150 words per minute
             }
-            
+        
         except Exception as e:
             print(f"Error parsing script response: {str(e)}")
             return None
@@ -0,0 +1,82 @@
+"""Single-flight request coalescing for the shared fetch path."""
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight execution that concurrent callers wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+    
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block and receive the same result (or the same exception).
+    Nothing is cached once the call completes, so later callers fetch again.
+    """
+    
+    def __init__(self):
+        """Initialize the call table."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.stats = {'executed': 0, 'shared': 0}
+    
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) unless a call for key is already in flight.
+        
+        Args:
+            key: Identity of the request (e.g. ('page', url))
+            fn: Function performing the request
+        
+        Returns:
+            The result of the single shared execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            
+            if call is not None:
+                self.stats['shared'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['executed'] += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    
+    def in_flight(self) -> int:
+        """Number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+# Shared instance for all collectors (created eagerly so threads never race on it)
+_fetch_group = SingleFlight()
+
+def get_fetch_group() -> SingleFlight:
+    """Get the single-flight group shared by every collector."""
+    return _fetch_group
@@ -163,6 +163,8 @@ class SubtitleGenerator:
         try:
             from openai import OpenAI
             from config import Config
+            from llm_cache import LLMCache, get_llm_cache
+            from rate_limiter import get_rate_limiter
             
             if not Config.OPENAI_API_KEY:
                 print("⚠️  OpenAI API key required for translation")
@@ -183,21 +185,36 @@ class SubtitleGenerator:
             # Translate in batches
             translated_texts = []
             batch_size = 20
+            model = "gpt-3.5-turbo"
+            system_prompt = f"Translate the following subtitles to {target_language}. Maintain the same number of lines and similar length."
+            cache = get_llm_cache()
             
             for i in range(0, len(texts), batch_size):
                 batch = texts[i:i + batch_size]
                 batch_text = "\n".join(batch)
                 
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": f"Translate the following subtitles to {target_language}. Maintain the same number of lines and similar length."},
-                        {"role": "user", "content": batch_text}
-                    ],
-                    temperature=0.3
-                )
+                # Unchanged batches of a re-rendered video reuse their translation
+                key = LLMCache.key("openai", model, system_prompt, batch_text, 0.3, None)
+                cached = cache.get(key) if cache and not Config.LLM_CACHE_BYPASS else None
                 
-                translated_batch = response.choices[0].message.content.strip().split('\n')
+                if cached:
+                    completion = cached['completion']
+                else:
+                    get_rate_limiter("openai").acquire()
+                    response = client.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": batch_text}
+                        ],
+                        temperature=0.3
+                    )
+                    completion = response.choices[0].message.content
+                    
+                    if cache:
+                        cache.put(key, completion, provider="openai", model=model)
+                
+                translated_batch = completion.strip().split('\n')
                 translated_texts.extend(translated_batch)
             
             # Create new subtitles with translated text
@@ -0,0 +1,293 @@
+"""Test script to verify batch-API script generation against a local stand-in server."""
+
+import re
+import sys
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import database
+import llm_cache
+import llm_router
+import rate_limiter
+from config import Config
+from database import Database
+
+
+# Status checks a stand-in batch stays in progress for
+POLLS_UNTIL_DONE = 2
+
+
+def fake_script(prompt: str) -> str:
+    """A completion in the format _parse_script_response expects."""
+    match = re.search(r'Category: (\w+)', prompt)
+    category = match.group(1).title() if match else "News"
+    paragraph = f"Here is the latest {category.lower()} story, explained step by step for our viewers today. " * 6
+    
+    return f"""TITLE: {category} Update From The Batch Server
+
+HOOK: This {category.lower()} story changes everything.
+
+SCRIPT:
+0:00 Intro
+{(paragraph + chr(10)) * 9}
+DESCRIPTION:
+A stand-in {category.lower()} script.
+
+TAGS: [{category.lower()}, news, batch]
+
+THUMBNAIL_TEXT: BATCH {category.upper()}"""
+
+
+class StandInBatchServer(BaseHTTPRequestHandler):
+    """
+    Minimal OpenAI Batch and Anthropic Message Batches endpoints.
+    
+    Batches report in progress for POLLS_UNTIL_DONE status checks, then
+    complete with a fake script for every request.
+    """
+    
+    files = {}
+    batches = {}
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send(self, payload, status: int = 200, jsonl: bool = False):
+        body = "\n".join(json.dumps(line) for line in payload) if jsonl else json.dumps(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-jsonl" if jsonl else "application/json")
+        self.send_header("Content-Length", str(len(body.encode('utf-8'))))
+        self.end_headers()
+        self.wfile.write(body.encode('utf-8'))
+    
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+    
+    def do_POST(self):
+        now = int(time.time())
+        
+        if self.path == '/v1/files':
+            message = BytesParser().parsebytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + self._body()
+            )
+            content = next(part.get_payload(decode=True) for part in message.get_payload()
+                           if part.get_param('name', header='content-disposition') == 'file')
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = content.decode('utf-8')
+            self._send({'id': file_id, 'object': 'file', 'bytes': len(content), 'created_at': now,
+                        'filename': 'script_batch.jsonl', 'purpose': 'batch', 'status': 'processed'})
+        
+        elif self.path == '/v1/batches':
+            request = json.loads(self._body())
+            batch_id = f"batch_{len(self.batches) + 1}"
+            lines = [json.loads(line) for line in self.files[request['input_file_id']].splitlines()]
+            self.batches[batch_id] = {
+                'polls': 0,
+                'requests': [(line['custom_id'], line['body']['messages'][-1]['content']) for line in lines]
+            }
+            self._send(self._openai_batch(batch_id, request['input_file_id']))
+        
+        elif self.path == '/v1/messages/batches':
+            request = json.loads(self._body())
+            batch_id = f"msgbatch_{len(self.batches) + 1}"
+            self.batches[batch_id] = {
+                'polls': 0,
+                'requests': [(entry['custom_id'], entry['params']['messages'][-1]['content'])
+                             for entry in request['requests']]
+            }
+            self._send(self._anthropic_batch(batch_id))
+        
+        else:
+            self._send({'error': {'message': f"unknown endpoint {self.path}"}}, status=404)
+    
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        
+        if re.fullmatch(r'/v1/batches/[\w-]+', path):
+            batch_id = path.rsplit('/', 1)[1]
+            self.batches[batch_id]['polls'] += 1
+            self._send(self._openai_batch(batch_id, 'file-1'))
+        
+        elif re.fullmatch(r'/v1/files/batch_[\w-]+-output/content', path):
+            batch_id = path.split('/')[3][:-len('-output')]
+            self._send([{
+                'id': f"response-{i}",
+                'custom_id': custom_id,
+                'response': {'status_code': 200, 'request_id': f"req-{i}", 'body': {
+                    'id': f"chatcmpl-{i}", 'object': 'chat.completion', 'created': int(time.time()),
+                    'model': Config.MODEL_NAME,
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': fake_script(prompt)}}]
+                }},
+                'error': None
+            } for i, (custom_id, prompt) in enumerate(self.batches[batch_id]['requests'])], jsonl=True)
+        
+        elif re.fullmatch(r'/v1/messages/batches/[\w-]+', path):
+            batch_id = path.rsplit('/', 1)[1]
+            self.batches[batch_id]['polls'] += 1
+            self._send(self._anthropic_batch(batch_id))
+        
+        elif re.fullmatch(r'/v1/messages/batches/[\w-]+/results', path):
+            batch_id = path.split('/')[4]
+            self._send([{
+                'custom_id': custom_id,
+                'result': {'type': 'succeeded', 'message': {
+                    'id': f"msg_{i}", 'type': 'message', 'role': 'assistant', 'model': Config.MODEL_NAME,
+                    'content': [{'type': 'text', 'text': fake_script(prompt)}],
+                    'stop_reason': 'end_turn', 'stop_sequence': None,
+                    'usage': {'input_tokens': 1, 'output_tokens': 1}
+                }}
+            } for i, (custom_id, prompt) in enumerate(self.batches[batch_id]['requests'])], jsonl=True)
+        
+        else:
+            self._send({'error': {'message': f"unknown endpoint {self.path}"}}, status=404)
+    
+    def _done(self, batch_id: str) -> bool:
+        return self.batches[batch_id]['polls'] >= POLLS_UNTIL_DONE
+    
+    def _openai_batch(self, batch_id: str, input_file_id: str) -> dict:
+        done = self._done(batch_id)
+        return {
+            'id': batch_id, 'object': 'batch', 'endpoint': '/v1/chat/completions',
+            'input_file_id': input_file_id, 'completion_window': '24h', 'created_at': int(time.time()),
+            'status': 'completed' if done else 'in_progress',
+            'output_file_id': f"{batch_id}-output" if done else None
+        }
+    
+    def _anthropic_batch(self, batch_id: str) -> dict:
+        done = self._done(batch_id)
+        count = len(self.batches[batch_id]['requests'])
+        host, port = self.server.server_address
+        return {
+            'id': batch_id, 'type': 'message_batch',
+            'processing_status': 'ended' if done else 'in_progress',
+            'request_counts': {'processing': 0 if done else count, 'succeeded': count if done else 0,
+                               'errored': 0, 'canceled': 0, 'expired': 0},
+            'created_at': '2025-01-01T00:00:00Z', 'expires_at': '2025-01-02T00:00:00Z',
+            'ended_at': '2025-01-01T00:10:00Z' if done else None,
+            'archived_at': None, 'cancel_initiated_at': None,
+            'results_url': f"http://{host}:{port}/v1/messages/batches/{batch_id}/results" if done else None
+        }
+
+
+def check_batch_mode(provider: str, monkeypatch) -> bool:
+    """
+    Submit a batch, poll it until it finishes and check the parsed scripts.
+    
+    Args:
+        provider: openai or anthropic
+        monkeypatch: pytest MonkeyPatch; Config and the singletons pointed at
+            the stand-in server are restored when it is undone
+    """
+    print("\n" + "="*70)
+    print(f"🧪 TESTING BATCH MODE ({provider.upper()}, local stand-in server)")
+    print("="*70 + "\n")
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInBatchServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    
+    try:
+        # Point the generator at the stand-in server and a throwaway database
+        for name, value in {
+            'LLM_PROVIDER': provider,
+            'MODEL_NAME': "gpt-4o-mini" if provider == "openai" else "claude-3-5-haiku-latest",
+            'OPENAI_API_KEY': "test-key",
+            'ANTHROPIC_API_KEY': "test-key",
+            'OPENAI_BASE_URL': f"{base_url}/v1",
+            'ANTHROPIC_BASE_URL': base_url,
+            'BATCH_POLL_INITIAL_SECONDS': 0,
+            'LLM_CACHE_ENABLED': False,
+        }.items():
+            monkeypatch.setattr(Config, name, value)
+        
+        # Routers and limiters created now hold clients for this server only
+        monkeypatch.setattr(llm_router, '_routers', {})
+        monkeypatch.setattr(rate_limiter, '_limiters', {})
+        monkeypatch.setattr(llm_cache, '_cache_instance', None)
+        
+        db = Database(str(Path(tempfile.mkdtemp()) / "reporter.db"))
+        monkeypatch.setattr(database, '_db_instance', db)
+        
+        try:
+            return _run_batch(provider)
+        finally:
+            db.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _run_batch(provider: str) -> bool:
+    """The batch round trip of check_batch_mode, once the environment is set up."""
+    from script_generator import ScriptGenerator
+    generator = ScriptGenerator()
+    
+    sample_news = {
+        category: [{
+            'title': f'Sample {category} headline',
+            'description': f'What happened in {category} today',
+            'content': f'Something important happened in {category}. Experts explained why it matters.',
+            'url': f'https://example.com/{category}/story',
+            'source': 'Example News',
+            'published_at': '2025-10-03'
+        }]
+        for category in ('sports', 'finance')
+    }
+    
+    batch_id = generator.submit_batch(list(sample_news.items()))
+    if not batch_id:
+        print("❌ Batch submission failed")
+        return False
+    
+    finished = []
+    for _ in range(POLLS_UNTIL_DONE + 1):
+        finished = generator.poll_batches()
+        if finished:
+            break
+    
+    if not finished:
+        print("❌ Batch never finished")
+        return False
+    
+    batch, scripts = finished[0]
+    print(f"\n✓ Batch {batch['batch_id']} collected after {batch['poll_count'] + 1} checks")
+    for script in scripts:
+        print(f"  • [{script['category']}] {script['title']} ({script['word_count']} words)")
+    
+    if sorted(script['category'] for script in scripts) != sorted(sample_news):
+        print("❌ Missing scripts")
+        return False
+    
+    database.get_database().finish_llm_batch(batch['batch_id'], 'collected')
+    if database.get_database().get_due_llm_batches():
+        print("❌ Collected batch is still open")
+        return False
+    
+    print("✅ Batch mode works!")
+    return True
+
+
+def test_batch_mode_openai(monkeypatch):
+    """Batch mode against the stand-in OpenAI endpoints."""
+    assert check_batch_mode("openai", monkeypatch)
+
+
+def test_batch_mode_anthropic(monkeypatch):
+    """Batch mode against the stand-in Anthropic endpoints."""
+    assert check_batch_mode("anthropic", monkeypatch)
+
+
+if __name__ == "__main__":
+    from pytest import MonkeyPatch
+    
+    results = []
+    for provider in sys.argv[1:] or ["openai", "anthropic"]:
+        with MonkeyPatch.context() as monkeypatch:
+            results.append(check_batch_mode(provider, monkeypatch))
+    sys.exit(0 if all(results) else 1)
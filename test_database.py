@@ -0,0 +1,166 @@
+"""Tests for schema migrations and article storage in reporter.db."""
+
+import sqlite3
+
+from database import MIGRATIONS, Database
+
+
+# Tables as the baseline release created them, before schema migrations existed
+BASELINE_SCHEMA = """
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE NOT NULL,
+    title TEXT,
+    content TEXT,
+    category TEXT,
+    collected_at TIMESTAMP,
+    used_in_video BOOLEAN DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE scripts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    category TEXT,
+    script_text TEXT,
+    description TEXT,
+    tags TEXT,
+    word_count INTEGER,
+    estimated_duration INTEGER,
+    language TEXT DEFAULT 'en',
+    video_generated BOOLEAN DEFAULT 0,
+    uploaded BOOLEAN DEFAULT 0,
+    youtube_url TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE videos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script_id INTEGER,
+    file_path TEXT,
+    thumbnail_path TEXT,
+    video_mode TEXT,
+    duration REAL,
+    uploaded BOOLEAN DEFAULT 0,
+    youtube_id TEXT,
+    youtube_url TEXT,
+    views INTEGER DEFAULT 0,
+    likes INTEGER DEFAULT 0,
+    comments INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    uploaded_at TIMESTAMP,
+    FOREIGN KEY (script_id) REFERENCES scripts(id)
+);
+CREATE TABLE analytics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id INTEGER,
+    views INTEGER,
+    likes INTEGER,
+    comments INTEGER,
+    watch_time REAL,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (video_id) REFERENCES videos(id)
+);
+CREATE TABLE upload_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id INTEGER,
+    scheduled_time TIMESTAMP,
+    status TEXT DEFAULT 'pending',
+    retry_count INTEGER DEFAULT 0,
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (video_id) REFERENCES videos(id)
+);
+"""
+
+BODY = "The central bank raised interest rates by half a point to slow inflation. " * 10
+
+
+def _baseline_database(path):
+    """A database file as the baseline release left it, with a little history."""
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO articles (url, title, content, category, collected_at, used_in_video) VALUES (?, ?, ?, ?, ?, ?)",
+        [("https://example.com/rates", "Central bank raises rates", BODY, "finance", "2025-01-10T08:00:00", 1),
+         ("https://example.com/empty", "", "", "finance", "2025-01-10T09:00:00", 0)]
+    )
+    conn.execute("INSERT INTO scripts (title, category, script_text) VALUES (?, ?, ?)",
+                 ("Rates go up", "finance", "Why the central bank raised rates today."))
+    conn.execute("INSERT INTO videos (script_id, file_path, uploaded, uploaded_at) VALUES (1, 'rates.mp4', 1, ?)",
+                 ("2025-01-10T23:30:00",))
+    conn.commit()
+    conn.close()
+
+
+def _schema(conn):
+    """Names of every table, index and trigger."""
+    return {tuple(row) for row in conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' AND type != 'view'"
+    )}
+
+
+def test_upgrade_from_baseline(tmp_path):
+    """A baseline database migrates to the current schema without losing rows."""
+    path = str(tmp_path / "reporter.db")
+    _baseline_database(path)
+    
+    db = Database(path)
+    try:
+        assert db.schema_version() == MIGRATIONS[-1][0]
+        
+        # Bodies moved into the compressed, content-addressed table
+        article = dict(db.conn.execute(
+            "SELECT id, content, content_hash, used_in_video FROM articles WHERE url = 'https://example.com/rates'"
+        ).fetchone())
+        assert article['content'] is None and article['content_hash'] and article['used_in_video'] == 1
+        assert db.load_article_bodies([dict(article)])[0]['content'] == BODY
+        
+        # Full-text indexes cover the old rows (the article by its body too)
+        assert [row[0] for row in db.conn.execute(
+            "SELECT rowid FROM articles_fts WHERE articles_fts MATCH 'inflation'")] == [article['id']]
+        assert db.conn.execute("SELECT COUNT(*) FROM scripts_fts WHERE scripts_fts MATCH 'rates'").fetchone()[0] == 1
+        db.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('integrity-check')")
+        
+        # Local upload times became UTC
+        assert db.conn.execute("SELECT uploaded_at FROM videos").fetchone()[0].count('T') == 0
+        
+        fresh = Database(str(tmp_path / "fresh.db"))
+        assert _schema(db.conn) == _schema(fresh.conn)
+        fresh.close()
+    finally:
+        db.close()
+    
+    # Reopening applies nothing twice
+    reopened = Database(path)
+    assert reopened.schema_version() == MIGRATIONS[-1][0]
+    assert reopened.conn.execute("SELECT COUNT(*) FROM schema_version").fetchone()[0] == len(MIGRATIONS)
+    assert reopened.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 2
+    reopened.close()
+
+
+def test_plain_sqlite_writes_work(tmp_path):
+    """No trigger needs a Python function, so the sqlite3 CLI can still write."""
+    path = str(tmp_path / "reporter.db")
+    Database(path).close()
+    
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO articles (url, title) VALUES ('https://example.com/cli', 'Added by hand')")
+    conn.execute("UPDATE articles SET title = 'Edited by hand'")
+    conn.execute("DELETE FROM articles")
+    conn.commit()
+    conn.close()
+
+
+def test_recollected_article_keeps_first_collection_time(db):
+    """Seeing a URL again refreshes its title and body but not when it was collected."""
+    db.add_articles([{'url': "https://example.com/story", 'title': "First", 'content': "short body",
+                      'collected_at': "2025-01-01T00:00:00"}])
+    db.add_articles([{'url': "https://example.com/story", 'title': "Second", 'content': BODY,
+                      'collected_at': "2025-02-01T00:00:00"}])
+    
+    row = db.conn.execute("SELECT id, title, collected_at FROM articles").fetchone()
+    assert (row['title'], row['collected_at']) == ("Second", "2025-01-01T00:00:00")
+    
+    # The full-text entry follows the new title and body
+    assert db.conn.execute("SELECT rowid FROM articles_fts WHERE articles_fts MATCH 'inflation'").fetchone()[0] == row['id']
+    assert db.conn.execute("SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH 'first'").fetchone()[0] == 0
+    db.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('integrity-check')")
@@ -0,0 +1,71 @@
+"""Tests for incremental history export watermarks."""
+
+import csv
+import gzip
+import json
+
+from history_export import HistoryExporter
+
+
+def _read(result):
+    """Rows of an exported csv.gz file as dictionaries."""
+    with gzip.open(result['path'], 'rt', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def _exporter(db, tmp_path):
+    """A csv.gz exporter for the test database."""
+    return HistoryExporter(db.db_path, output_dir=str(tmp_path / "exports"), format='csv.gz')
+
+
+def test_incremental_export_picks_up_updates(db, tmp_path):
+    """New rows and rows updated since the last run are exported; nothing else is."""
+    exporter = _exporter(db, tmp_path)
+    script_id = db.add_script({'title': "Morning briefing", 'script': "Good morning."})
+    video_id = db.add_video({'script_id': script_id, 'file_path': 'briefing.mp4'})
+    
+    first = exporter.export()
+    assert first['videos']['rows'] == 1 and _read(first['videos'])[0]['uploaded'] == '0'
+    assert first['analytics']['rows'] == 0
+    
+    # Uploading updates the existing video row; a script is corrected by hand
+    db.mark_video_uploaded(video_id, "https://youtu.be/abc", "abc")
+    db.conn.execute("UPDATE scripts SET title = 'Morning briefing (corrected)' WHERE id = ?", (script_id,))
+    db.add_video({'script_id': script_id, 'file_path': 'briefing-short.mp4'})
+    
+    second = exporter.export()
+    videos = _read(second['videos'])
+    assert [(row['id'], row['uploaded'], row['youtube_id']) for row in videos] == [
+        (str(video_id), '1', "abc"), (str(video_id + 1), '0', "")
+    ]
+    assert [row['title'] for row in _read(second['scripts'])] == ["Morning briefing (corrected)"]
+    
+    third = exporter.export()
+    assert not any(result['rows'] for result in third.values())
+
+
+def test_partial_export_keeps_other_watermarks(db, tmp_path):
+    """Exporting some tables leaves the other tables' watermarks where they were."""
+    exporter = _exporter(db, tmp_path)
+    db.add_script({'title': "Evening news", 'script': "Good evening."})
+    exporter.export()
+    saved = json.loads(exporter.watermark_file.read_text())
+    
+    db.add_script({'title': "Late edition", 'script': "Good night."})
+    result = exporter.export(['videos'], full=True)
+    assert result['videos']['rows'] == 0
+    assert json.loads(exporter.watermark_file.read_text())['scripts'] == saved['scripts']
+    
+    assert exporter.export(['scripts'])['scripts']['rows'] == 1
+
+
+def test_reads_id_only_watermarks(db, tmp_path):
+    """Watermark files written before change tracking (plain ids) still work."""
+    exporter = _exporter(db, tmp_path)
+    for title in ("One", "Two"):
+        db.add_script({'title': title, 'script': title})
+    exporter.watermark_file.write_text(json.dumps({'scripts': 1}))
+    
+    result = exporter.export(['scripts'])['scripts']
+    assert [row['title'] for row in _read(result)] == ["Two"]
+    assert result['watermark']['id'] == 2
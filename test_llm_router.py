@@ -0,0 +1,149 @@
+"""Tests for LLM failover, hedging and deadlines, and for resetting streamed scripts."""
+
+import threading
+
+import pytest
+
+from config import Config
+from llm_router import LLMRouter, Route
+from script_generator import ScriptGenerator, ScriptStreamParser
+
+
+SCRIPT = ("TITLE: Rates go up\n\nHOOK: The central bank moved again.\n\nSCRIPT:\n"
+          + "Borrowing just got more expensive for everyone. " * 8
+          + "\n\nDESCRIPTION:\nWhat the rate rise means.\n\nTAGS: [rates, economy]\n\nTHUMBNAIL_TEXT: Rates Up")
+
+
+@pytest.fixture
+def routes(llm_singletons):
+    """A primary route and one fallback (clients are built but never called)."""
+    return [Route('openai', 'primary'), Route('anthropic', 'fallback')]
+
+
+def test_fails_over_on_error(routes):
+    """A failing route hands the request to the next one and counts the failure."""
+    def attempt(route):
+        if route.model == 'primary':
+            raise ConnectionError("connection reset")
+        return "answer"
+    
+    response, route = LLMRouter(routes).call(attempt)
+    assert (response, route.model) == ("answer", 'fallback')
+    assert routes[0].stats['failures'] == 1 and routes[0].failures == 1
+
+
+def test_fails_over_on_invalid_response(routes):
+    """A response that doesn't validate is treated like a failure."""
+    response, route = LLMRouter(routes).call(
+        lambda route: "" if route.model == 'primary' else "answer"
+    )
+    assert route.model == 'fallback'
+
+
+def test_single_route_retries_once(llm_singletons):
+    """A lone route gets one retry, never a hedge, then the call fails."""
+    route = Route('openai', 'only')
+    calls = []
+    
+    def attempt(route):
+        calls.append(route)
+        raise ConnectionError("connection reset")
+    
+    with pytest.raises(RuntimeError, match="All LLM routes failed"):
+        LLMRouter([route]).call(attempt)
+    assert len(calls) == 2 and route.stats['hedges'] == 0
+
+
+def test_slow_call_is_hedged_on_another_route(routes):
+    """Past the primary's p95 latency a duplicate goes to the fallback, and the first answer wins."""
+    for _ in range(20):
+        routes[0].record_success(0.01)
+    release = threading.Event()
+    
+    def attempt(route):
+        if route.model == 'primary':
+            release.wait(5)
+            return "late answer"
+        return "hedged answer"
+    
+    try:
+        response, route = LLMRouter(routes).call(attempt)
+    finally:
+        release.set()
+    assert (response, route.model) == ("hedged answer", 'fallback')
+    assert routes[0].stats['hedges'] == 1
+
+
+def test_deadline(routes, monkeypatch):
+    """Nothing answering within LLM_CALL_DEADLINE_SECONDS raises TimeoutError."""
+    monkeypatch.setattr(Config, 'LLM_CALL_DEADLINE_SECONDS', 0.2)
+    release = threading.Event()
+    
+    try:
+        with pytest.raises(TimeoutError):
+            LLMRouter(routes).call(lambda route: release.wait(5) and "answer")
+    finally:
+        release.set()
+
+
+def test_sdk_retries_are_off(routes):
+    """Retrying is the router's job, so the SDK clients never retry on their own."""
+    assert [route.client.max_retries for route in routes] == [0, 0]
+
+
+def test_new_attempt_resets_stream():
+    """A retry voids the earlier attempt's events, and the superseded attempt is ignored."""
+    events = []
+    parser = ScriptStreamParser(lambda event, value: events.append((event, value)))
+    
+    first = parser.start_attempt()
+    first.feed("TITLE: First try\nHOOK: Half a ")
+    second = parser.start_attempt()
+    first.feed("hook\nSCRIPT:\nStale line\n")
+    first.close()
+    second.feed("TITLE: Second try\nSCRIPT:\nFresh line\n")
+    assert second.close().startswith("TITLE: Second try")
+    
+    assert events == [('title', "First try"), ('reset', None), ('title', "Second try"),
+                      ('script_paragraph', "Fresh line"), ('done', "TITLE: Second try\nSCRIPT:\nFresh line\n")]
+
+
+def test_abandoned_stream_is_silent():
+    """Attempts still running after the request ended don't reach subscribers."""
+    events = []
+    parser = ScriptStreamParser(lambda event, value: events.append(event))
+    
+    attempt = parser.start_attempt()
+    parser.abandon()
+    attempt.feed("TITLE: Too late\n")
+    attempt.close()
+    assert events == []
+
+
+def test_streamed_script_fails_over(llm_singletons, monkeypatch):
+    """A stream that breaks half way is reset and the fallback route's script is streamed instead."""
+    monkeypatch.setattr(Config, 'LLM_PROVIDER', 'openai')
+    monkeypatch.setattr(Config, 'MODEL_NAME', 'primary')
+    monkeypatch.setattr(Config, 'LLM_FALLBACK_ROUTES', ['anthropic:fallback'])
+    monkeypatch.setattr(Config, 'LLM_METADATA_MODEL', "")
+    monkeypatch.setattr(Config, 'LLM_CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'MIN_SCRIPT_LENGTH', 10)
+    
+    def broken_stream(self, prompt, route, attempt):
+        attempt.feed(SCRIPT[:40])
+        raise ConnectionError("stream interrupted")
+    
+    def stream(self, prompt, route, attempt):
+        attempt.feed(SCRIPT)
+        return attempt.close()
+    
+    monkeypatch.setattr(ScriptGenerator, '_stream_with_openai', broken_stream)
+    monkeypatch.setattr(ScriptGenerator, '_stream_with_anthropic', stream)
+    
+    events = []
+    script = ScriptGenerator()._generate("prompt", on_event=lambda event, value: events.append((event, value)))
+    
+    assert script['title'] == "Rates go up"
+    assert events[:2] == [('title', "Rates go up"), ('reset', None)]
+    assert events[-1] == ('done', SCRIPT)
+    assert [value for event, value in events[2:] if event == 'title'] == ["Rates go up"]
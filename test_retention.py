@@ -0,0 +1,92 @@
+"""Tests for monthly archival of old rows out of reporter.db."""
+
+import sqlite3
+
+from config import Config
+from database import Database
+from retention import RetentionManager
+
+
+def _old_story(db, url="https://example.com/old"):
+    """A script from 60 days ago with its source article, video and upload."""
+    db.add_articles([{'url': url, 'title': "Old election story", 'content': "Polls closed across the country."}])
+    script_id = db.add_script({'title': "Election night", 'script': "The polls have closed.", 'sources': [url]})
+    video_id = db.add_video({'script_id': script_id, 'file_path': 'old.mp4'})
+    db.mark_video_uploaded(video_id, "https://youtu.be/old", "old")
+    
+    db.conn.execute("UPDATE scripts SET created_at = datetime('now', '-60 days') WHERE id = ?", (script_id,))
+    db.conn.execute("""
+        UPDATE articles SET created_at = datetime('now', '-60 days'), collected_at = datetime('now', '-60 days')
+        WHERE url = ?
+    """, (url,))
+    return script_id
+
+
+def _count(conn, table):
+    """Rows in a table."""
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_archive_round_trip(db, tmp_path):
+    """Old rows move to the month's archive, stay queryable there and aren't moved twice."""
+    script_id = _old_story(db)
+    db.add_script({'title': "Today's story", 'script': "Fresh news."})
+    manager = RetentionManager(db, archive_dir=str(tmp_path / "archive"), retention_days=30)
+    
+    totals = manager.run()
+    assert (totals['scripts'], totals['videos'], totals['articles']) == (1, 1, 1)
+    assert totals['article_bodies'] == 1
+    
+    # The hot database keeps only today's script
+    assert [row[0] for row in db.conn.execute("SELECT title FROM scripts")] == ["Today's story"]
+    assert _count(db.conn, 'articles') == _count(db.conn, 'videos') == _count(db.conn, 'article_bodies') == 0
+    assert _count(db.conn, 'articles_fts') == 0
+    
+    # The archive has the same rows under the same ids
+    [month] = manager.list_archives()
+    archive = sqlite3.connect(str(manager.archive_path(month)))
+    assert archive.execute("SELECT id, title FROM scripts").fetchall() == [(script_id, "Election night")]
+    assert _count(archive, 'videos') == _count(archive, 'articles') == _count(archive, 'article_bodies') == 1
+    archive.close()
+    
+    [schema] = manager.attach_archives()
+    assert db.conn.execute(f"SELECT youtube_id FROM {schema}.videos").fetchone()[0] == "old"
+    
+    assert not any(manager.run().values())
+
+
+def test_archived_urls_stay_seen(db, tmp_path):
+    """Collectors don't fetch an archived story again, even after a restart."""
+    url = "https://example.com/unused"
+    db.add_articles([{'url': url, 'title': "Never used", 'content': "Some body."}])
+    db.conn.execute("UPDATE articles SET created_at = datetime('now', '-60 days'), collected_at = NULL")
+    
+    RetentionManager(db, archive_dir=str(tmp_path / "archive"), retention_days=30).run()
+    assert _count(db.conn, 'articles') == 0
+    assert not db.should_fetch_url(url)
+    
+    restarted = Database(db.db_path)
+    assert [row[0] for row in restarted.conn.execute("SELECT url FROM archived_urls")] == [url]
+    assert not restarted.should_fetch_url(url)
+    assert restarted.should_fetch_url("https://example.com/new")
+    restarted.close()
+
+
+def test_archived_rows_leave_vector_index(db, tmp_path, monkeypatch):
+    """Archived scripts and articles stop counting as semantic coverage."""
+    monkeypatch.setattr(Config, 'SEMANTIC_COVERAGE_CHECK', True)
+    script_id = _old_story(db)
+    index = db.get_vector_index()
+    assert ('script', script_id) in set(zip(index.kinds.tolist(), index.ids.tolist()))
+    
+    RetentionManager(db, archive_dir=str(tmp_path / "archive"), retention_days=30).run()
+    assert len(index) == 0
+
+
+def test_disabled_by_default(db, tmp_path, monkeypatch):
+    """RETENTION_DAYS=0 (the default) keeps everything in the hot database."""
+    monkeypatch.setattr(Config, 'RETENTION_DAYS', 0)
+    _old_story(db)
+    
+    assert RetentionManager(db, archive_dir=str(tmp_path / "archive")).run() == {}
+    assert _count(db.conn, 'scripts') == 1
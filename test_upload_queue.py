@@ -0,0 +1,136 @@
+"""Tests for the leased upload queue: claiming, failing, lease expiry and workers."""
+
+from config import Config
+from upload_queue import UploadWorker
+
+
+def _expire_lease(db, job_id):
+    """Make a claimed job's lease run out (its worker crashed)."""
+    db.conn.execute("UPDATE upload_queue SET lease_expires_at = datetime('now', '-1 minute') WHERE id = ?",
+                    (job_id,))
+
+
+def _job(db, job_id):
+    """A queue row as a dictionary."""
+    return dict(db.conn.execute("SELECT * FROM upload_queue WHERE id = ?", (job_id,)).fetchone())
+
+
+def test_claim_and_complete(db):
+    """A claimed job is leased to one worker and completing it marks the video uploaded."""
+    video_id = db.add_video({'script_id': None, 'file_path': 'video.mp4'})
+    job_id = db.enqueue_upload(video_id, {'video_file': 'video.mp4', 'title': 'Story'})
+    
+    job = db.claim_upload("worker-a", lease_seconds=60)
+    assert job['id'] == job_id
+    assert job['payload']['title'] == "Story"
+    assert job['status'] == 'processing' and job['lease_owner'] == "worker-a" and job['attempts'] == 1
+    
+    # Leased jobs aren't handed out twice
+    assert db.claim_upload("worker-b") is None
+    
+    assert db.complete_upload(job_id, "worker-a", "https://youtu.be/abc", "abc")
+    assert _job(db, job_id)['status'] == 'uploaded'
+    
+    video = db.conn.execute("SELECT uploaded, youtube_id FROM videos WHERE id = ?", (video_id,)).fetchone()
+    assert tuple(video) == (1, "abc")
+
+
+def test_delayed_jobs_wait(db):
+    """Jobs scheduled in the future aren't due yet."""
+    db.enqueue_upload(None, {}, delay_seconds=3600)
+    assert db.claim_upload("worker-a") is None
+
+
+def test_failure_backs_off_then_dead_letters(db):
+    """Failed jobs are retried later with backoff until max_retries, then dead-lettered."""
+    job_id = db.enqueue_upload(None, {'video_file': 'video.mp4'})
+    
+    db.claim_upload("worker-a")
+    assert db.fail_upload(job_id, "worker-a", "quota exceeded", max_retries=2, base_delay=600) == 'pending'
+    
+    job = _job(db, job_id)
+    assert job['retry_count'] == 1 and job['lease_owner'] is None
+    # Backing off: not claimable until its retry time
+    assert db.claim_upload("worker-a") is None
+    
+    db.conn.execute("UPDATE upload_queue SET scheduled_time = datetime('now', '-1 second') WHERE id = ?", (job_id,))
+    db.claim_upload("worker-a")
+    assert db.fail_upload(job_id, "worker-a", "quota exceeded", max_retries=2) == 'dead'
+    assert _job(db, job_id)['error_message'] == "quota exceeded"
+    
+    assert db.retry_dead_uploads() == 1
+    assert db.claim_upload("worker-a")['id'] == job_id
+
+
+def test_permanent_failure_dead_letters_at_once(db):
+    """Permanent failures skip the retries."""
+    job_id = db.enqueue_upload(None, {})
+    db.claim_upload("worker-a")
+    
+    assert db.fail_upload(job_id, "worker-a", "file missing", permanent=True) == 'dead'
+
+
+def test_expired_lease_moves_to_another_worker(db):
+    """A crashed worker's job is reclaimed, and the old worker can no longer finish it."""
+    job_id = db.enqueue_upload(None, {})
+    db.claim_upload("worker-a", lease_seconds=60)
+    assert db.renew_upload_lease(job_id, "worker-a", 60)
+    
+    _expire_lease(db, job_id)
+    job = db.claim_upload("worker-b", lease_seconds=60)
+    assert job['id'] == job_id and job['attempts'] == 2
+    
+    assert not db.renew_upload_lease(job_id, "worker-a", 60)
+    assert not db.complete_upload(job_id, "worker-a", "https://youtu.be/old", "old")
+    assert db.fail_upload(job_id, "worker-a", "late failure") is None
+    assert db.complete_upload(job_id, "worker-b", "https://youtu.be/new", "new")
+
+
+def test_lease_expiring_too_often_dead_letters(db, monkeypatch):
+    """A job that keeps crashing its worker is dead-lettered after UPLOAD_MAX_ATTEMPTS claims."""
+    monkeypatch.setattr(Config, 'UPLOAD_MAX_ATTEMPTS', 2)
+    job_id = db.enqueue_upload(None, {})
+    
+    for _ in range(2):
+        assert db.claim_upload("worker-a")['id'] == job_id
+        _expire_lease(db, job_id)
+    
+    assert db.claim_upload("worker-a") is None
+    job = _job(db, job_id)
+    assert job['status'] == 'dead' and job['error_message'] == "lease expired too many times"
+
+
+class FakeUploader:
+    """Stands in for YouTubeUploader; fails the first `failures` uploads."""
+    
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.uploads = []
+    
+    def upload_video(self, video_file, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("upload interrupted")
+        self.uploads.append(video_file)
+        return {'id': f"yt{len(self.uploads)}", 'url': f"https://youtu.be/yt{len(self.uploads)}"}
+
+
+def test_worker_drains_queue(db, tmp_path, monkeypatch):
+    """A worker uploads due jobs, retries failures later and dead-letters missing files."""
+    monkeypatch.setattr(Config, 'UPLOAD_RETRY_BASE_SECONDS', 3600)
+    video_file = tmp_path / "video.mp4"
+    video_file.write_bytes(b"video")
+    
+    # The first upload attempt fails
+    flaky_id = db.enqueue_upload(None, {'video_file': str(video_file)})
+    ok_id = db.enqueue_upload(db.add_video({'file_path': str(video_file)}), {'video_file': str(video_file)})
+    missing_id = db.enqueue_upload(None, {'video_file': str(tmp_path / "missing.mp4")})
+    
+    uploader = FakeUploader(failures=1)
+    worker = UploadWorker("worker-a", uploader=uploader)
+    worker.run(drain=True)
+    
+    assert worker.stats == {'uploaded': 1, 'retrying': 1, 'dead': 1}
+    assert _job(db, ok_id)['status'] == 'uploaded'
+    assert _job(db, flaky_id)['status'] == 'pending'
+    assert _job(db, missing_id)['status'] == 'dead'
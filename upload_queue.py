@@ -0,0 +1,233 @@
+"""Upload queue workers: drain the upload_queue table with one or more processes or threads."""
+
+import os
+import time
+import socket
+import threading
+import multiprocessing
+from typing import Dict, Optional
+from config import Config
+from database import get_database
+
+
+class UploadWorker:
+    """
+    Claims upload jobs one at a time and uploads them to YouTube.
+    
+    Jobs are claimed with a lease that a heartbeat thread renews while the
+    upload runs. If the worker crashes or stalls, the lease expires and
+    another worker picks the job up; a worker that lost its lease cannot
+    overwrite the new owner's result.
+    """
+    
+    def __init__(self, worker_id: Optional[str] = None, uploader=None):
+        """
+        Initialize the worker.
+        
+        Args:
+            worker_id: Lease owner name (defaults to host:pid)
+            uploader: YouTubeUploader to use (created on the first job otherwise)
+        """
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.uploader = uploader
+        self.db = get_database()
+        self.lease_seconds = Config.UPLOAD_LEASE_SECONDS
+        self.max_attempts = Config.UPLOAD_MAX_ATTEMPTS
+        self.stats = {'uploaded': 0, 'retrying': 0, 'dead': 0}
+    
+    def run(self, drain: bool = False, poll_seconds: float = 30.0):
+        """
+        Process jobs until stopped.
+        
+        Args:
+            drain: Return as soon as no job is due instead of polling
+            poll_seconds: Wait between polls when the queue is empty
+        """
+        print(f"📤 Upload worker {self.worker_id} started")
+        
+        try:
+            while True:
+                job = self.db.claim_upload(self.worker_id, self.lease_seconds, self.max_attempts)
+                
+                if job is None:
+                    if drain:
+                        break
+                    time.sleep(poll_seconds)
+                    continue
+                
+                self.process(job)
+        except KeyboardInterrupt:
+            pass
+        
+        print(f"📤 Upload worker {self.worker_id} done: {self.stats}")
+    
+    def process(self, job: Dict):
+        """Upload one claimed job and record the outcome."""
+        payload = job['payload']
+        print(f"\n[{self.worker_id}] Job {job['id']} (attempt {job['attempts']}): {payload.get('title', '')}")
+        
+        if not os.path.exists(payload.get('video_file', '')):
+            self._record_failure(job, f"Video file not found: {payload.get('video_file')}", permanent=True)
+            return
+        
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job['id'], stop_heartbeat), daemon=True)
+        heartbeat.start()
+        
+        try:
+            result = self._upload(payload)
+            error = None if result else "Upload returned no result"
+        except Exception as e:
+            result, error = None, str(e)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+        
+        if result:
+            if self.db.complete_upload(job['id'], self.worker_id, result['url'], result['id']):
+                self.stats['uploaded'] += 1
+                print(f"✓ Job {job['id']} uploaded: {result['url']}")
+            else:
+                print(f"⚠️  Job {job['id']} uploaded, but its lease was lost: {result['url']}")
+        else:
+            self._record_failure(job, error)
+    
+    def _upload(self, payload: Dict) -> Optional[Dict]:
+        """Run the YouTube upload for a job payload."""
+        if self.uploader is None:
+            from youtube_uploader import YouTubeUploader
+            self.uploader = YouTubeUploader()
+        
+        return self.uploader.upload_video(
+            video_file=payload['video_file'],
+            title=payload.get('title', ''),
+            description=payload.get('description', ''),
+            tags=payload.get('tags', []),
+            category_id=payload.get('category_id', '25'),
+            privacy_status=payload.get('privacy_status', 'private')
+        )
+    
+    def _record_failure(self, job: Dict, error: str, permanent: bool = False):
+        """Schedule a retry with backoff, or dead-letter the job."""
+        status = self.db.fail_upload(
+            job['id'], self.worker_id, error,
+            max_retries=Config.UPLOAD_MAX_RETRIES,
+            base_delay=Config.UPLOAD_RETRY_BASE_SECONDS,
+            permanent=permanent
+        )
+        
+        if status == 'dead':
+            self.stats['dead'] += 1
+            print(f"✗ Job {job['id']} dead-lettered: {error}")
+        elif status == 'pending':
+            self.stats['retrying'] += 1
+            print(f"⚠️  Job {job['id']} failed, will retry: {error}")
+        else:
+            print(f"⚠️  Job {job['id']} failed after its lease was lost: {error}")
+    
+    def _heartbeat(self, job_id: int, stop: threading.Event):
+        """Renew the lease while an upload runs."""
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.db.renew_upload_lease(job_id, self.worker_id, self.lease_seconds):
+                print(f"⚠️  Lost lease on job {job_id}")
+                return
+
+
+def _worker_process(drain: bool):
+    """Entry point of a worker process."""
+    UploadWorker().run(drain=drain)
+
+
+def run_upload_workers(workers: int = 1, drain: bool = True, uploader=None):
+    """
+    Drain the upload queue with several workers.
+    
+    YouTube is authenticated once, here, so the login flow never runs in
+    several workers at once and only one of them writes token.pickle.
+    
+    Args:
+        workers: Number of workers (1 runs in this thread)
+        drain: Stop once nothing is due instead of polling forever
+        uploader: Authenticated YouTubeUploader; with one, the workers are
+            threads in this process sharing its credentials
+    """
+    if workers <= 1:
+        UploadWorker(uploader=uploader).run(drain=drain)
+        return
+    
+    if uploader is not None:
+        # Uploads are I/O-bound; each thread gets its own API client on the shared credentials
+        base_id = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(
+                target=UploadWorker(f"{base_id}:{i}", uploader=type(uploader)(credentials=uploader.credentials)).run,
+                kwargs={'drain': drain},
+                name=f"upload-{i}"
+            )
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return
+    
+    # Leave a valid token.pickle for the workers before they start
+    from youtube_uploader import YouTubeUploader
+    if not YouTubeUploader().youtube:
+        print("✗ Upload workers not started: YouTube authentication failed")
+        return
+    
+    # Spawned processes each open their own database connection and API client
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_worker_process, args=(drain,)) for _ in range(workers)]
+    
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def print_queue_status():
+    """Show job counts, in-flight jobs and the dead-letter queue."""
+    db = get_database()
+    
+    print("\n📋 Upload queue")
+    for status, count in sorted(db.get_upload_queue_counts().items()):
+        print(f"  {status}: {count}")
+    
+    in_flight = db.get_upload_jobs('processing')
+    if in_flight:
+        print("\nIn flight:")
+        for job in in_flight:
+            print(f"  #{job['id']} {job['title'] or ''} - {job['lease_owner']} (lease until {job['lease_expires_at']}, attempt {job['attempts']})")
+    
+    dead = db.get_upload_jobs('dead', limit=20)
+    if dead:
+        print("\nDead-lettered:")
+        for job in dead:
+            print(f"  #{job['id']} {job['title'] or ''} - {job['error_message']}")
+
+
+def main():
+    """Command line entry point: python upload_queue.py [--workers N] [--drain] [--status] [--retry-dead]"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Upload queue workers")
+    parser.add_argument('--workers', type=int, default=Config.UPLOAD_WORKERS, help="worker processes")
+    parser.add_argument('--drain', action='store_true', help="exit once nothing is due")
+    parser.add_argument('--status', action='store_true', help="show the queue and exit")
+    parser.add_argument('--retry-dead', action='store_true', help="requeue dead-lettered jobs")
+    args = parser.parse_args()
+    
+    if args.retry_dead:
+        print(f"✓ Requeued {get_database().retry_dead_uploads()} dead-lettered jobs")
+    
+    if args.status:
+        print_queue_status()
+    elif not args.retry_dead or args.drain:
+        run_upload_workers(args.workers, drain=args.drain)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Local vector index for semantic "already covered" checks."""
+
+import os
+import re
+import math
+import time
+import zlib
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from database import STOPWORDS
+
+
+class VectorIndex:
+    """
+    Compact on-disk index of hashed TF-IDF vectors with brute-force cosine search.
+    
+    Embeddings are fully local: words and word bigrams are hashed (with a
+    random sign) into a fixed number of buckets, which is a random
+    projection of the sparse TF vector. Rows are stored as L2-normalized TF;
+    IDF weights come from running bucket document frequencies and are
+    applied at query time, so old rows never need re-embedding.
+    """
+    
+    def __init__(self, path: str = "reporter.vectors.npz", dim: int = 256, retention_days: int = 365):
+        """
+        Initialize the index, loading it from disk if present.
+        
+        Args:
+            path: File the index is persisted to
+            dim: Number of hash buckets (vector dimension)
+            retention_days: Entries older than this are evicted
+        """
+        self.path = Path(path)
+        self.dim = dim
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.kinds = np.zeros(0, dtype='<U8')
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.timestamps = np.zeros(0, dtype=np.float64)
+        self.doc_freq = np.zeros(dim, dtype=np.float32)
+        self._norm_cache = None
+        
+        self.load()
+    
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return len(self.ids)
+    
+    # ------------------------------------------------------------------
+    # Embedding
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _stem(word: str) -> str:
+        """Crude suffix stripping so 'raises', 'raised' and 'raising' share a bucket."""
+        for suffix in ('ing', 'ed', 'es', 's'):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+                word = word[:-len(suffix)]
+                break
+        return word[:7]
+    
+    def _tokens(self, text: str) -> List[tuple]:
+        """Stemmed words (minus stopwords) and, at half weight, adjacent word bigrams."""
+        words = [self._stem(w) for w in re.findall(r'\w+', text.lower())
+                 if len(w) > 2 and w not in STOPWORDS and not w.isdigit()]
+        return [(w, 1.0) for w in words] + [(f"{a} {b}", 0.5) for a, b in zip(words, words[1:])]
+    
+    def embed(self, text: str) -> np.ndarray:
+        """Hashed, sublinear-TF vector (L2-normalized, no IDF)."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        
+        for (token, weight), count in Counter(self._tokens(text)).items():
+            value = zlib.crc32(token.encode('utf-8'))
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dim] += sign * weight * (1.0 + math.log(count))
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _idf(self) -> np.ndarray:
+        """Smoothed IDF per bucket from the current document frequencies."""
+        return np.log((1.0 + len(self.ids)) / (1.0 + self.doc_freq)).astype(np.float32) + 1.0
+    
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    
+    def add(self, kind: str, doc_id: int, text: str, timestamp: Optional[float] = None, save: bool = True):
+        """Add (or replace) one document."""
+        self.add_many([(kind, doc_id, text, timestamp)], save=save)
+    
+    def add_many(self, documents: List[tuple], save: bool = True):
+        """
+        Add a batch of documents.
+        
+        Args:
+            documents: (kind, id, text, timestamp or None) tuples
+            save: Persist the index afterwards
+        """
+        documents = [doc for doc in documents if doc[2] and doc[2].strip()]
+        if not documents:
+            return
+        
+        now = time.time()
+        # Rounded to the stored float16 precision up front, so the nonzero buckets counted
+        # into doc_freq here are the ones subtracted again after any number of save/load cycles
+        vectors = np.stack([self.embed(text) for _, _, text, _ in documents]).astype(np.float16).astype(np.float32)
+        kinds = np.array([kind for kind, _, _, _ in documents], dtype='<U8')
+        ids = np.array([doc_id for _, doc_id, _, _ in documents], dtype=np.int64)
+        timestamps = np.array([ts or now for _, _, _, ts in documents], dtype=np.float64)
+        
+        with self._lock:
+            # Replace existing entries for the same documents
+            keep = ~np.isin(self._keys(self.kinds, self.ids), self._keys(kinds, ids))
+            self._apply_mask(keep)
+            
+            self.vectors = np.vstack([self.vectors, vectors])
+            self.kinds = np.concatenate([self.kinds, kinds])
+            self.ids = np.concatenate([self.ids, ids])
+            self.timestamps = np.concatenate([self.timestamps, timestamps])
+            self.doc_freq += (vectors != 0).sum(axis=0)
+            self._norm_cache = None
+        
+        self.evict_older_than(self.retention_days, save=False)
+        if save:
+            self.save()
+    
+    def remove_many(self, kind: str, doc_ids: List[int], save: bool = True) -> int:
+        """
+        Drop documents of one kind.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keep = ~((self.kinds == kind) & np.isin(self.ids, np.asarray(doc_ids, dtype=np.int64)))
+            removed = int((~keep).sum())
+            if removed:
+                self._apply_mask(keep)
+        
+        if removed and save:
+            self.save()
+        return removed
+    
+    def evict_older_than(self, days: int, save: bool = True) -> int:
+        """
+        Drop entries older than N days.
+        
+        Returns:
+            Number of entries evicted
+        """
+        cutoff = time.time() - days * 86400
+        
+        with self._lock:
+            keep = self.timestamps >= cutoff
+            evicted = int((~keep).sum())
+            if evicted:
+                self._apply_mask(keep)
+        
+        if evicted and save:
+            self.save()
+        return evicted
+    
+    def _apply_mask(self, keep: np.ndarray):
+        """Keep only the rows selected by a boolean mask (caller holds the lock)."""
+        if keep.all():
+            return
+        
+        self.doc_freq -= (self.vectors[~keep] != 0).sum(axis=0)
+        self.vectors = self.vectors[keep]
+        self.kinds = self.kinds[keep]
+        self.ids = self.ids[keep]
+        self.timestamps = self.timestamps[keep]
+        self._norm_cache = None
+    
+    @staticmethod
+    def _keys(kinds: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """Combined kind/id keys for membership tests."""
+        return np.char.add(np.char.add(kinds.astype(str), ':'), ids.astype(str))
+    
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    
+    def query(self, text: str, k: int = 5, days: Optional[int] = None,
+              kinds: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Top-K cosine search (TF-IDF weighted) over the indexed documents.
+        
+        Args:
+            text: Query text (e.g. a candidate story's title and lead)
+            k: Number of results
+            days: Only consider documents from the last N days
+            kinds: Only consider these kinds ('script', 'article')
+        
+        Returns:
+            Matches, best first, with 'kind', 'id', 'score' and 'timestamp'
+        """
+        query = self.embed(text)
+        if not query.any():
+            return []
+        
+        with self._lock:
+            if not len(self.ids):
+                return []
+            
+            idf = self._idf()
+            weights = idf * idf
+            
+            if self._norm_cache is None:
+                self._norm_cache = np.sqrt((self.vectors * self.vectors) @ weights)
+            norms = self._norm_cache
+            
+            query_norm = float(np.sqrt((query * query) @ weights))
+            scores = (self.vectors @ (query * weights)) / np.maximum(norms * query_norm, 1e-9)
+            
+            mask = np.ones(len(scores), dtype=bool)
+            if days is not None:
+                mask &= self.timestamps >= time.time() - days * 86400
+            if kinds:
+                mask &= np.isin(self.kinds, kinds)
+            scores = np.where(mask, scores, -np.inf)
+            
+            k = min(k, int(mask.sum()))
+            if k <= 0:
+                return []
+            
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            
+            return [{
+                'kind': str(self.kinds[i]),
+                'id': int(self.ids[i]),
+                'score': float(scores[i]),
+                'timestamp': float(self.timestamps[i])
+            } for i in top]
+    
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    
+    def save(self):
+        """Write the index to disk atomically (vectors stored as float16, as rounded by add_many)."""
+        with self._lock:
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f,
+                    vectors=self.vectors.astype(np.float16),
+                    kinds=self.kinds,
+                    ids=self.ids,
+                    timestamps=self.timestamps,
+                    doc_freq=self.doc_freq
+                )
+            os.replace(tmp_path, self.path)
+    
+    def load(self):
+        """Load the index from disk if the file exists and matches the dimension."""
+        if not self.path.exists():
+            return
+        
+        try:
+            with np.load(self.path) as data:
+                if data['vectors'].shape[1] != self.dim:
+                    print(f"⚠️  Vector index dimension changed, rebuilding: {self.path}")
+                    return
+                
+                self.vectors = data['vectors'].astype(np.float32)
+                self.kinds = data['kinds']
+                self.ids = data['ids']
+                self.timestamps = data['timestamps']
+                # Stored explicitly; rebuilt from the rows only for files written without it
+                self.doc_freq = (data['doc_freq'].astype(np.float32) if 'doc_freq' in data.files
+                                 else (self.vectors != 0).sum(axis=0).astype(np.float32))
+        except Exception as e:
+            print(f"⚠️  Error loading vector index: {e}")
@@ -19,11 +19,22 @@ SCOPES = ['https://www.googleapis.com/auth/youtube.upload',
 class YouTubeUploader:
     """Uploads videos and metadata to YouTube."""
     
-    def __init__(self):
-        """Initialize the YouTube uploader."""
-        self.credentials = None
+    def __init__(self, credentials: Optional[Credentials] = None):
+        """
+        Initialize the YouTube uploader.
+        
+        Args:
+            credentials: Credentials of an already authenticated uploader
+                (skips token.pickle and the login flow)
+        """
+        self.credentials = credentials
         self.youtube = None
-        self.authenticate()
+        
+        if credentials:
+            # Each uploader needs its own API client: they aren't thread-safe
+            self.youtube = build('youtube', 'v3', credentials=credentials)
+        else:
+            self.authenticate()
     
     def authenticate(self) -> bool:
         """